@@ -3,4 +3,11 @@ __email__ = 'samuel.palato@mail.mcgill.ca'
 __license__ = 'MIT'
 __version__ = '0.2'
 
-from .qtlets import HasQtlets
\ No newline at end of file
+from .qtlets import HasQtlets, HasQtletDescriptors, HasQtletSources
+from .derived import derived, offloaded
+from .compact import CompactQtlets
+
+try:  # registers the qtlets for numpy arrays
+    from . import arrays
+except ImportError:  # numpy is optional
+    pass
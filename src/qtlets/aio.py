@@ -0,0 +1,106 @@
+# aio.py
+# asyncio interface: await the changes of qtlets.
+
+import asyncio
+from collections import deque
+import threading
+import weakref
+
+from PySide2.QtCore import Qt
+
+from .widgets import _disconnect
+
+POLICIES = ("latest", "drop")
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class QtletStream(object):
+    """
+    Asynchronous iterator over the values delivered to the widgets of a qtlet.
+
+    Values are buffered from the moment the stream is created, up to
+    `maxsize` values (0 for unbounded). When the buffer is full, the "latest"
+    policy drops the oldest value, and "drop" drops the new one. Either way,
+    `dropped` counts the lost values.
+
+    Values can be delivered from any thread: the coroutines are woken using
+    `call_soon_threadsafe` on the loop running when the stream was created.
+    That loop can run in the GUI thread (ex: with `qasync`), or in another
+    thread. Close the stream when done, or use it with `async with`.
+    """
+    def __init__(self, qtlet, maxsize: int=1, policy: str="latest"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, use one of {POLICIES}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self._loop = asyncio.get_running_loop()
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._waiter = None  # future of the coroutine waiting for a value
+        self._qtlet = weakref.ref(qtlet)
+        self._closed = False
+        ref = weakref.ref(self)
+        def push(value):  # doesn't keep the stream alive.
+            stream = ref()
+            if stream is not None:
+                stream._push(value)
+        self._slot = push
+        # direct: the loop's thread may not run a Qt event loop.
+        qtlet.data_changed.connect(push, Qt.DirectConnection)
+
+    def _push(self, value):
+        with self._lock:
+            if self.maxsize and len(self._buffer) >= self.maxsize:
+                self.dropped += 1
+                if self.policy == "drop":
+                    return
+                self._buffer.popleft()
+            self._buffer.append(value)
+            waiter, self._waiter = self._waiter, None
+        if waiter is not None:
+            self._loop.call_soon_threadsafe(_wake, waiter)
+
+    async def get(self):
+        """Wait for the next value."""
+        while True:
+            with self._lock:
+                if self._buffer:
+                    return self._buffer.popleft()
+                if self._closed:
+                    raise StopAsyncIteration
+                waiter = self._waiter = self._loop.create_future()
+            await waiter
+
+    def close(self):
+        """Stop receiving values. Values already buffered can still be read."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            waiter, self._waiter = self._waiter, None
+        qtlet = self._qtlet()
+        if qtlet is not None:
+            _disconnect(qtlet.data_changed, self._slot)
+        if waiter is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(_wake, waiter)
+
+    def __del__(self):
+        if hasattr(self, "_slot"):  # fully initialized
+            self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
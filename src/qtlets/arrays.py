@@ -0,0 +1,301 @@
+# arrays.py
+# numpy arrays, displayed in table views and images without copying.
+
+import numpy as np
+from PySide2.QtCore import QAbstractTableModel, QModelIndex, QRectF, Qt
+from PySide2.QtGui import QImage, QPainter
+from PySide2.QtWidgets import QAbstractItemView, QWidget
+
+from .models import editable
+from .qtlets import Qtlet, _NOTHING, identical, qtlet_type, notifier_signal
+
+_NO_PARENT = QModelIndex()
+
+
+def _span(spec, n: int):
+    """
+    Convert an index, slice or sequence of indices to a `(start, stop)` range
+    of `range(n)`. Steps and sequences are widened to their bounding range.
+    """
+    if spec is None:
+        return 0, n
+    if isinstance(spec, slice):
+        r = range(*spec.indices(n))
+    elif isinstance(spec, (int, np.integer)):
+        i = int(spec)
+        i = i + n if i < 0 else i
+        r = range(i, i + 1) if 0 <= i < n else range(0)
+    else:
+        r = sorted(i + n if i < 0 else i for i in spec)
+    if len(r) == 0:
+        return 0, 0
+    return max(min(r[0], r[-1]), 0), min(max(r[0], r[-1]) + 1, n)
+
+
+def _shape2d(array):
+    """Number of rows and columns of `array`, 1d arrays have one column."""
+    if array is None or array.ndim == 0:
+        return 0, 0
+    elif array.ndim == 1:
+        return array.shape[0], 1
+    return array.shape[0], array.shape[1]
+
+
+class ArrayTableModel(QAbstractTableModel):
+    """
+    Table model displaying the cells of a 1d or 2d array.
+
+    Cells are read from the array when the view asks for them, so only the
+    visible part of the array is ever converted. The array is not copied:
+    modify it in place and report the modified region with `mark_dirty`.
+    Cells of writeable arrays can be edited from the view.
+
+    `fmt` is the format used for display, ex: "{:.3f}". Uses `str` if None.
+    """
+    def __init__(self, array=None, *a, fmt: str=None, **kw):
+        super().__init__(*a, **kw)
+        self.array = None
+        self.fmt = fmt
+        self.set_array(array)
+
+    def set_array(self, array):
+        """
+        Display `array`. Resets the model, unless the shape is unchanged.
+        """
+        if array is not None and self.array is not None \
+                and _shape2d(array) == _shape2d(self.array):
+            self.array = array
+            self.mark_dirty()
+            return
+        self.beginResetModel()
+        self.array = array
+        self.endResetModel()
+
+    def mark_dirty(self, rows=None, cols=None):
+        """
+        Refresh the views after the array was modified in place.
+
+        `rows` and `cols` are an index, a slice or a sequence of indices.
+        None means all of them.
+        """
+        n_rows, n_cols = _shape2d(self.array)
+        r0, r1 = _span(rows, n_rows)
+        c0, c1 = _span(cols, n_cols)
+        if r1 <= r0 or c1 <= c0:
+            return
+        self.dataChanged.emit(self.index(r0, c0), self.index(r1 - 1, c1 - 1))
+
+    def rowCount(self, parent=_NO_PARENT):
+        return 0 if parent.isValid() else _shape2d(self.array)[0]
+
+    def columnCount(self, parent=_NO_PARENT):
+        return 0 if parent.isValid() else _shape2d(self.array)[1]
+
+    def _key(self, index):
+        if self.array.ndim == 1:
+            return index.row()
+        return index.row(), index.column()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in \
+                (Qt.DisplayRole, Qt.EditRole, Qt.UserRole):
+            return None
+        value = self.array[self._key(index)]
+        if isinstance(value, np.generic):
+            value = value.item()
+        if role != Qt.DisplayRole:
+            return value
+        return str(value) if self.fmt is None else self.fmt.format(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return section  # numpy indices, starting at 0.
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.array is not None and self.array.flags.writeable:
+            flags = editable(flags)
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        try:
+            self.array[self._key(index)] = value
+        except (TypeError, ValueError):
+            return False
+        self.mark_dirty(index.row(), index.column())
+        return True
+
+
+# uint8 arrays with these channels are displayed without copying.
+_FORMATS = {
+    1: QImage.Format_Grayscale8,
+    3: QImage.Format_RGB888,
+    4: QImage.Format_RGBA8888,
+}
+
+
+def _channels(array):
+    if array.ndim == 2:
+        return 1
+    elif array.ndim == 3 and array.shape[2] in _FORMATS:
+        return array.shape[2]
+    raise ValueError(f"Can't display array of shape {array.shape} as image.")
+
+
+class ArrayImage(QWidget):
+    """
+    Display a 2d array as a grayscale image, or a 3d array as RGB(A).
+
+    C-contiguous `uint8` arrays are displayed directly from their buffer.
+    Other arrays are scaled to 0-255 using `levels`, `(low, high)`, which
+    default to the range of the array. Modify the array in place and use
+    `mark_dirty` to refresh only the modified region.
+    """
+    def __init__(self, *a, levels=None, **kw):
+        super().__init__(*a, **kw)
+        self.array = None
+        self.levels = levels
+        self._levels = None  # levels actually used for scaling
+        self._buffer = None  # uint8 data shared with the image
+        self.image = QImage()
+
+    def value(self):
+        return self.array
+
+    def setValue(self, array):
+        self.array = array
+        if array is None:
+            self._buffer, self.image = None, QImage()
+            self.update()
+            return
+        n_channels = _channels(array)
+        if array.dtype == np.uint8 and array.flags.c_contiguous:
+            self._buffer = array
+        else:
+            self._levels = self.levels or self._auto_levels(array)
+            self._buffer = self._scale(array)
+        h, w = array.shape[:2]
+        self.image = QImage(self._buffer.data, w, h, self._buffer.strides[0],
+                            _FORMATS[n_channels])
+        self.updateGeometry()
+        self.update()
+
+    def setLevels(self, levels):
+        """Set the `(low, high)` range used for scaling, None for automatic."""
+        self.levels = levels
+        self.setValue(self.array)
+
+    @staticmethod
+    def _auto_levels(array):
+        if array.size == 0:
+            return 0, 1
+        return float(np.nanmin(array)), float(np.nanmax(array))
+
+    def _scale(self, array):
+        if array.dtype == np.uint8:
+            return np.ascontiguousarray(array)
+        lo, hi = self._levels
+        scale = 255 / (hi - lo) if hi > lo else 0.
+        out = (np.asarray(array, dtype=float) - lo) * scale
+        return np.clip(np.nan_to_num(out), 0, 255).astype(np.uint8)
+
+    def mark_dirty(self, rows=None, cols=None):
+        """Repaint the region of the image modified in place."""
+        if self.array is None:
+            return
+        h, w = self.array.shape[:2]
+        r0, r1 = _span(rows, h)
+        c0, c1 = _span(cols, w)
+        if r1 <= r0 or c1 <= c0:
+            return
+        if self._buffer is not self.array:
+            # only convert the modified region, with the current levels.
+            self._buffer[r0:r1, c0:c1] = self._scale(self.array[r0:r1, c0:c1])
+        sx, sy = self.width() / w, self.height() / h
+        rect = QRectF(c0 * sx, r0 * sy, (c1 - c0) * sx, (r1 - r0) * sy)
+        self.update(rect.toAlignedRect().adjusted(-1, -1, 1, 1))
+
+    def sizeHint(self):
+        return self.image.size() if not self.image.isNull() \
+            else super().sizeHint()
+
+    def paintEvent(self, event):
+        if self.image.isNull():
+            return
+        painter = QPainter(self)
+        painter.drawImage(self.rect(), self.image)
+        painter.end()
+
+
+@notifier_signal.register(ArrayImage)
+def notifier_image(widget):
+    return None  # display only
+
+
+class ArrayQtlet(Qtlet):
+    """
+    Qtlet for numpy array attributes.
+
+    Table views are linked by setting their model, an `ArrayTableModel`
+    reading the cells directly from the array. Other widgets, such as
+    `ArrayImage`, receive the array itself: it is never copied.
+
+    Arrays are compared by identity: assigning a new array updates the
+    widgets, but modifying it in place doesn't. Use `mark_dirty` to refresh
+    the modified region.
+    """
+    def __init__(self, inst, attr, *a, compare=None, **kw):
+        super().__init__(inst, attr, *a,
+                         compare=identical if compare is None else compare,
+                         **kw)
+        self.model = ArrayTableModel(self.value, parent=self)
+        self.model.dataChanged.connect(self._on_cells_changed)
+
+    def mark_dirty(self, rows=None, cols=None):
+        """
+        Refresh the widgets after the array was modified in place.
+
+        `rows` and `cols` are an index, a slice or a sequence of indices.
+        None means all of them. Only the given region is redrawn.
+        """
+        self.model.mark_dirty(rows, cols)
+        return self
+
+    def _on_cells_changed(self, top_left, bottom_right, roles=None):
+        rows = slice(top_left.row(), bottom_right.row() + 1)
+        cols = slice(top_left.column(), bottom_right.column() + 1)
+        array = self.model.array
+        for w in self.widgets:
+            # widgets still showing another array get it from `data_changed`.
+            if hasattr(w, "mark_dirty") and getattr(w, "array", None) is array:
+                w.mark_dirty(rows, cols)
+
+    def _sync(self, force=False, value=_NOTHING):
+        if value is _NOTHING:
+            value = self.value
+        if self.model.array is not value:
+            self.model.set_array(value)
+        return super()._sync(force, value)
+
+    def link_widget(self, widget, widget_signal=None, widget_slot=None):
+        if widget_signal is None and widget_slot is None \
+                and hasattr(widget, "setModel"):
+            widget.setModel(self.model)
+            self._add_link(widget, None, None)
+            return self
+        return super().link_widget(widget, widget_signal, widget_slot)
+
+    def _unlink(self, link):
+        super()._unlink(link)
+        widget = link.widget
+        if isinstance(widget, QAbstractItemView) \
+                and widget.model() is self.model:
+            widget.setModel(None)
+
+
+@qtlet_type.register(np.ndarray)
+def qtl_array(typ):
+    return ArrayQtlet
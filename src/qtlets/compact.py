@@ -0,0 +1,313 @@
+# compact.py
+# compact qtlets: a plain record per attribute, and a QObject per class.
+
+from functools import partial
+import logging
+import threading
+
+from PySide2.QtCore import QObject, QThread, Qt, Signal
+
+from .qtlets import Qtlet, IntQtlet, FloatQtlet, StrQtlet, BoolQtlet, \
+    _Link, _NOTHING, _QtletsBase, _inst_ref, equal, qtlet_type, \
+    notifier_signal, setter_slot
+from .polling import default_scheduler
+from .widgets import _disconnect
+
+logger = logging.getLogger(__name__)
+
+
+class Dispatcher(QObject):
+    """
+    Signals shared by the compact qtlets of all the instances of a class.
+
+    `data_changed(instance, attr, value)` is emitted after the widgets of an
+    attribute were updated.
+    """
+    data_changed = Signal(object, str, object)
+    _sync_requested = Signal(object)  # CompactQtlet, synced from other threads
+
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.lock = threading.Lock()
+        self._sync_requested.connect(self._on_sync_requested,
+                                     Qt.QueuedConnection)
+
+    def _on_sync_requested(self, qtl):
+        with self.lock:
+            force, qtl._posted = qtl._posted, None
+        qtl.sync_widgets(force=bool(force))
+
+
+_dispatchers = {}  # class -> Dispatcher
+
+
+def dispatcher(cls: type) -> Dispatcher:
+    """The dispatcher of `cls`, created if needed."""
+    cls = cls.__dict__.get("_qtlets_base", cls)  # see `HasQtletDescriptors`
+    if cls not in _dispatchers:
+        _dispatchers[cls] = Dispatcher()
+    return _dispatchers[cls]
+
+
+class _CompactLink(_Link):
+    """Link of a compact qtlet: routes the edits of the widget to it."""
+    __slots__ = ("qtlet",)
+
+    def __init__(self, qtlet, widget, signal, slot):
+        super().__init__(widget, signal, slot)
+        self.qtlet = qtlet
+
+    def edited(self, value):
+        self.qtlet.on_widget_edited(value, self)
+
+
+class CompactQtlet(object):
+    """
+    Qtlet of a scalar attribute, without a QObject of its own.
+
+    Used by `CompactQtlets`. Widgets are updated by calling their slots
+    directly, and the `Dispatcher` of the class emits `data_changed` for all
+    attributes of all instances. Supports linking, comparing, batching,
+    polling on a fixed interval, setting from other threads, and the
+    suppression of echoes. The other features of `Qtlet` are not available.
+    """
+    __slots__ = ("_inst", "attr", "links", "compare", "dispatcher",
+                 "scheduler", "_last", "_pushing", "_resync", "_origin",
+                 "_posted", "_kept", "__weakref__")
+    executor = None  # never polled in threads
+    stats = None
+
+    def __init__(self, inst, attr, compare=None):
+        self._inst = _inst_ref(inst, self)
+        self.attr = attr
+        self.links = []
+        self.compare = equal if compare is None else compare
+        self.dispatcher = dispatcher(type(inst))
+        self.scheduler = None  # the PollScheduler, when polling
+        self._last = _NOTHING  # last value pushed to the widgets
+        self._pushing = _NOTHING  # value being sent to the widgets
+        self._resync = None  # sync requested during the push: None or force
+        self._origin = None  # (link, value) of the edit being set
+        self._posted = None  # pending sync from another thread: None or force
+        self._kept = False  # requested with `qtlet`: kept without widgets
+
+    @property
+    def inst(self):
+        """
+        The instance holding the attribute. Only weakly referenced: the qtlet
+        is torn down when the instance is collected, and is then None.
+        """
+        return self._inst()
+
+    @property
+    def value(self):
+        inst = self._inst()
+        return None if inst is None else getattr(inst, self.attr)
+
+    @value.setter
+    def value(self, value):
+        inst = self._inst()
+        if inst is not None:
+            setattr(inst, self.attr, value)
+
+    @property
+    def widgets(self):
+        """Linked widgets."""
+        return [w for w in (l.widget for l in self.links) if w is not None]
+
+    @property
+    def has_widgets(self):
+        return len(self.links) > 0
+
+    def on_widget_edited(self, value, link=None):
+        """Update the attribute to given value. See `Qtlet.on_widget_edited`."""
+        if self._pushing is not _NOTHING \
+                and self.compare(self._pushing, value) \
+                or self._inst() is None:
+            return
+        origin, self._origin = self._origin, (link, value)
+        try:
+            self.value = value
+        finally:
+            self._origin = origin
+
+    def sync_widgets(self, force: bool=False):
+        """Update all linked widgets, see `Qtlet.sync_widgets`."""
+        dispatcher = self.dispatcher
+        if QThread.currentThread() is not dispatcher.thread():
+            with dispatcher.lock:
+                pending = self._posted
+                self._posted = bool(force or pending)
+            if pending is None:
+                dispatcher._sync_requested.emit(self)
+            return True
+        if self._inst() is None:  # collected: torn down
+            return False
+        return self._sync(force)
+
+    def _sync(self, force=False, value=_NOTHING):
+        if self._pushing is not _NOTHING:  # re-entrant: once the push is done
+            self._resync = bool(force or self._resync)
+            return True
+        if value is _NOTHING:
+            value = self.value
+        if not force and self._last is not _NOTHING \
+                and self.compare(self._last, value):
+            return False
+        self._last = value
+        origin = self._origin
+        skip = origin[0] if origin is not None \
+            and self.compare(origin[1], value) else None
+        self._pushing = value
+        try:
+            for link in self.links:
+                if link is not skip:
+                    try:
+                        link.set_value(value)
+                    except Exception:
+                        logger.exception(f"Error while updating {self.attr!r}")
+            self.dispatcher.data_changed.emit(self.inst, self.attr, value)
+        finally:
+            self._pushing = _NOTHING
+        if self._resync is not None:
+            force, self._resync = self._resync, None
+            self._sync(force)
+        return True
+
+    def use_compare(self, compare):
+        """Set the function used to detect changes, see `Qtlet.use_compare`."""
+        self.compare = compare
+        return self
+
+    def link_widget(self, widget, widget_signal=None, widget_slot=None):
+        """Link a widget to the attribute."""
+        if widget_signal is None:
+            widget_signal = notifier_signal(widget)
+        if widget_slot is None:
+            widget_slot = setter_slot(widget)
+        link = _CompactLink(self, widget, widget_signal, widget_slot)
+        if widget_signal is not None:  # None for display-only widgets
+            widget_signal.connect(link.edited)
+        link.on_destroyed = partial(self._on_widget_destroyed, link)
+        widget.destroyed.connect(link.on_destroyed)
+        self.links.append(link)
+        self.sync_widgets(force=True)
+        return self
+
+    def unlink_widget(self, widget):
+        """Disconnect `widget`. Raises ValueError if it isn't linked."""
+        for link in self.links:
+            if link.widget is widget:
+                break
+        else:
+            raise ValueError(f"Widget {widget!r} is not linked to {self.attr!r}")
+        self._unlink(link)
+        _disconnect(widget.destroyed, link.on_destroyed)
+        return self
+
+    def _unlink(self, link):
+        self.links.remove(link)
+        if link.signal is not None:
+            _disconnect(link.signal, link.edited)
+
+    def _on_widget_destroyed(self, link, obj=None):
+        if link not in self.links:
+            return
+        self.links.remove(link)
+        inst = self.inst
+        if inst is not None:
+            inst._remove_unused(self)
+
+    def teardown(self):
+        """Unlink all widgets, and stop polling."""
+        for link in list(self.links):
+            widget = link.widget
+            self._unlink(link)
+            if widget is not None:
+                _disconnect(widget.destroyed, link.on_destroyed)
+        self.stop_polling()
+
+    def poll(self, value=_NOTHING):
+        """Called by the `PollScheduler` on each tick."""
+        self._sync(value=value)
+
+    def use_polling(self, interval: float=20, scheduler=None):
+        """Checks and update the value on a fixed interval, in ms."""
+        if scheduler is None:
+            scheduler = self.scheduler or default_scheduler()
+        if self.scheduler is not None and self.scheduler is not scheduler:
+            self.scheduler.remove(self)
+        self.scheduler = scheduler
+        scheduler.add(self, interval)
+        return self
+
+    def stop_polling(self):
+        """Stop polling."""
+        if self.scheduler is not None:
+            self.scheduler.remove(self)
+            self.scheduler = None
+        return self
+
+    def pause_polling(self):
+        """Temporarily stop polling, see `resume_polling`."""
+        if self.scheduler is not None:
+            self.scheduler.pause(self)
+        return self
+
+    def resume_polling(self):
+        """Resume polling after `pause_polling`."""
+        if self.scheduler is not None:
+            self.scheduler.resume(self)
+        return self
+
+    @property
+    def polling(self) -> bool:
+        """True if the value is currently polled."""
+        return self.scheduler is not None and not self.scheduler.is_paused(self)
+
+
+# qtlets of scalar attributes, replaced by compact qtlets.
+_SCALAR_QTLETS = (Qtlet, IntQtlet, FloatQtlet, StrQtlet, BoolQtlet)
+
+
+class CompactQtlets(object):
+    """
+    Mixin using a `CompactQtlet` for scalar attributes, instead of a `Qtlet`.
+
+    A `Qtlet` is a QObject: linking thousands of attributes creates thousands
+    of QObjects. Compact qtlets are plain records, and share a `Dispatcher`
+    per class. `link_widget` is unchanged. Other attributes, such as
+    collections and arrays, still use their own qtlet type. Use it before
+    `HasQtlets` or `HasQtletDescriptors`:
+    ```
+    class Channel(CompactQtlets, HasQtlets): pass
+    ```
+    """
+    def create_qtlet(self, attr_name: str, cls=None):
+        if cls is None \
+                and qtlet_type(getattr(self, attr_name)) in _SCALAR_QTLETS:
+            cls = CompactQtlet
+        return super().create_qtlet(attr_name, cls)
+
+    def link_widget(self, widget, attr_name: str, widget_signal=None,
+                    widget_slot=None, compare=None, max_rate=None,
+                    defer_hidden=None):
+        """
+        Link widget to attr. Attributes linked with `max_rate` or
+        `defer_hidden` use a full `Qtlet`, which supports them.
+        """
+        options = [name for name, used in [("max_rate", max_rate is not None),
+                                           ("defer_hidden", defer_hidden)]
+                   if used]
+        qtl = self.qtlets.get(attr_name)
+        if options and qtl is None:
+            self.qtlets[attr_name] = _QtletsBase.create_qtlet(self, attr_name)
+            self._bind_attribute(attr_name)
+        elif options and isinstance(qtl, CompactQtlet):
+            raise TypeError(
+                f"{attr_name!r} is already linked with a compact qtlet, which "
+                f"doesn't support {', '.join(options)}: use them when linking "
+                f"the first widget")
+        return super().link_widget(widget, attr_name, widget_signal,
+                                   widget_slot, compare, max_rate,
+                                   defer_hidden)
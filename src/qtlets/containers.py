@@ -0,0 +1,383 @@
+# containers.py
+# observable list, dict and set, reporting fine-grained changes.
+
+from typing import NamedTuple
+
+
+class Change(NamedTuple):
+    """
+    A change to an observable container, on rows `first` to `last` (included).
+
+    op is one of:
+        "insert": rows were inserted.
+        "remove": rows were removed.
+        "set": rows were modified in place.
+        "move": row `first` was moved to index `dest`.
+        "reset": everything may have changed.
+    """
+    op: str
+    first: int = 0
+    last: int = -1
+    dest: int = None
+
+
+_RESET = Change("reset")
+
+
+class _Observable(object):
+    """
+    Notifies observers before and after each change.
+
+    Observers implement `before(change)` and `after(change)`. Rows are the
+    order of iteration.
+    """
+    __slots__ = ()
+
+    def observe(self, observer):
+        self._observers.append(observer)
+
+    def unobserve(self, observer):
+        self._observers.remove(observer)
+
+    def _before(self, change):
+        for obs in self._observers:
+            obs.before(change)
+
+    def _after(self, change):
+        for obs in self._observers:
+            obs.after(change)
+
+
+class ObservableList(_Observable, list):
+    """`list` reporting insertions, removals, moves and modifications."""
+    __slots__ = ("_observers",)
+
+    def __init__(self, *a):
+        super().__init__(*a)
+        self._observers = []
+
+    def _row(self, i: int) -> int:
+        n = len(self)
+        r = i + n if i < 0 else i
+        if not 0 <= r < n:
+            raise IndexError("list index out of range")
+        return r
+
+    def _insert(self, first: int, items: list):
+        if not items:
+            return
+        change = Change("insert", first, first + len(items) - 1)
+        self._before(change)
+        list.__setitem__(self, slice(first, first), items)
+        self._after(change)
+
+    def _remove(self, first: int, last: int):
+        if last < first:
+            return
+        change = Change("remove", first, last)
+        self._before(change)
+        list.__delitem__(self, slice(first, last + 1))
+        self._after(change)
+
+    def _reset(self, method, *a, **kw):
+        self._before(_RESET)
+        try:
+            return method(self, *a, **kw)
+        finally:
+            self._after(_RESET)
+
+    def _set(self, first: int, last: int):
+        if last >= first:
+            self._after(Change("set", first, last))
+
+    def append(self, item):
+        self._insert(len(self), [item])
+
+    def extend(self, items):
+        self._insert(len(self), list(items))
+
+    def insert(self, i: int, item):
+        n = len(self)
+        if i < 0:
+            i = max(i + n, 0)
+        self._insert(min(i, n), [item])
+
+    def pop(self, i: int=-1):
+        if not self:
+            raise IndexError("pop from empty list")
+        r = self._row(i)
+        item = self[r]
+        self._remove(r, r)
+        return item
+
+    def remove(self, item):
+        r = self.index(item)
+        self._remove(r, r)
+
+    def clear(self):
+        self._remove(0, len(self) - 1)
+
+    def __setitem__(self, i, value):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            value = list(value)
+            if step == 1 and len(value) == max(stop - start, 0):
+                list.__setitem__(self, i, value)
+                self._set(start, stop - 1)
+            else:
+                self._reset(list.__setitem__, i, value)
+        else:
+            r = self._row(i)
+            list.__setitem__(self, r, value)
+            self._set(r, r)
+
+    def __delitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step == 1:
+                self._remove(start, stop - 1)
+            else:
+                self._reset(list.__delitem__, i)
+        else:
+            r = self._row(i)
+            self._remove(r, r)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, n: int):
+        if n <= 0:
+            self.clear()
+        else:
+            self.extend(list(self) * (n - 1))
+        return self
+
+    def sort(self, *a, **kw):
+        list.sort(self, *a, **kw)
+        self._set(0, len(self) - 1)
+
+    def reverse(self):
+        list.reverse(self)
+        self._set(0, len(self) - 1)
+
+    def move(self, src: int, dest: int):
+        """Move the item at index `src` to index `dest`."""
+        src, dest = self._row(src), self._row(dest)
+        if src == dest:
+            return
+        change = Change("move", src, src, dest)
+        self._before(change)
+        list.insert(self, dest, list.pop(self, src))
+        self._after(change)
+
+    def copy(self):
+        return list(self)
+
+
+class _KeyedRows(_Observable):
+    """
+    Keeps track of the row of each key, in insertion order.
+
+    Appending and modifying are O(1), removing is O(n).
+    """
+    __slots__ = ()
+
+    def _init_rows(self):
+        self._observers = []
+        self._keys = list(self._iter_keys())
+        self._rows = {k: i for i, k in enumerate(self._keys)}
+
+    def key_at(self, row: int):
+        return self._keys[row]
+
+    def row_of(self, key) -> int:
+        return self._rows[key]
+
+    def _append_key(self, key, store):
+        r = len(self._keys)
+        change = Change("insert", r, r)
+        self._before(change)
+        store()
+        self._keys.append(key)
+        self._rows[key] = r
+        self._after(change)
+
+    def _remove_key(self, key, discard):
+        r = self._rows[key]
+        change = Change("remove", r, r)
+        self._before(change)
+        discard()
+        keys, rows = self._keys, self._rows
+        del keys[r]
+        del rows[key]
+        for i in range(r, len(keys)):
+            rows[keys[i]] = i
+        self._after(change)
+
+    def _rebuild(self, mutate):
+        """Apply a bulk change, reported as a reset."""
+        self._before(_RESET)
+        try:
+            mutate()
+        finally:
+            self._keys = list(self._iter_keys())
+            self._rows = {k: i for i, k in enumerate(self._keys)}
+            self._after(_RESET)
+
+
+class ObservableDict(_KeyedRows, dict):
+    """`dict` reporting changes. Each key is a row, in insertion order."""
+    __slots__ = ("_observers", "_keys", "_rows")
+
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self._init_rows()
+
+    def _iter_keys(self):
+        return dict.keys(self)
+
+    def __setitem__(self, key, value):
+        if key in self._rows:
+            dict.__setitem__(self, key, value)
+            r = self._rows[key]
+            self._after(Change("set", r, r))
+        else:
+            self._append_key(key, lambda: dict.__setitem__(self, key, value))
+
+    def __delitem__(self, key):
+        if key not in self._rows:
+            raise KeyError(key)
+        self._remove_key(key, lambda: dict.__delitem__(self, key))
+
+    def pop(self, key, *default):
+        if key in self._rows:
+            value = dict.__getitem__(self, key)
+            del self[key]
+            return value
+        elif default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        if not self._keys:
+            raise KeyError("popitem(): dictionary is empty")
+        key = self._keys[-1]
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self._rows:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *a, **kw):
+        for key, value in dict(*a, **kw).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        if self._keys:
+            self._rebuild(lambda: dict.clear(self))
+
+    def copy(self):
+        return dict(self)
+
+
+class ObservableSet(_KeyedRows, set):
+    """`set` reporting changes. Each item is a row, in insertion order."""
+    __slots__ = ("_observers", "_keys", "_rows")
+
+    def __init__(self, *a):
+        super().__init__(*a)
+        self._init_rows()
+
+    def _iter_keys(self):
+        return set.__iter__(self)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def add(self, item):
+        if item not in self._rows:
+            self._append_key(item, lambda: set.add(self, item))
+
+    def discard(self, item):
+        if item in self._rows:
+            self._remove_key(item, lambda: set.discard(self, item))
+
+    def remove(self, item):
+        if item not in self._rows:
+            raise KeyError(item)
+        self.discard(item)
+
+    def pop(self):
+        if not self._keys:
+            raise KeyError("pop from an empty set")
+        item = self._keys[-1]
+        self.discard(item)
+        return item
+
+    def clear(self):
+        if self._keys:
+            self._rebuild(lambda: set.clear(self))
+
+    def update(self, *others):
+        for other in others:
+            for item in other:
+                self.add(item)
+
+    def difference_update(self, *others):
+        self._rebuild(lambda: set.difference_update(self, *others))
+
+    def intersection_update(self, *others):
+        self._rebuild(lambda: set.intersection_update(self, *others))
+
+    def symmetric_difference_update(self, other):
+        for item in set(other):
+            if item in self._rows:
+                self.discard(item)
+            else:
+                self.add(item)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+    def copy(self):
+        return set(self)
+
+
+_observable_types = {
+    list: ObservableList,
+    dict: ObservableDict,
+    set: ObservableSet,
+}
+
+
+def observable(value):
+    """
+    Wrap a `list`, `dict` or `set` in its observable counterpart.
+
+    Other values, including subclasses, are returned as is.
+    """
+    cls = _observable_types.get(type(value))
+    return value if cls is None else cls(value)
+
+
+def is_observable(value) -> bool:
+    return isinstance(value, _Observable)
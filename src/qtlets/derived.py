@@ -0,0 +1,235 @@
+# derived.py
+# attributes computed from other attributes, memoized until an input is set.
+
+from concurrent.futures import CancelledError
+from functools import partial
+import logging
+import weakref
+
+from PySide2.QtCore import QObject, Qt, Signal
+
+from .workers import default_executor
+
+logger = logging.getLogger(__name__)
+
+
+class Derived(object):
+    """
+    Read-only attribute computed by `func(inst)` from the attributes named in
+    `depends`, see `derived`.
+
+    The value is memoized in the instance `__dict__` until it is invalidated
+    by the class, when one of the inputs is set.
+    """
+    def __init__(self, func, depends):
+        self.func = func
+        self.depends = tuple(depends)
+        self.name = getattr(func, "__name__", None)  # see `__set_name__`
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, inst, owner=None):
+        if inst is None:
+            return self
+        try:
+            return inst.__dict__[self.name]
+        except KeyError:
+            value = inst.__dict__[self.name] = self.func(inst)
+            return value
+
+    def __set__(self, inst, value):
+        raise AttributeError(f"can't set derived attribute {self.name!r}")
+
+    def __delete__(self, inst):
+        raise AttributeError(f"can't delete derived attribute {self.name!r}")
+
+    def invalidate(self, inst):
+        """Called when an input is set: the value is computed on next read."""
+        inst.__dict__.pop(self.name, None)
+
+
+def derived(*depends: str):
+    """
+    Decorator declaring a derived attribute of a `HasQtlets` or
+    `HasQtletDescriptors` class, computed from the attributes `depends`:
+    ```
+    @derived("voltage", "current")
+    def power(self):
+        return self.voltage * self.current
+    ```
+    Derived attributes can depend on other derived attributes.
+    """
+    def decorator(func):
+        return Derived(func, depends)
+    return decorator
+
+
+class _Job(object):
+    """State of an offloaded attribute of an instance."""
+    __slots__ = ("value", "stale", "generation", "future")
+
+    def __init__(self, value):
+        self.value = value  # last result
+        self.stale = True  # an input was set since the job was submitted
+        self.generation = 0  # incremented when the inputs change
+        self.future = None  # job in flight
+
+
+class _Results(QObject):
+    """Delivers the results of offloaded jobs in the GUI thread."""
+    ready = Signal(object)  # callable, called in the GUI thread
+
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.ready.connect(self._on_ready, Qt.QueuedConnection)
+
+    def _on_ready(self, deliver):
+        deliver()
+
+
+_results = None
+
+
+def _default_results() -> _Results:
+    global _results
+    if _results is None:
+        _results = _Results()
+    return _results
+
+
+class Offloaded(Derived):
+    """
+    Derived attribute computed by `func(*inputs)` in an executor, see
+    `offloaded`.
+
+    Reading the attribute never blocks: it returns the last result, and
+    submits a job if an input was set since. Jobs made stale by new inputs are
+    cancelled if they haven't started, and their results are discarded
+    otherwise. Results are delivered in the GUI thread, where the qtlet of the
+    attribute and of the attributes derived from it are synced.
+    """
+    def __init__(self, func, depends, executor=None, initial=None):
+        super().__init__(func, depends)
+        self.executor = executor
+        self.initial = initial
+
+    def _job(self, inst) -> _Job:
+        job = inst.__dict__.get(self.name)
+        if job is None:
+            job = inst.__dict__[self.name] = _Job(self.initial)
+        return job
+
+    def __get__(self, inst, owner=None):
+        if inst is None:
+            return self
+        job = self._job(inst)
+        if job.stale and job.future is None:
+            self._submit(inst, job)
+        return job.value
+
+    def _submit(self, inst, job):
+        executor = self.executor
+        if executor is None:
+            executor = default_executor()
+        args = [getattr(inst, name) for name in self.depends]
+        job.stale = False
+        job.future = executor.submit(self.func, *args)
+        results = _default_results()
+        deliver = partial(self._deliver, weakref.ref(inst), job.generation,
+                          job.future)
+        job.future.add_done_callback(lambda f: results.ready.emit(deliver))
+
+    def _deliver(self, ref, generation, future):
+        inst = ref()
+        if inst is None:
+            return
+        job = self._job(inst)
+        if job.generation != generation:  # stale: discarded
+            return
+        job.future = None
+        try:
+            job.value = future.result()
+        except CancelledError:
+            return
+        except Exception:
+            logger.exception(f"Error while computing {self.name!r}")
+            return
+        inst._update_derived(self.name)
+
+    def invalidate(self, inst):
+        job = self._job(inst)
+        job.stale = True
+        job.generation += 1
+        if job.future is not None:
+            job.future.cancel()
+            job.future = None
+
+    def pending(self, inst) -> bool:
+        """True while a job computing the value for `inst` is in flight."""
+        job = inst.__dict__.get(self.name)
+        return job is not None and job.future is not None
+
+
+def offloaded(func, *depends: str, executor=None, initial=None):
+    """
+    Derived attribute computed by `func(*inputs)` in `executor`, so that
+    heavy computations don't freeze the GUI:
+    ```
+    class Scope(HasQtlets):
+        spectrum = offloaded(np.fft.rfft, "trace")
+    ```
+    `func` receives the values of the attributes `depends`, and not the
+    instance, so it can be sent to a `ProcessPoolExecutor` if it can be
+    pickled. Uses the shared thread pool of `default_executor` by default.
+    The value is `initial` until the first result is delivered.
+    """
+    return Offloaded(func, depends, executor, initial)
+
+
+def dependents(cls: type) -> dict:
+    """
+    Derived attributes of `cls` affected by setting each attribute, as
+    `{name: (derived names...)}`, in topological order.
+
+    Raises TypeError if the dependencies are circular.
+    """
+    attrs = {}
+    for klass in reversed(cls.__mro__):
+        for name, attr in vars(klass).items():
+            if isinstance(attr, Derived):
+                attrs[name] = attr
+            else:
+                attrs.pop(name, None)  # overridden
+    # topological order: the dependencies of a derived attribute come first.
+    order = {}
+    visiting = set()
+    def visit(name):
+        if name in order or name not in attrs:
+            return
+        if name in visiting:
+            raise TypeError(f"Circular dependencies of {cls.__name__}.{name}")
+        visiting.add(name)
+        for dep in attrs[name].depends:
+            visit(dep)
+        visiting.discard(name)
+        order[name] = len(order)
+    for name in attrs:
+        visit(name)
+    users = {}  # name -> derived attributes using it directly
+    for name, attr in attrs.items():
+        users.setdefault(name, [])
+        for dep in attr.depends:
+            users.setdefault(dep, []).append(name)
+    result = {}
+    for name in users:
+        found = set()
+        todo = list(users[name])
+        while todo:
+            d = todo.pop()
+            if d not in found:
+                found.add(d)
+                todo.extend(users[d])
+        result[name] = tuple(sorted(found, key=order.__getitem__))
+    return result
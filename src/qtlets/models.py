@@ -0,0 +1,188 @@
+# models.py
+# Qt item models backed by python containers.
+
+from functools import singledispatch
+
+from PySide2.QtCore import QAbstractListModel, QAbstractTableModel, \
+    QModelIndex, Qt
+
+from .containers import is_observable
+
+_NO_PARENT = QModelIndex()
+
+
+def editable(flags) -> Qt.ItemFlags:
+    """
+    `flags` with `Qt.ItemIsEditable` set. Built from ints: the operators of
+    the flags raise TypeError with some versions of PySide2.
+    """
+    return Qt.ItemFlags(int(flags) | int(Qt.ItemIsEditable))
+
+
+class _ContainerModel(object):
+    """
+    Common behavior of the container models.
+
+    The model observes the container, and translates its changes to the
+    corresponding `begin...`/`end...` calls, so views are updated
+    incrementally. Containers that are not observable are only refreshed by
+    `set_container`. Models with `read_only` set can't be edited from views.
+    """
+    n_columns = 1
+    read_only = False
+    def _init_container(self, container):
+        self.container = None
+        self.set_container(container)
+
+    def set_container(self, container):
+        """Display `container`. Resets the model."""
+        self.beginResetModel()
+        if self.container is not None and is_observable(self.container):
+            self.container.unobserve(self)
+        self.container = container
+        if is_observable(container):
+            container.observe(self)
+        self.endResetModel()
+
+    def before(self, change):
+        op = change.op
+        if op == "insert":
+            self.beginInsertRows(_NO_PARENT, change.first, change.last)
+        elif op == "remove":
+            self.beginRemoveRows(_NO_PARENT, change.first, change.last)
+        elif op == "move":
+            # Qt wants the row before which the rows are moved.
+            dest = change.dest + 1 if change.dest > change.first else change.dest
+            self.beginMoveRows(_NO_PARENT, change.first, change.last,
+                               _NO_PARENT, dest)
+        elif op == "reset":
+            self.beginResetModel()
+
+    def after(self, change):
+        op = change.op
+        if op == "insert":
+            self.endInsertRows()
+        elif op == "remove":
+            self.endRemoveRows()
+        elif op == "move":
+            self.endMoveRows()
+        elif op == "reset":
+            self.endResetModel()
+        elif op == "set":
+            self.dataChanged.emit(
+                self.index(change.first, 0),
+                self.index(change.last, self.n_columns - 1),
+            )
+
+    def rowCount(self, parent=_NO_PARENT):
+        if parent.isValid() or self.container is None:
+            return 0
+        return len(self.container)
+
+
+class SequenceModel(_ContainerModel, QAbstractListModel):
+    """
+    List model displaying the items of a sequence or set.
+
+    Items are displayed using `str`, and available unchanged with the edit and
+    user roles. Lists can be edited from the view.
+    """
+    def __init__(self, container=None, *a, **kw):
+        super().__init__(*a, **kw)
+        self._init_container(container)
+
+    def item(self, row: int):
+        container = self.container
+        if hasattr(container, "key_at"):
+            return container.key_at(row)
+        elif isinstance(container, (set, frozenset)):
+            return list(container)[row]
+        return container[row]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return str(self.item(index.row()))
+        elif role in (Qt.EditRole, Qt.UserRole):
+            return self.item(index.row())
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if isinstance(self.container, list) and not self.read_only:
+            flags = editable(flags)
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not isinstance(self.container, list) \
+                or self.read_only:
+            return False
+        self.container[index.row()] = value
+        if not is_observable(self.container):
+            self.dataChanged.emit(index, index)
+        return True
+
+
+class MappingModel(_ContainerModel, QAbstractTableModel):
+    """
+    Table model displaying the keys and values of a mapping, in two columns.
+
+    Values can be edited from the view.
+    """
+    headers = ("Key", "Value")
+    n_columns = 2
+
+    def __init__(self, container=None, *a, **kw):
+        super().__init__(*a, **kw)
+        self._init_container(container)
+
+    def columnCount(self, parent=_NO_PARENT):
+        return 0 if parent.isValid() else self.n_columns
+
+    def key(self, row: int):
+        container = self.container
+        if hasattr(container, "key_at"):
+            return container.key_at(row)
+        return list(container)[row]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self.key(index.row())
+        item = key if index.column() == 0 else self.container[key]
+        if role == Qt.DisplayRole:
+            return str(item)
+        elif role in (Qt.EditRole, Qt.UserRole):
+            return item
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() == 1 and not self.read_only:
+            flags = editable(flags)
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or index.column() != 1 or self.read_only:
+            return False
+        self.container[self.key(index.row())] = value
+        if not is_observable(self.container):
+            self.dataChanged.emit(index, index)
+        return True
+
+
+@singledispatch
+def container_model(container):
+    """Model class used to display `container`."""
+    return SequenceModel
+
+
+@container_model.register(dict)
+def model_dict(container):
+    return MappingModel
@@ -0,0 +1,228 @@
+# polling.py
+# shared timers for polling qtlets: one QTimer per interval.
+
+import logging
+import math
+
+from PySide2.QtCore import QObject, QTimer
+
+logger = logging.getLogger(__name__)
+
+
+class Backoff(object):
+    """
+    Adaptive polling interval, in ms.
+
+    Starts at `min_interval`. Each poll that finds the value unchanged
+    multiplies the interval by `factor`, up to `max_interval`. A change
+    resets it to `min_interval`.
+    """
+    def __init__(self, min_interval: int, max_interval: int,
+                 factor: float=2.):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Expected 0 < min_interval <= max_interval, got "
+                             f"{min_interval} and {max_interval}")
+        if factor <= 1:
+            raise ValueError(f"Backoff factor must be > 1, got {factor}")
+        self.min_interval = int(min_interval)
+        self.max_interval = int(max_interval)
+        self.factor = factor
+        self.interval = self.min_interval
+
+    def grow(self) -> bool:
+        """Back off after an unchanged poll. True if the interval changed."""
+        # grows by at least 1 ms, even when rounding would cancel the factor.
+        interval = min(max(self.interval + 1,
+                           math.ceil(self.interval * self.factor)),
+                       self.max_interval)
+        changed, self.interval = interval != self.interval, interval
+        return changed
+
+    def reset(self) -> bool:
+        """Go back to the fastest rate. True if the interval changed."""
+        changed, self.interval = self.interval != self.min_interval, \
+            self.min_interval
+        return changed
+
+
+class PollBucket(QObject):
+    """
+    Group of qtlets polled on the same interval, by a single timer.
+    """
+    def __init__(self, interval: int, *a, **kw):
+        super().__init__(*a, **kw)
+        self.interval = interval
+        self.qtlets = {}  # qtlet -> active. dicts keep the insertion order.
+        self.bulk = set()  # qtlets read with `_qtlets_read_many`
+        self.paused = False
+        self.timer = QTimer(parent=self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.poll)
+
+    def __len__(self):
+        return len(self.qtlets)
+
+    @property
+    def has_active(self):
+        return any(self.qtlets.values())
+
+    def update_timer(self):
+        """Run the timer only if it has something to do."""
+        if self.paused or not self.has_active:
+            self.timer.stop()
+        elif not self.timer.isActive():
+            self.timer.start()
+
+    def poll(self):
+        """
+        Poll all active qtlets, in one pass.
+
+        Qtlets of an instance providing a bulk getter,
+        `_qtlets_read_many(names) -> {name: value}`, are read in a single call
+        per instance. Names missing from the result are read one by one.
+        Qtlets polled in threads are always read one by one.
+        """
+        bulk = self.bulk
+        batches = {}  # id(instance) -> qtlets. dicts keep the insertion order.
+        for qtl, active in list(self.qtlets.items()):
+            if not active:
+                continue
+            if bulk and qtl in bulk:
+                batches.setdefault(id(qtl.inst), []).append(qtl)
+                continue
+            try:
+                qtl.poll()
+            except Exception:
+                # don't let a single attribute kill the whole bucket.
+                logger.exception(f"Error while polling {qtl.attr!r}")
+        for batch in batches.values():
+            self._poll_batch(batch)
+
+    def _poll_batch(self, batch):
+        names = [qtl.attr for qtl in batch]
+        try:
+            values = batch[0].inst._qtlets_read_many(names)
+        except Exception:
+            logger.exception(f"Error while polling {names!r}")
+            return
+        for qtl in batch:
+            try:
+                if qtl.attr in values:
+                    qtl.poll(values[qtl.attr])
+                else:
+                    qtl.poll()
+            except Exception:
+                logger.exception(f"Error while polling {qtl.attr!r}")
+
+
+class PollScheduler(QObject):
+    """
+    Polls qtlets using one timer per interval.
+
+    All qtlets using the same interval are serviced by the same timer, in a
+    single pass. Qtlets, and whole intervals, can be paused and resumed.
+    """
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.buckets = {}  # interval -> PollBucket
+        self._intervals = {}  # qtlet -> interval
+
+    def __contains__(self, qtlet):
+        return qtlet in self._intervals
+
+    def bucket(self, interval: int) -> PollBucket:
+        """Get the bucket for `interval`, creating it if needed."""
+        interval = int(interval)
+        if interval not in self.buckets:
+            self.buckets[interval] = PollBucket(interval, parent=self)
+        return self.buckets[interval]
+
+    def interval(self, qtlet):
+        """Polling interval of `qtlet`, in ms, or None if not polled."""
+        return self._intervals.get(qtlet)
+
+    def add(self, qtlet, interval: int=20):
+        """Poll `qtlet` every `interval` ms. Moves it if already polled."""
+        if qtlet in self._intervals:
+            self.remove(qtlet)
+        bucket = self.bucket(interval)
+        bucket.qtlets[qtlet] = True
+        if qtlet.executor is None and hasattr(qtlet.inst, "_qtlets_read_many"):
+            bucket.bulk.add(qtlet)
+        self._intervals[qtlet] = bucket.interval
+        bucket.update_timer()
+
+    def move(self, qtlet, interval: int):
+        """Change the interval of `qtlet`, keeping it paused or active."""
+        bucket = self.buckets[self._intervals[qtlet]]
+        if bucket.interval == int(interval):
+            return
+        active = bucket.qtlets[qtlet]
+        self.add(qtlet, interval)
+        if not active:
+            self.pause(qtlet)
+
+    def remove(self, qtlet):
+        """Stop polling `qtlet`."""
+        interval = self._intervals.pop(qtlet, None)
+        if interval is None:
+            return
+        bucket = self.buckets[interval]
+        del bucket.qtlets[qtlet]
+        bucket.bulk.discard(qtlet)
+        if len(bucket) == 0:
+            bucket.timer.stop()
+            del self.buckets[interval]
+            bucket.deleteLater()
+        else:
+            bucket.update_timer()
+
+    def pause(self, qtlet):
+        """Temporarily stop polling `qtlet`."""
+        self._set_active(qtlet, False)
+
+    def resume(self, qtlet):
+        """Resume polling `qtlet`."""
+        self._set_active(qtlet, True)
+
+    def is_paused(self, qtlet) -> bool:
+        bucket = self.buckets[self._intervals[qtlet]]
+        return bucket.paused or not bucket.qtlets[qtlet]
+
+    def _set_active(self, qtlet, active: bool):
+        bucket = self.buckets[self._intervals[qtlet]]
+        bucket.qtlets[qtlet] = active
+        bucket.update_timer()
+
+    def pause_all(self, interval: int=None):
+        """Pause all polling, or only polling at `interval`."""
+        self._set_paused(interval, True)
+
+    def resume_all(self, interval: int=None):
+        """Resume all polling, or only polling at `interval`."""
+        self._set_paused(interval, False)
+
+    def _set_paused(self, interval, paused: bool):
+        if interval is None:
+            buckets = self.buckets.values()
+        else:
+            buckets = [self.buckets[int(interval)]]
+        for bucket in buckets:
+            bucket.paused = paused
+            bucket.update_timer()
+
+    def stop(self):
+        """Stop polling everything, and forget about all qtlets."""
+        for qtl in list(self._intervals):
+            self.remove(qtl)
+
+
+_default_scheduler = None
+
+
+def default_scheduler() -> PollScheduler:
+    """Scheduler used by `Qtlet.use_polling` unless specified otherwise."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = PollScheduler()
+    return _default_scheduler
@@ -1,56 +1,759 @@
 # qtlets.py
 # try to remove boilerplate from QT by using observation behavior
 
-from functools import singledispatch
+import asyncio
+from contextlib import contextmanager
+from functools import singledispatch, wraps, partial
 import logging
-from weakref import proxy
+import math
+import threading
+import time
+import weakref
 
-from PySide2.QtCore import QObject, Signal, QTimer
-from PySide2.QtWidgets import QCheckBox, QLineEdit, QAbstractSpinBox
+from PySide2.QtCore import QEvent, QObject, Signal, QTimer, QThread, Qt
+from PySide2.QtWidgets import QCheckBox, QLineEdit, QAbstractSpinBox, \
+    QAbstractItemView, QLabel
 
-from .widgets import TypedLineEdit, ValuedComboBox
+from .aio import QtletStream
+from .containers import is_observable, observable
+from .derived import Derived, dependents
+from .models import container_model
+from .polling import Backoff, default_scheduler
+from .sources import find_source
+from . import stats as _stats
+from .updates import default_update_scheduler
+from .widgets import TypedLineEdit, ValuedComboBox, _disconnect
+from .workers import default_executor
 
 logger = logging.getLogger(__name__)
 
 # The instance will have a the qtlets in a mapping similar to the traits.
 #
 
+# sentinel for "nothing was pushed to the widgets yet"
+_NOTHING = object()
+
+
+# Comparison functions, used to decide if a value has changed since it was last
+# pushed to the widgets. They return True if the two values are the same.
+def equal(a, b) -> bool:
+    """Compare using `==`. Values that can't be compared are different."""
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):  # ex: numpy arrays
+        return False
+
+
+def identical(a, b) -> bool:
+    """Compare using `is`. Use for mutable values modified in-place."""
+    return a is b
+
+
+def isclose(rel_tol: float=1e-9, abs_tol: float=0.0):
+    """Build a tolerance-based comparison for floats, see `math.isclose`."""
+    def compare(a, b):
+        try:
+            return math.isclose(a, b, rel_tol=rel_tol, abs_tol=abs_tol)
+        except TypeError:
+            return equal(a, b)
+    return compare
+
+
+def array_equal(a, b) -> bool:
+    """Compare arrays using `numpy.array_equal`. Requires `numpy`."""
+    import numpy as np
+    if a is b:
+        return True
+    try:
+        return bool(np.array_equal(a, b))
+    except (TypeError, ValueError):
+        return False
+
+
+_default_max_rate = None
+
+
+def set_default_max_rate(max_rate: float=None):
+    """
+    Limit the rate of widget updates of all qtlets, in Hz.
+
+    Applies to qtlets without a rate of their own, see `Qtlet.use_rate_limit`.
+    None removes the limit.
+    """
+    global _default_max_rate
+    _default_max_rate = max_rate
+
+
+_default_defer_hidden = False
+
+
+def set_default_defer_hidden(enabled: bool=True):
+    """
+    Defer the updates of hidden widgets, for all widgets linked from now on.
+
+    See `Qtlet.use_defer_hidden`.
+    """
+    global _default_defer_hidden
+    _default_defer_hidden = enabled
+
+
+def _ref(obj, callback=None):
+    """
+    Weak reference to `obj`, or a callable returning it if not possible.
+    `callback(ref)` is called when `obj` is collected.
+    """
+    try:
+        return weakref.ref(obj, callback)
+    except TypeError:
+        return lambda: obj
+
+
+class _InstRef(weakref.ref):
+    """Weak reference to an instance, tearing `qtlet` down when it is collected."""
+    __slots__ = ("qtlet",)
+
+    def __new__(cls, inst, qtlet):
+        self = super().__new__(cls, inst, _collected)
+        self.qtlet = weakref.ref(qtlet)
+        return self
+
+    def __init__(self, inst, qtlet):
+        super().__init__(inst, _collected)
+
+
+def _collected(ref):
+    qtl = ref.qtlet()
+    if qtl is not None:
+        qtl.teardown()
+
+
+def _inst_ref(inst, qtlet):
+    """Weak reference to `inst`, tearing `qtlet` down when it is collected."""
+    try:
+        return _InstRef(inst, qtlet)
+    except TypeError:
+        return lambda: inst
+
+
+class _Link(object):
+    """
+    Connections between a qtlet and a widget.
+
+    Only holds a weak reference to the widget: slots that are methods of the
+    widget are looked up by name when needed. `push` is connected to the
+    `data_changed` signal of the qtlet, and calls the slot unless `skip`.
+
+    If `stale_filter` is set, values pushed to a hidden widget are kept in
+    `pending`, and `stale_filter` is installed on the widget to apply the
+    latest one when it is shown.
+    """
+    __slots__ = ("widget_ref", "signal", "slot_name", "_slot", "on_destroyed",
+                 "skip", "stale_filter", "pending", "__weakref__")
+
+    def __init__(self, widget, signal, slot):
+        self.widget_ref = weakref.ref(widget)
+        self.signal = signal
+        if getattr(slot, "__self__", None) is widget:
+            self.slot_name, self._slot = slot.__name__, None
+        else:
+            self.slot_name, self._slot = None, slot
+        self.on_destroyed = None
+        self.skip = False  # the widget already shows the value
+        self.stale_filter = None
+        self.pending = _NOTHING
+
+    def push(self, value):
+        if self.skip:
+            return
+        if self.stale_filter is not None:
+            widget = self.widget_ref()
+            if widget is not None and not widget.isVisible():
+                if self.pending is _NOTHING:
+                    widget.installEventFilter(self.stale_filter)
+                self.pending = value
+                return
+        self.set_value(value)
+
+    def set_value(self, value):
+        if self.slot_name is None:
+            self._slot(value)
+            return
+        widget = self.widget_ref()
+        if widget is not None:
+            getattr(widget, self.slot_name)(value)
+
+    def flush(self):
+        """Apply the pending value, if any."""
+        value, self.pending = self.pending, _NOTHING
+        if value is _NOTHING:
+            return
+        widget = self.widget_ref()
+        if widget is not None:
+            widget.removeEventFilter(self.stale_filter)
+        self.set_value(value)
+
+    @property
+    def widget(self):
+        return self.widget_ref()
+
 
 class Qtlet(QObject):
     """
     Adapter between `traitlets` notification and Qt Signals and Slots.
     """
     data_changed = Signal(object)  # fallback
+    poll_error = Signal(object)  # exception raised by a threaded read
+    write_error = Signal(object)  # exception raised by an asynchronous write
+    _sync_requested = Signal()  # used to sync from other threads
+    _read_finished = Signal(object)  # future of a threaded read
+    _write_finished = Signal(object)  # future of an asynchronous write
+
+    # defaults of the attributes used by opt-in features, set on the instance
+    # when they change: setting the attributes of QObjects is slow. Those read
+    # on each sync are set in `__init__`: reading class attributes is slow too.
+    scheduler = None  # the PollScheduler, when polling
+    poll_timeout = None  # in ms, for threaded reads
+    poll_overlap = False  # start reads while one is in flight
+    skipped = 0  # ticks skipped while a read was in flight
+    _last_read = -math.inf  # start time of the last value read
+    _write_pending = _NOTHING  # value to write once it finishes
+    _read_back = None  # future reading the value once the writes are done
+    dropped_writes = 0  # writes replaced by a later value
+    dropped = 0  # updates merged into a later one by the rate limit
+    _trailing = _NOTHING  # value polled for the trailing update, if any
+    defer_hidden = None  # None uses the default when linking
+    _posted = None  # pending sync from another thread: None or force
+    _connected = ()  # signals connected by `_connect_queued`
+    _kept = False  # requested with `qtlet`: kept without widgets
+    _post_lock = threading.Lock()  # shared: held briefly, by other threads
 
-    def __init__(self, inst, attr, *a, **kw):
+    def __init__(self, inst, attr, *a, compare=None, **kw):
         super().__init__(*a, **kw)
-        self.widgets = []  # holds weakref.proxy elements.
-        self.inst = inst
+        self.links = []  # _Link to each widget
+        self._inst = _inst_ref(inst, self)
         self.attr = attr
-        self.timer = None
+        self.backoff = None  # the Backoff, when polling adaptively
+        self.executor = None  # runs the reads, when polling in threads
+        self._reads = {}  # future -> start time, None once timed out
+        self.write_executor = None  # runs the setter, when writing async
+        self._writing = False  # an asynchronous write is in flight
+        self._origin = None  # (widget, value) of the edit being set
+        self._pushing = _NOTHING  # value being sent to the widgets
+        self._resync = None  # sync requested during the push: None or force
+        self.compare = equal if compare is None else compare
+        self._last = _NOTHING  # last value pushed to the widgets
+        self._prefetched = _NOTHING  # value for the next read, when polled
+        self._last_time = -math.inf  # time of the last push
+        self._throttle_timer = None  # delivers the trailing update
+        self.max_rate = None  # in Hz. None uses the default, 0 is unlimited.
+        self.update_scheduler = None  # the UpdateScheduler, if any
+        self.stats = _stats.QtletStats() if _stats.stats_enabled() else None
+
+    def _connect_queued(self, name: str):
+        """
+        Connect the signal `name` to the slot `_on{name}` with a queued
+        connection, once. Connected on first use: connecting them when every
+        qtlet is created makes creating them much slower.
+        """
+        if name in self._connected:
+            return
+        with self._post_lock:  # `_post_sync` connects from other threads
+            if name not in self._connected:
+                getattr(self, name).connect(getattr(self, "_on" + name),
+                                            Qt.QueuedConnection)
+                self._connected += (name,)
+
+    @property
+    def inst(self):
+        """
+        The instance holding the attribute. Only weakly referenced: the qtlet
+        is torn down when the instance is collected, and is then None.
+        """
+        return self._inst()
 
     @property
     def value(self):
-        return getattr(self.inst, self.attr)
+        if self._prefetched is not _NOTHING:  # read in bulk by the poller
+            value, self._prefetched = self._prefetched, _NOTHING
+            return value
+        inst = self._inst()
+        return None if inst is None else getattr(inst, self.attr)
 
     @value.setter
     def value(self, value):
-        setattr(self.inst, self.attr, value)
+        inst = self._inst()
+        if inst is not None:
+            setattr(inst, self.attr, value)
+
+    @property
+    def widgets(self):
+        """Linked widgets."""
+        return [w for w in (l.widget for l in self.links) if w is not None]
 
     @property
     def has_widgets(self):
-        return len(self.widgets) > 0
+        return len(self.links) > 0
 
     def on_widget_edited(self, value):  # this is a slot
         """
         Update the attribute to given value.
+
+        Values sent back by the widgets while they are being updated are
+        echoes, and are ignored. The widget which was edited isn't updated,
+        unless the setter changed the value.
         """
         # note this is exactly the same as @value.setter...
-        self.value = value
+        if self._pushing is not _NOTHING \
+                and self.compare(self._pushing, value) \
+                or self._inst() is None:
+            return
+        if self.backoff is not None:
+            self._poll_faster()
+        if self.write_executor is not None:
+            if self.stats is not None:
+                self.stats.edits += 1
+            self._write_async(value)
+            return
+        origin, self._origin = self._origin, (self.sender(), value)
+        stats = self.stats
+        try:
+            if stats is None:
+                self.value = value
+                return
+            stats.edits += 1
+            t0 = time.perf_counter()
+            try:
+                self.value = value
+            finally:
+                stats.set_time += time.perf_counter() - t0
+        finally:
+            self._origin = origin
+
+    def sync_widgets(self, force: bool=False):
+        """
+        Update all linked widgets with the current value.
+
+        Widgets are only updated if the value changed since the last update,
+        according to `compare`. Use `force=True` to update them regardless.
+
+        If a rate limit is set and the widgets were updated too recently, the
+        update is delayed. The latest value is always delivered.
+
+        Can be called from any thread: the update is then posted to the thread
+        of the qtlet (usually the GUI thread). At most one update is pending at
+        any time, and it reads the latest value when it runs.
+
+        Returns False if the widgets were already up to date, True if they
+        were updated or an update is pending.
+        """
+        if QThread.currentThread() is not self.thread():
+            self._post_sync(force)
+            return True
+        if self._writing:  # synced when the writes are done
+            return True
+        if self._inst() is None:  # collected: torn down
+            return False
+        max_rate = self.max_rate
+        if max_rate is None:
+            max_rate = _default_max_rate
+        if not force and max_rate:
+            if self._throttle_timer is not None \
+                    and self._throttle_timer.isActive():
+                self.dropped += 1
+                self._trailing = self._prefetched
+                return True
+            wait = self._last_time + 1 / max_rate - time.monotonic()
+            if wait > 0:
+                self._trailing = self._prefetched
+                self._delay_sync(wait)
+                return True
+        return self._sync(force)
+
+    def _post_sync(self, force):
+        self._connect_queued("_sync_requested")
+        with self._post_lock:
+            pending = self._posted
+            self._posted = bool(force or pending)
+            if pending is not None:
+                self.dropped += 1
+        if pending is None:
+            self._sync_requested.emit()
+
+    def _on_sync_requested(self):
+        with self._post_lock:
+            force, self._posted = self._posted, None
+        self.sync_widgets(force=bool(force))
+
+    def _sync(self, force=False, value=_NOTHING):
+        if self._throttle_timer is not None:
+            self._throttle_timer.stop()
+            self._trailing = _NOTHING
+        if self._pushing is not _NOTHING:  # re-entrant: once the push is done
+            self._resync = bool(force or self._resync)
+            return True
+        stats = self.stats
+        if stats is not None:
+            stats.syncs += 1
+        if value is not _NOTHING:  # already read by a subclass
+            pass
+        elif stats is not None:
+            t0 = time.perf_counter()
+            value = self.value
+            stats.get_time += time.perf_counter() - t0
+        else:
+            value = self.value
+        if not force and self._last is not _NOTHING \
+                and self.compare(self._last, value):
+            if stats is not None:
+                stats.suppressed += 1
+            return False
+        self._last = value
+        self._last_time = time.monotonic()
+        if self.backoff is not None:
+            self._poll_faster()
+        if self.update_scheduler is not None and not force \
+                and self._origin is None:
+            self.update_scheduler.schedule(self)
+            return True
+        self._push(value)
+        return True
+
+    def _push_last(self):
+        """Send the last value read to the widgets. Used by `UpdateScheduler`."""
+        if self._last is not _NOTHING:
+            self._push(self._last)
+
+    def _push(self, value):
+        stats = self.stats
+        if self.update_scheduler is not None:
+            self.update_scheduler.discard(self)
+        self._pushing = value
+        try:
+            if stats is None:
+                self._emit(value)
+            else:
+                t0 = time.perf_counter()
+                self._emit(value)
+                stats.slot_time += time.perf_counter() - t0
+        finally:
+            self._pushing = _NOTHING
+        if self._resync is not None:
+            force, self._resync = self._resync, None
+            self._sync(force)
+
+    def _emit(self, value):
+        """Send `value` to the widgets, except the one it comes from."""
+        origin = self._origin
+        if origin is None or not self.compare(origin[1], value):
+            self.data_changed.emit(value)
+            return
+        for link in self.links:
+            if link.widget is origin[0]:
+                break
+        else:
+            self.data_changed.emit(value)
+            return
+        link.skip = True
+        try:
+            self.data_changed.emit(value)
+        finally:
+            link.skip = False
+
+    def poll(self, value=_NOTHING):
+        """
+        Called by the `PollScheduler` on each tick. `value` is the value read
+        in bulk by the scheduler, if any, see `PollBucket.poll`.
+        """
+        if self.stats is not None:
+            self.stats.polls += 1
+        if value is _NOTHING and self.executor is not None:
+            self._read_in_thread()
+            return
+        self._update_polled(value)
+
+    def _update_polled(self, value=_NOTHING):
+        if value is _NOTHING:
+            changed = self.sync_widgets()
+        else:
+            self._prefetched = value
+            try:
+                changed = self.sync_widgets()
+            finally:
+                self._prefetched = _NOTHING  # unused if the update was delayed
+        if not changed and self.backoff is not None:
+            if self.backoff.grow():
+                self.scheduler.move(self, self.backoff.interval)
+
+    def _poll_faster(self):
+        if self.backoff.reset() and self.scheduler is not None:
+            self.scheduler.move(self, self.backoff.interval)
+
+    def _read_in_thread(self):
+        if self._reads:
+            self._expire_reads()
+            if not self.poll_overlap:  # don't pile up reads
+                self.skipped += 1
+                return
+        future = self.executor.submit(getattr, self.inst, self.attr)
+        self._reads[future] = time.monotonic()
+        future.add_done_callback(self._emit_read_finished)
+
+    def _emit_read_finished(self, future):  # in the worker thread
+        try:
+            self._read_finished.emit(future)
+        except RuntimeError:  # the qtlet was deleted
+            pass
+
+    def _expire_reads(self):
+        """Report the reads running for longer than `poll_timeout`."""
+        if self.poll_timeout is None:
+            return
+        deadline = time.monotonic() - self.poll_timeout / 1000
+        for future, t0 in list(self._reads.items()):
+            if t0 is not None and t0 < deadline:
+                self._reads[future] = None
+                self._report_poll_error(TimeoutError(
+                    f"Reading {self.attr!r} took more than "
+                    f"{self.poll_timeout} ms"))
+
+    def _on_read_finished(self, future):
+        if future not in self._reads:  # polling was stopped
+            return
+        self._expire_reads()
+        t0 = self._reads.pop(future)
+        if t0 is None:  # timed out, the value is stale
+            return
+        error = future.exception()
+        if error is not None:
+            self._report_poll_error(error)
+        elif t0 > self._last_read:  # a newer read may have finished first
+            self._last_read = t0
+            self._update_polled(future.result())
+
+    def _report_poll_error(self, error):
+        logger.warning("Error while polling %r: %r", self.attr, error)
+        self.poll_error.emit(error)
+
+    def stream(self, maxsize: int=1, policy: str="latest") -> QtletStream:
+        """
+        Asynchronous iterator over the values delivered to the widgets:
+        `async for value in qtlet.stream(): ...`. See `QtletStream`.
+
+        Must be called with an asyncio event loop running.
+        """
+        return QtletStream(self, maxsize=maxsize, policy=policy)
+
+    async def changed(self):
+        """Wait for the next value delivered to the widgets, and return it."""
+        stream = QtletStream(self)
+        try:
+            return await stream.get()
+        finally:
+            stream.close()
+
+    async def wait_for(self, predicate, timeout: float=None):
+        """
+        Wait until `predicate(value)` is true, and return the value.
+
+        The current value is checked first, then each value delivered to the
+        widgets. Raises `asyncio.TimeoutError` after `timeout` seconds.
+        """
+        stream = QtletStream(self, maxsize=0)
+        try:
+            value = self.value
+            if predicate(value):
+                return value
+            async def wait():
+                while True:
+                    value = await stream.get()
+                    if predicate(value):
+                        return value
+            return await asyncio.wait_for(wait(), timeout)
+        finally:
+            stream.close()
+
+    def enable_stats(self, enabled: bool=True):
+        """
+        Collect counters and timings in `stats`, see `QtletStats`.
+
+        Stats are disabled by default. They can be enabled for all new qtlets
+        with `qtlets.stats.enable_stats`.
+        """
+        if not enabled:
+            self.stats = None
+        elif self.stats is None:
+            self.stats = _stats.QtletStats()
+        return self
+
+    def use_async_writes(self, enabled: bool=True, executor=None):
+        """
+        Call the setter in a worker thread when a widget is edited.
+
+        The GUI doesn't wait for slow setters. A single write is in flight at
+        any time: values edited meanwhile replace each other, and only the
+        latest one is written next (see `dropped_writes`). The widgets are not
+        updated during the writes, and are synced with the actual value once
+        they are done, even if they failed. The value is read back in the
+        executor too. Errors are reported by `write_error`.
+
+        Writes run in `executor`, by default the pool shared by all qtlets.
+        """
+        if enabled:
+            self.write_executor = executor or default_executor()
+            self._connect_queued("_write_finished")
+        else:
+            self.write_executor = None
+        return self
+
+    def _write_async(self, value):
+        if self._writing:
+            if self._write_pending is not _NOTHING:
+                self.dropped_writes += 1
+            self._write_pending = value
+            return
+        self._writing = True
+        future = self.write_executor.submit(setattr, self.inst, self.attr,
+                                            value)
+        future.add_done_callback(self._emit_write_finished)
+
+    def _emit_write_finished(self, future):  # in the worker thread
+        try:
+            self._write_finished.emit(future)
+        except RuntimeError:  # the qtlet was deleted
+            pass
+
+    def _on_write_finished(self, future):
+        if future is self._read_back:
+            self._on_read_back(future)
+            return
+        error = future.exception()
+        if error is not None:
+            logger.warning("Error while setting %r: %r", self.attr, error)
+            self.write_error.emit(error)
+        value, self._write_pending = self._write_pending, _NOTHING
+        executor = self.write_executor
+        inst = self.inst
+        if value is not _NOTHING and executor is not None:
+            self._writing = False
+            self._write_async(value)
+        elif executor is None or inst is None:
+            self._writing = False
+            self.sync_widgets(force=True)
+        else:  # still `_writing`: the widgets are held until it's read
+            self._read_back = executor.submit(getattr, inst, self.attr)
+            self._read_back.add_done_callback(self._emit_write_finished)
+
+    def _on_read_back(self, future):
+        self._read_back = None
+        self._writing = False
+        value, self._write_pending = self._write_pending, _NOTHING
+        if value is not _NOTHING and self.write_executor is not None:
+            self._write_async(value)  # edited while reading
+            return
+        error = future.exception()
+        if error is not None:
+            logger.warning("Error while reading %r: %r", self.attr, error)
+            return
+        self._prefetched = future.result()
+        try:
+            self.sync_widgets(force=True)
+        finally:
+            self._prefetched = _NOTHING
+
+    def _delay_sync(self, wait: float):
+        if self._throttle_timer is None:
+            self._throttle_timer = QTimer(parent=self)
+            self._throttle_timer.setSingleShot(True)
+            self._throttle_timer.timeout.connect(self._sync_trailing)
+        self._throttle_timer.start(math.ceil(wait * 1000))
+
+    def _sync_trailing(self):
+        """
+        Deliver the update delayed by the rate limit. Uses the value of the
+        last poll, if it requested the update: a threaded read isn't repeated
+        in the GUI thread.
+        """
+        value, self._trailing = self._trailing, _NOTHING
+        return self._sync(value=value)
+
+    def use_rate_limit(self, max_rate: float=None):
+        """
+        Limit the rate of widget updates to `max_rate` Hz.
+
+        Intermediate values are dropped (see `dropped`), but the latest value
+        is delivered when the delay expires. Use 0 to remove the limit, and
+        None to use the default set by `set_default_max_rate`.
+        """
+        self.max_rate = max_rate
+        if max_rate == 0 and self._throttle_timer is not None \
+                and self._throttle_timer.isActive():
+            self._sync_trailing()
+        return self
+
+    def use_scheduled_updates(self, enabled: bool=True, scheduler=None):
+        """
+        Update the widgets in time-bounded slices, see `UpdateScheduler`.
+
+        Keeps the event loop responsive when many attributes change at once.
+        Updates caused by a widget edit, and forced updates, are still done
+        immediately. Uses `scheduler`, by default the one shared by all
+        qtlets.
+        """
+        if self.update_scheduler is not None:
+            if self._last is not _NOTHING and self in self.update_scheduler:
+                self._push(self._last)  # don't lose the pending update
+        if enabled:
+            self.update_scheduler = default_update_scheduler() \
+                if scheduler is None else scheduler
+        else:
+            self.update_scheduler = None
+        return self
+
+    def use_defer_hidden(self, enabled: bool=True):
+        """
+        Don't update hidden widgets, ex: on another tab.
+
+        Widgets which aren't visible are marked as stale instead, and are
+        updated with the latest value when they are shown. Use None to follow
+        the default set by `set_default_defer_hidden` when linking widgets.
+        """
+        self.defer_hidden = enabled
+        if enabled is None:
+            enabled = _default_defer_hidden
+        for link in self.links:
+            self._set_defer_hidden(link, enabled)
+        return self
+
+    def _set_defer_hidden(self, link, enabled: bool):
+        if not enabled:
+            self._flush(link)
+        link.stale_filter = self if enabled else None
+
+    def eventFilter(self, obj, event):
+        """Update stale widgets when they are shown."""
+        if event.type() == QEvent.Show:
+            for link in self.links:
+                if link.pending is not _NOTHING and link.widget is obj:
+                    self._flush(link)
+        return False
+
+    def _flush(self, link):
+        pushing, self._pushing = self._pushing, link.pending
+        try:  # values sent back by the widget are echoes
+            link.flush()
+        finally:
+            self._pushing = pushing
+
+    def use_compare(self, compare):
+        """
+        Set the function used to detect changes, ex: `identical`.
 
-    def sync_widgets(self):
-        """Force the update of all linked widgets with the current value."""
-        self.data_changed.emit(self.value)
+        The function is called as `compare(old, new)` and returns True if the
+        widgets don't need to be updated.
+        """
+        self.compare = compare
+        self._last = _NOTHING
+        return self
 
     def link_widget(self, widget, widget_signal=None, widget_slot=None):
         """Link a widget to the trait."""
@@ -58,28 +761,158 @@ class Qtlet(QObject):
         # todo: add bounds to validator.. here is probably the best, in "link"
         if widget_signal is None:
             widget_signal = notifier_signal(widget)
-        widget_signal.connect(self.on_widget_edited)
+        if widget_signal is not None:  # None for display-only widgets
+            widget_signal.connect(self.on_widget_edited)
         if widget_slot is None:
             widget_slot = setter_slot(widget)
-        self.data_changed.connect(widget_slot)
-        self.widgets.append(proxy(widget))
-        self.data_changed.emit(self.value)
+        link = self._add_link(widget, widget_signal, widget_slot)
+        defer_hidden = self.defer_hidden
+        if defer_hidden is None:
+            defer_hidden = _default_defer_hidden
+        self._set_defer_hidden(link, defer_hidden)
+        self.data_changed.connect(link.push)
+        self.sync_widgets(force=True)
+        return self
+
+    def _add_link(self, widget, widget_signal, widget_slot):
+        link = _Link(widget, widget_signal, widget_slot)
+        link.on_destroyed = partial(self._on_widget_destroyed, link)
+        widget.destroyed.connect(link.on_destroyed)
+        self.links.append(link)
+        return link
+
+    def unlink_widget(self, widget):
+        """Disconnect `widget`. Raises ValueError if it isn't linked."""
+        for link in self.links:
+            if link.widget is widget:
+                break
+        else:
+            raise ValueError(f"Widget {widget!r} is not linked to {self.attr!r}")
+        self._unlink(link)
+        _disconnect(widget.destroyed, link.on_destroyed)
+        return self
+
+    def _unlink(self, link):
+        self.links.remove(link)
+        widget = link.widget
+        if link.pending is not _NOTHING and widget is not None:
+            widget.removeEventFilter(self)
+        if link.signal is not None:
+            _disconnect(link.signal, self.on_widget_edited)
+        _disconnect(self.data_changed, link.push)
+
+    def _on_widget_destroyed(self, link, obj=None):
+        # Qt already removed the connections of the widget itself.
+        if link not in self.links:
+            return
+        self.links.remove(link)
+        _disconnect(self.data_changed, link.push)
+        inst = self.inst
+        if inst is not None:
+            inst._remove_unused(self)
+
+    def teardown(self):
+        """Unlink all widgets, and stop all timers."""
+        for link in list(self.links):
+            widget = link.widget
+            self._unlink(link)
+            if widget is not None:
+                _disconnect(widget.destroyed, link.on_destroyed)
+        self.stop_polling()
+        self._write_pending = _NOTHING
+        if self.update_scheduler is not None:
+            self.update_scheduler.discard(self)
+        if self._throttle_timer is not None:
+            self._throttle_timer.stop()
+
+    def use_polling(self, interval: float=20, scheduler=None,
+                    max_interval: float=None, backoff: float=2.,
+                    threaded: bool=False, timeout: float=None,
+                    overlap: bool=False, executor=None):
+        """
+        Checks and update the value on a fixed interval, in ms.
+
+        Qtlets polled on the same interval share the same timer, see
+        `PollScheduler`. Calling again changes the interval.
+
+        If `max_interval` is given, polling is adaptive: each poll finding the
+        value unchanged multiplies the interval by `backoff`, up to
+        `max_interval`. A change of value, or an edit from a widget, goes back
+        to `interval`. See `poll_interval` for the current interval.
+
+        With `threaded=True`, the attribute is read in a thread of `executor`
+        (by default, a pool shared by all qtlets), and the widgets are updated
+        in the GUI thread when the read finishes. Ticks are skipped while a
+        read is in flight, unless `overlap` is True. Errors, and reads taking
+        longer than `timeout` ms, are reported by `poll_error` and don't stop
+        the polling. The values of reads that timed out are discarded.
+        """
+        if scheduler is None:
+            scheduler = self.scheduler or default_scheduler()
+        self.backoff = None if max_interval is None \
+            else Backoff(interval, max_interval, backoff)
+        if threaded or executor is not None:
+            self.executor = executor or default_executor()
+            self._connect_queued("_read_finished")
+        else:
+            self.executor = None
+        self.poll_timeout = timeout
+        self.poll_overlap = overlap
+        if self.scheduler is not None and self.scheduler is not scheduler:
+            self.scheduler.remove(self)
+        self.scheduler = scheduler
+        scheduler.add(self, interval)
+        return self
+
+    def stop_polling(self):
+        """Stop polling."""
+        if self.scheduler is not None:
+            self.scheduler.remove(self)
+            self.scheduler = None
+        self.backoff = None
+        self.executor = None
+        self._reads.clear()  # values still in flight are discarded
+        return self
+
+    def pause_polling(self):
+        """Temporarily stop polling, see `resume_polling`."""
+        if self.scheduler is not None:
+            self.scheduler.pause(self)
         return self
 
-    def use_polling(self, interval: float=20):
-        """Checks and update the value on a fixed interval, in ms."""
-        if self.timer is None:
-            self.timer = QTimer(parent=self)
-        self.timer.setInterval(interval)
-        self.timer.timeout.connect(self.sync_widgets)
-        self.timer.start()
-        # TODO: we could need a stop and a teardown...
+    def resume_polling(self):
+        """Resume polling after `pause_polling`, at the fastest rate."""
+        if self.scheduler is not None:
+            if self.backoff is not None:
+                self._poll_faster()
+            self.scheduler.resume(self)
         return self
-        
 
-    # def unlink_widget(self, widget): # this is not used...
-    #     notifier_signal(widget).disconnect(widget.setValue)
-    #     self.widgets.remove(widget)
+    @property
+    def polling(self) -> bool:
+        """True if the value is currently polled."""
+        return self.scheduler is not None and not self.scheduler.is_paused(self)
+
+    @property
+    def poll_interval(self):
+        """Current polling interval in ms, or None if not polled."""
+        if self.scheduler is None:
+            return None
+        return self.scheduler.interval(self)
+
+    @property
+    def poll_rate(self) -> float:
+        """Current polling rate in Hz, 0 if not polling."""
+        if not self.polling:
+            return 0.
+        return 1000 / self.poll_interval
+
+    @property
+    def timer(self):
+        """Timer shared by all qtlets polled on the same interval."""
+        if self.scheduler is None:
+            return None
+        return self.scheduler.bucket(self.scheduler.interval(self)).timer
 
 
 class IntQtlet(Qtlet):
@@ -96,6 +929,88 @@ class StrQtlet(Qtlet):
 class BoolQtlet(Qtlet):
     data_changed = Signal(bool)
 
+
+class CollectionQtlet(Qtlet):
+    """
+    Qtlet for `list`, `dict` and `set` attributes, displayed in item views.
+
+    The attribute is replaced by an observable container (see `containers`),
+    and `model` is updated incrementally when it is modified in place.
+    Assigning a new container to the attribute resets the model.
+
+    Containers the qtlet can't own are never written back: when reading the
+    attribute returns a new container each time (ex: a copy made by the
+    getter), or when it can't be set. They are displayed read-only, and the
+    model is reset when their contents change.
+
+    Item views (and combo boxes) are linked by setting their model. Other
+    widgets receive the whole container through `data_changed`.
+    """
+    def __init__(self, inst, attr, *a, compare=None, **kw):
+        super().__init__(inst, attr, *a,
+                         compare=identical if compare is None else compare,
+                         **kw)
+        self.model = None
+        self._owned = None  # the attribute stores the container, see `_observable`
+        value = self._observable(self.value)
+        self.model = container_model(value)(value, parent=self)
+        self.model.read_only = self._owned is False
+
+    def _observable(self, value):
+        """
+        `value`, replaced by an observable container if the qtlet can own it:
+        the attribute must store the container, so that reading it returns
+        the container that was set. Checked once, on the first container.
+        """
+        if self._owned is False or is_observable(value):
+            return value
+        wrapped = observable(value)
+        inst = self.inst
+        if wrapped is value or inst is None:
+            return value
+        if self._owned is None and getattr(inst, self.attr) is not value:
+            self._owned = False  # a new container on each read
+            return value
+        try:
+            with inst.hold_sync():
+                setattr(inst, self.attr, wrapped)
+                inst._sync_pending.pop(self.attr, None)
+        except AttributeError:  # read-only
+            self._owned = False
+            return value
+        value = getattr(inst, self.attr)  # the setter may have made a copy.
+        self._owned = value is wrapped
+        return value
+
+    def _sync(self, force=False, value=_NOTHING):
+        if value is _NOTHING:
+            value = self.value
+        value = self._observable(value)
+        container = self.model.container
+        if container is not value:
+            if self._owned is False and type(container) is type(value) \
+                    and equal(container, value):
+                value = container  # unchanged copy
+            else:
+                self.model.set_container(value)
+                self.model.read_only = self._owned is False
+        return super()._sync(force, value)
+
+    def link_widget(self, widget, widget_signal=None, widget_slot=None):
+        if widget_signal is None and widget_slot is None \
+                and hasattr(widget, "setModel"):
+            widget.setModel(self.model)
+            self._add_link(widget, None, None)
+            return self
+        return super().link_widget(widget, widget_signal, widget_slot)
+
+    def _unlink(self, link):
+        super()._unlink(link)
+        widget = link.widget
+        if isinstance(widget, QAbstractItemView) \
+                and widget.model() is self.model:
+            widget.setModel(None)
+
 @singledispatch
 def qtlet_type(typ):
     logger.debug(f"Could not find specific Qtlet type for: {typ!r}")
@@ -122,6 +1037,13 @@ def qtl_bool(typ):
     return BoolQtlet
 
 
+@qtlet_type.register(list)
+@qtlet_type.register(dict)
+@qtlet_type.register(set)
+def qtl_collection(typ):
+    return CollectionQtlet
+
+
 @singledispatch
 def notifier_signal(widget) -> Signal: # todo: we should probably add another argument
     if hasattr(widget, "valueEdited"):
@@ -144,6 +1066,10 @@ def notifier_linedit(widget):
 def notifier_typed(widget):
     return widget.valueEdited
 
+@notifier_signal.register(QLabel)
+def notifier_label(widget):
+    return None  # display only
+
 
 @singledispatch
 def setter_slot(widget):
@@ -167,41 +1093,236 @@ def setter_linedit(widget):
 def setter_typed(widget):
     return widget.setValue
 
+@setter_slot.register(QLabel)
+def setter_label(widget):
+    return lambda value: widget.setText(str(value))
+
+
+def batched(method):
+    """Decorator: hold the syncs of `self` until `method` returns."""
+    @wraps(method)
+    def wrapper(self, *a, **kw):
+        with self.hold_sync():
+            return method(self, *a, **kw)
+    return wrapper
+
+
+class _QtletsBase(object):
+    """
+    Common base of `HasQtlets` and `HasQtletDescriptors`.
+
+    Subclasses call `_sync_qtlet` when a linked attribute is set.
+
+    Classes can define `_qtlets_read_many(names) -> {name: value}` to read
+    several attributes at once: attributes polled on the same timer are then
+    read in a single call on each tick.
+
+    Attributes declared with `@derived(...)` are memoized. Subclasses call
+    `_update_derived` when one of their inputs is set.
+
+    Watchers (see `_add_watcher`) are private records synced like qtlets, but
+    not listed in `qtlets`, ex: for the models of `tables`.
+    """
+    # attribute -> derived attributes affected when it is set, see `dependents`
+    _qtlets_dependents = {}
+
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        if "_qtlets_base" not in cls.__dict__:  # see `HasQtletDescriptors`
+            cls._qtlets_dependents = dependents(cls)
 
-class HasQtlets(object):
     def __init__(self, *a, **kw):
         super().__init__(*a, **kw)
+        self._sync_hold = 0  # depth of nested `hold_sync` blocks
+        self._sync_pending = {}  # attributes to sync when the hold is released
+        self._qtlets_watchers = {}  # attribute -> watcher, see `_add_watcher`
         # I think defining this here will be ok. We'll create the qtlets later
         self.qtlets = {}
 
 
     def link_widget(self, widget, attr_name: str, widget_signal=None,
-                    widget_slot=None) -> Qtlet:
+                    widget_slot=None, compare=None, max_rate=None,
+                    defer_hidden=None) -> Qtlet:
         """Link widget to attr"""
-        # make sure qlet exists
-        if attr_name not in self.qtlets:
-            qtl = self.create_qtlet(attr_name)
-            self.qtlets[attr_name] = qtl
-        else:
-            qtl = self.qtlets[attr_name]
+        qtl = self._qtlet(attr_name)
+        if compare is not None:
+            qtl.use_compare(compare)
+        if max_rate is not None:
+            qtl.use_rate_limit(max_rate)
+        if defer_hidden is not None:
+            qtl.use_defer_hidden(defer_hidden)
         # link qtlet to widget.
         return qtl.link_widget(widget, widget_signal=widget_signal,
                         widget_slot=widget_slot)
 
-    def __setattr__(self, key, value):
+    def qtlet(self, attr_name: str) -> Qtlet:
+        """
+        The qtlet of `attr_name`, created if needed.
+
+        Qtlets can be used without widgets, ex: to `await` their changes. They
+        are kept when their widgets are unlinked, unlike the qtlets created
+        by `link_widget`.
+        """
+        qtl = self._qtlet(attr_name)
+        qtl._kept = True
+        return qtl
+
+    def _qtlet(self, attr_name: str):
+        if attr_name not in self.qtlets:
+            self.qtlets[attr_name] = self.create_qtlet(attr_name)
+            if attr_name not in self._qtlets_watchers:
+                self._bind_attribute(attr_name)
+        return self.qtlets[attr_name]
+
+    def _add_watcher(self, attr_name: str, watcher):
+        """
+        Call `watcher.sync_widgets()` when `attr_name` is set, like a qtlet,
+        without adding it to `qtlets`. An attribute has at most one watcher.
+        """
+        if not self._watched(attr_name):
+            self._bind_attribute(attr_name)
+        self._qtlets_watchers[attr_name] = watcher
+
+    def _remove_watcher(self, attr_name: str):
+        """Undo `_add_watcher`."""
+        del self._qtlets_watchers[attr_name]
+        if attr_name not in self.qtlets:
+            self._sync_pending.pop(attr_name, None)
+            self._unbind_attribute(attr_name)
+
+    def _watched(self, attr_name: str) -> bool:
+        """True if setting `attr_name` must call `_sync_qtlet`."""
+        return attr_name in self.qtlets or attr_name in self._qtlets_watchers
+
+    def _bind_attribute(self, attr_name: str):
+        """Make sure `_sync_qtlet` is called when `attr_name` is set."""
+        pass
+
+    def _unbind_attribute(self, attr_name: str):
+        """Undo `_bind_attribute`."""
+        pass
+
+    def _sync_qtlet(self, key):
+        """Sync the widgets linked to `key`, or defer it if syncs are held."""
+        if self._sync_hold:
+            self._sync_pending[key] = None
+        else:
+            self._sync_now(key)
+
+    def _sync_now(self, key):
+        qtl = self.qtlets.get(key)
+        if qtl is not None:
+            qtl.sync_widgets()
+        watcher = self._qtlets_watchers.get(key)
+        if watcher is not None:
+            watcher.sync_widgets()
+
+    def _update_derived(self, key):
+        """
+        Invalidate the derived attributes depending on `key`, then sync the
+        qtlets of `key` and of the derived attributes, in topological order.
+        """
+        names = self._qtlets_dependents[key]
+        cls = type(self)
+        for name in names:
+            getattr(cls, name).invalidate(self)
+        if "qtlets" not in self.__dict__:  # still initializing
+            return
+        if self._watched(key):
+            self._sync_qtlet(key)
+        for name in names:
+            if self._watched(name):
+                # moved last: pending syncs stay in topological order
+                self._sync_pending.pop(name, None)
+                self._sync_qtlet(name)
+
+    def invalidate_derived(self, *names: str):
+        """
+        Recompute the derived attributes `names`, and those depending on them,
+        ex: after their inputs were modified in place. None means all.
+        """
+        for name in names or self._qtlets_dependents:
+            attr = getattr(type(self), name, None)
+            if isinstance(attr, Derived):
+                attr.invalidate(self)
+                self._update_derived(name)
+
+    @contextmanager
+    def hold_sync(self):
+        """
+        Defer the update of widgets until the end of the block.
+
+        Attributes set multiple times are only synced once, with their final
+        value. Blocks can be nested: widgets are updated when the outermost
+        block exits, even if an exception was raised.
+        """
+        self._sync_hold += 1
         try:
-            super().__setattr__(key, value)
+            yield self
         finally:
-            if hasattr(self, "qtlets") and key in self.qtlets:
-                self.qtlets[key].sync_widgets()
+            self._sync_hold -= 1
+            if not self._sync_hold:
+                self._flush_sync()
+
+    def _flush_sync(self):
+        pending, self._sync_pending = self._sync_pending, {}
+        for key in pending:
+            self._sync_now(key)
 
-    # def unlink_widget(self, widget, attr_name: str):
-    #     # unlink qtlet from widget
-    #     # if qtlet doesn't have any widgets left, remove it.
-    #     qtl = self.qtlets[attr_name]
-    #     qtl.unlink_widget(widget)
-    #     if not qtl.has_widgets:
-    #         del self.qtlets[attr_name]
+    def unlink_widget(self, widget, attr_name: str):
+        """
+        Unlink widget from attr. Removes the qtlet if it has no widgets left,
+        unless it was requested with `qtlet`.
+        """
+        qtl = self.qtlets[attr_name]
+        qtl.unlink_widget(widget)
+        self._remove_unused(qtl)
+
+    def _remove_unused(self, qtl):
+        """Remove `qtl` if it has no widgets, and wasn't requested with `qtlet`."""
+        if not qtl.has_widgets and not qtl._kept \
+                and self.qtlets.get(qtl.attr) is qtl:
+            self.remove_qtlet(qtl.attr)
+
+    def remove_qtlet(self, attr_name: str):
+        """Unlink all widgets from attr, and remove its qtlet."""
+        qtl = self.qtlets.pop(attr_name)
+        qtl.teardown()
+        if attr_name not in self._qtlets_watchers:
+            self._sync_pending.pop(attr_name, None)
+            self._unbind_attribute(attr_name)
+
+    def use_scheduled_updates(self, enabled: bool=True, scheduler=None):
+        """Schedule the updates of all qtlets, see `Qtlet.use_scheduled_updates`."""
+        for qtl in self.qtlets.values():
+            if hasattr(qtl, "use_scheduled_updates"):  # not compact qtlets
+                qtl.use_scheduled_updates(enabled, scheduler)
+
+    def enable_qtlet_stats(self, enabled: bool=True):
+        """Enable or disable the stats of all qtlets, see `Qtlet.enable_stats`."""
+        for qtl in self.qtlets.values():
+            if hasattr(qtl, "enable_stats"):  # not compact qtlets
+                qtl.enable_stats(enabled)
+
+    def qtlet_stats(self) -> dict:
+        """
+        Stats of all qtlets with stats enabled, as `{attr: {counter: value}}`.
+
+        See `QtletStats` for the meaning of each counter, and `format_stats`
+        to print them.
+        """
+        return {attr: qtl.stats.as_dict() for attr, qtl in self.qtlets.items()
+                if qtl.stats is not None}
+
+    def reset_qtlet_stats(self):
+        for qtl in self.qtlets.values():
+            if qtl.stats is not None:
+                qtl.stats.reset()
+
+    def unlink_all(self):
+        """Unlink all widgets, and remove all qtlets."""
+        for attr_name in list(self.qtlets):
+            self.remove_qtlet(attr_name)
 
     def create_qtlet(self, attr_name: str, cls=None):
         # we need to put this into a function...
@@ -211,3 +1332,183 @@ class HasQtlets(object):
 
         qtl = cls(self, attr_name)
         return qtl
+
+
+class HasQtlets(_QtletsBase):
+    """
+    Mixin syncing linked widgets when attributes are set, by intercepting all
+    calls to `__setattr__`.
+    """
+    def __setattr__(self, key, value):
+        try:
+            super().__setattr__(key, value)
+        finally:
+            if key in self._qtlets_dependents:
+                self._update_derived(key)
+            elif hasattr(self, "qtlets") and self._watched(key):
+                self._sync_qtlet(key)
+
+
+class _NotifyingAttribute(object):
+    """
+    Data descriptor syncing the qtlet when the attribute is set.
+
+    Wraps the class attribute it shadows, if any: descriptors (properties,
+    traits...) are used to get and set the value, otherwise the value is
+    stored in the instance `__dict__`.
+    """
+    def __init__(self, name: str, wrapped=None):
+        self.name = name
+        self.wrapped = wrapped
+        self.is_data = hasattr(type(wrapped), "__set__")
+
+    def __get__(self, inst, owner=None):
+        wrapped = self.wrapped
+        if inst is None:
+            return self if wrapped is None else wrapped
+        if self.is_data:
+            return wrapped.__get__(inst, owner)
+        try:
+            return inst.__dict__[self.name]
+        except KeyError:
+            if hasattr(type(wrapped), "__get__"):
+                return wrapped.__get__(inst, owner)
+            elif wrapped is not None:
+                return wrapped
+            raise AttributeError(self.name) from None
+
+    def __set__(self, inst, value):
+        try:
+            if self.is_data:
+                self.wrapped.__set__(inst, value)
+            else:
+                inst.__dict__[self.name] = value
+        finally:
+            if self.name in inst._qtlets_dependents:
+                inst._update_derived(self.name)
+            elif inst._watched(self.name):
+                inst._sync_qtlet(self.name)
+
+    def __delete__(self, inst):
+        if self.is_data:
+            self.wrapped.__delete__(inst)
+        else:
+            try:
+                del inst.__dict__[self.name]
+            except KeyError:
+                raise AttributeError(self.name) from None
+
+
+# (base class, attribute names) -> subclass with notifying attributes
+_bound_classes = {}
+
+
+def _bound_class(base: type, names: frozenset) -> type:
+    """Subclass of `base` with a notifying attribute for each of `names`."""
+    key = (base, names)
+    if key not in _bound_classes:
+        ns = {
+            "__slots__": (),  # keep the layout, so we can swap `__class__`
+            "__module__": base.__module__,
+            "__qualname__": base.__qualname__,
+            "_qtlets_base": base,
+            "_qtlets_names": names,
+        }
+        for name in names:
+            wrapped = next((vars(k)[name] for k in base.__mro__
+                            if name in vars(k)), None)
+            ns[name] = _NotifyingAttribute(name, wrapped)
+        _bound_classes[key] = type(base)(base.__name__, (base,), ns)
+    return _bound_classes[key]
+
+
+class HasQtletDescriptors(_QtletsBase):
+    """
+    Mixin syncing linked widgets using data descriptors.
+
+    Linking an attribute switches the instance to a cached subclass where the
+    attribute is a notifying descriptor. Setting attributes that aren't linked
+    has no overhead at all, except for the inputs of derived attributes, which
+    always notify.
+    """
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        if "_qtlets_base" in cls.__dict__:
+            return
+        for name in cls._qtlets_dependents:
+            attr = next((vars(k)[name] for k in cls.__mro__
+                         if name in vars(k)), None)
+            if not isinstance(attr, (Derived, _NotifyingAttribute)) \
+                    and not cls._has_source(name):
+                setattr(cls, name, _NotifyingAttribute(name, attr))
+
+    @classmethod
+    def _has_source(cls, name: str) -> bool:
+        """True if setting `name` is notified without a descriptor."""
+        return False
+
+    def _bind_attribute(self, attr_name: str):
+        cls = type(self)
+        if attr_name in cls._qtlets_dependents:  # notifies already
+            return
+        base = cls.__dict__.get("_qtlets_base", cls)
+        names = cls.__dict__.get("_qtlets_names", frozenset())
+        if attr_name not in names:
+            self.__class__ = _bound_class(base, names | {attr_name})
+
+    def _unbind_attribute(self, attr_name: str):
+        cls = type(self)
+        names = cls.__dict__.get("_qtlets_names", frozenset())
+        if attr_name in names:
+            names = names - {attr_name}
+            base = cls.__dict__["_qtlets_base"]
+            self.__class__ = _bound_class(base, names) if names else base
+
+
+class HasQtletSources(HasQtletDescriptors):
+    """
+    Mixin syncing linked widgets using the change notifications of the class
+    itself, see `sources`.
+
+    Traits are observed: changes made with `set_trait` are seen, and
+    `hold_trait_notifications` batches them. attrs fields using the
+    `sources.notify` hook notify their changes. Other attributes, ex: the
+    fields of dataclasses, use the notifying descriptors of
+    `HasQtletDescriptors`. `__setattr__` isn't overridden.
+    """
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        cls = type(self)
+        for name in cls._qtlets_dependents:  # inputs of derived attributes
+            source = find_source(cls, name)
+            if source is not None:
+                source.bind(self, name)
+
+    @classmethod
+    def _has_source(cls, name: str) -> bool:
+        return find_source(cls, name) is not None
+
+    def _source_changed(self, name: str):
+        """Called by the sources when `name` was set."""
+        if name in self._qtlets_dependents:
+            self._update_derived(name)
+        elif "qtlets" in self.__dict__ and self._watched(name):
+            self._sync_qtlet(name)
+
+    def _bind_attribute(self, attr_name: str):
+        cls = type(self)
+        source = None if attr_name in cls._qtlets_dependents \
+            else find_source(cls, attr_name)
+        if source is None:
+            super()._bind_attribute(attr_name)
+        else:
+            source.bind(self, attr_name)
+
+    def _unbind_attribute(self, attr_name: str):
+        cls = type(self)
+        source = None if attr_name in cls._qtlets_dependents \
+            else find_source(cls, attr_name)
+        if source is None:
+            super()._unbind_attribute(attr_name)
+        else:
+            source.unbind(self, attr_name)
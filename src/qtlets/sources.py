@@ -0,0 +1,120 @@
+# sources.py
+# change notifications of the data classes, used by `HasQtletSources`.
+
+import weakref
+
+
+class Source(object):
+    """
+    Change notifications of a framework, ex: traitlets observers.
+
+    `handles(cls, name)` tells if setting the attribute `name` of `cls` is
+    notified. `bind(inst, name)` subscribes `inst._source_changed(name)` to
+    the notifications of the attribute, and `unbind` unsubscribes.
+    """
+    def handles(self, cls: type, name: str) -> bool:
+        raise NotImplementedError
+
+    def bind(self, inst, name: str):
+        pass
+
+    def unbind(self, inst, name: str):
+        pass
+
+
+_sources = []
+
+
+def register_source(source: Source) -> Source:
+    """Register a `Source`. Sources registered last have priority."""
+    _sources.insert(0, source)
+    return source
+
+
+def find_source(cls: type, name: str):
+    """The `Source` notifying the changes of `name`, None if there's none."""
+    for source in _sources:
+        if source.handles(cls, name):
+            return source
+    return None
+
+
+try:
+    from traitlets import HasTraits, TraitType
+except ImportError:  # traitlets is optional
+    pass
+else:
+    def _observer(inst):
+        """Traitlets observer of `inst`, created if needed."""
+        observer = inst.__dict__.get("_qtlets_observer")
+        if observer is None:
+            ref = weakref.ref(inst)
+            def observer(change):
+                inst = ref()
+                if inst is not None:
+                    inst._source_changed(change.name)
+            inst.__dict__["_qtlets_observer"] = observer
+        return observer
+
+    class TraitletsSource(Source):
+        """
+        Traits, observed with `observe`. Changes made with `set_trait` are
+        notified, and `hold_trait_notifications` batches them.
+        """
+        def handles(self, cls, name):
+            return issubclass(cls, HasTraits) \
+                and isinstance(getattr(cls, name, None), TraitType)
+
+        def bind(self, inst, name):
+            inst.observe(_observer(inst), names=name)
+
+        def unbind(self, inst, name):
+            inst.unobserve(_observer(inst), names=name)
+
+    register_source(TraitletsSource())
+
+
+def notify(inst, attribute, value):
+    """
+    attrs `on_setattr` hook notifying `HasQtletSources` instances:
+    ```
+    value = attr.ib(default=0, on_setattr=notify)
+    ```
+    Put it last when combined with other hooks, ex:
+    `on_setattr=[attr.setters.validate, notify]`.
+    """
+    object.__setattr__(inst, attribute.name, value)  # notify the new value
+    changed = getattr(inst, "_source_changed", None)
+    if changed is not None:
+        changed(attribute.name)
+    return value
+
+
+try:
+    import attr
+except ImportError:  # attrs is optional
+    pass
+else:
+    def _calls_notify(hook) -> bool:
+        if hook is notify:
+            return True
+        # hooks combined with `attr.setters.pipe` (or a list) are in a closure.
+        for cell in getattr(hook, "__closure__", None) or ():
+            contents = cell.cell_contents
+            if isinstance(contents, tuple) and notify in contents:
+                return True
+        return False
+
+    class AttrsSource(Source):
+        """
+        attrs fields using the `notify` hook, ex: `attr.ib(on_setattr=notify)`.
+        Hooks set for the whole class (`@attr.s(on_setattr=notify)`) can't be
+        detected: the fields use notifying descriptors instead.
+        """
+        def handles(self, cls, name):
+            if not attr.has(cls):
+                return False
+            field = attr.fields_dict(cls).get(name)
+            return field is not None and _calls_notify(field.on_setattr)
+
+    register_source(AttrsSource())
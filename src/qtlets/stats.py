@@ -0,0 +1,64 @@
+# stats.py
+# optional instrumentation of qtlets.
+
+_enabled = False
+
+
+def enable_stats(enabled: bool=True):
+    """Collect stats on qtlets created from now on, see `Qtlet.enable_stats`."""
+    global _enabled
+    _enabled = enabled
+
+
+def stats_enabled() -> bool:
+    return _enabled
+
+
+class QtletStats(object):
+    """
+    Counters and timings of a single qtlet. Times are in seconds.
+
+    syncs: number of times the value was read to update the widgets.
+    suppressed: syncs skipped because the value didn't change.
+    edits: number of values received from the widgets.
+    polls: number of polling ticks.
+    get_time: time spent reading the attribute.
+    set_time: time spent setting the attribute from the widgets, including
+        the resulting widget updates.
+    slot_time: time spent in the widget slots.
+    """
+    __slots__ = ("syncs", "suppressed", "edits", "polls",
+                 "get_time", "set_time", "slot_time")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.syncs = 0
+        self.suppressed = 0
+        self.edits = 0
+        self.polls = 0
+        self.get_time = 0.
+        self.set_time = 0.
+        self.slot_time = 0.
+
+    def as_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self):
+        items = ", ".join(f"{k}={v!r}" for k, v in self.as_dict().items())
+        return f"{type(self).__name__}({items})"
+
+
+def format_stats(table: dict) -> str:
+    """Format the output of `HasQtlets.qtlet_stats` as a text table."""
+    columns = QtletStats.__slots__
+    width = max([len("attr")] + [len(k) for k in table])
+    lines = [f"{'attr':{width}s} " + " ".join(f"{c:>10s}" for c in columns)]
+    for attr, row in table.items():
+        cells = []
+        for c in columns:
+            v = row[c]
+            cells.append(f"{v:10.3g}" if isinstance(v, float) else f"{v:10d}")
+        lines.append(f"{attr:{width}s} " + " ".join(cells))
+    return "\n".join(lines)
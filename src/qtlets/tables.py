@@ -0,0 +1,198 @@
+# tables.py
+# table model showing the attributes of many instances, a row per instance.
+
+from functools import partial
+import weakref
+
+from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+
+from .compact import CompactQtlet
+from .models import editable
+from .qtlets import _QtletsBase
+from .widgets import _disconnect
+
+_NO_PARENT = QModelIndex()
+
+# watchers added by the models -> number of models using them.
+_watchers = weakref.WeakKeyDictionary()
+
+
+class InstanceTableModel(QAbstractTableModel):
+    """
+    Table model showing attributes of many instances: a row per instance, and
+    a column per attribute of `attrs`.
+
+    Values are read when the view asks for them, so only the visible rows are
+    ever read. Cells can be edited from the view, which sets the attribute.
+    `headers` are the titles of the columns, the attribute names by default.
+
+    The attributes of `HasQtlets` and `HasQtletDescriptors` instances are
+    watched: the cells of attributes which changed are refreshed on the next
+    iteration of the event loop, merged into rectangular ranges. Attributes
+    are watched by a private `CompactQtlet`, without widgets and not listed in
+    `qtlets`, so that watching an instance creates no QObject. Other
+    instances are refreshed with `mark_dirty`.
+    """
+    def __init__(self, instances=(), attrs=(), *a, headers=None,
+                 editable: bool=True, **kw):
+        super().__init__(*a, **kw)
+        self.attrs = list(attrs)
+        self.headers = list(self.attrs if headers is None else headers)
+        self.editable = editable
+        self.instances = []
+        self._rows = {}  # id(instance) -> row
+        self._cols = {attr: col for col, attr in enumerate(self.attrs)}
+        self._owned = []  # watchers used by the model
+        self._slots = []  # (qtlet, slot) connected to the other qtlets
+        self._dispatchers = set()  # dispatchers of the compact qtlets
+        self._dirty = {}  # row -> columns to refresh
+        self._timer = QTimer(parent=self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._flush)
+        self.set_instances(instances)
+
+    def set_instances(self, instances):
+        """Display `instances`. Resets the model."""
+        self.beginResetModel()
+        self._unwatch()
+        self.instances = list(instances)
+        self._rows = {id(inst): row for row, inst in enumerate(self.instances)}
+        for inst in self.instances:
+            if isinstance(inst, _QtletsBase):
+                self._watch(inst)
+        self.endResetModel()
+
+    def teardown(self):
+        """Stop watching the instances, and remove them from the model."""
+        self.set_instances(())
+        for d in self._dispatchers:
+            _disconnect(d.data_changed, self._on_data_changed)
+        self._dispatchers.clear()
+
+    def _watch(self, inst):
+        for attr in self.attrs:
+            # the watcher outlives the qtlet, ex: when its widgets are unlinked.
+            watcher = inst._qtlets_watchers.get(attr)
+            if watcher is None:
+                watcher = CompactQtlet(inst, attr)
+                inst._add_watcher(attr, watcher)
+                _watchers[watcher] = 0
+            _watchers[watcher] += 1
+            self._owned.append(watcher)
+            if watcher.dispatcher not in self._dispatchers:
+                self._dispatchers.add(watcher.dispatcher)
+                watcher.dispatcher.data_changed.connect(self._on_data_changed)
+            qtl = inst.qtlets.get(attr)
+            if qtl is not None and not isinstance(qtl, CompactQtlet):
+                # changes seen only by the qtlet, ex: when polling.
+                slot = partial(self._on_data_changed, inst, attr)
+                qtl.data_changed.connect(slot)
+                self._slots.append((qtl, slot))
+
+    def _unwatch(self):
+        for qtl, slot in self._slots:
+            _disconnect(qtl.data_changed, slot)
+        self._slots.clear()
+        for qtl in self._owned:
+            _watchers[qtl] -= 1
+            if _watchers[qtl]:
+                continue
+            del _watchers[qtl]
+            inst = qtl.inst
+            if inst is not None \
+                    and inst._qtlets_watchers.get(qtl.attr) is qtl:
+                inst._remove_watcher(qtl.attr)
+        self._owned.clear()
+        self._dirty.clear()
+
+    def instance(self, row: int):
+        return self.instances[row]
+
+    def row(self, instance) -> int:
+        """Row of `instance`. Raises ValueError if it isn't displayed."""
+        try:
+            return self._rows[id(instance)]
+        except KeyError:
+            raise ValueError(f"{instance!r} is not in the model") from None
+
+    def mark_dirty(self, instance=None, attr: str=None):
+        """
+        Refresh the cells of `attr` of `instance`, ex: after an attribute of
+        an instance that isn't watched was set. None means all of them.
+        """
+        rows = range(len(self.instances)) if instance is None \
+            else [self.row(instance)]
+        cols = range(len(self.attrs)) if attr is None else [self._cols[attr]]
+        for row in rows:
+            for col in cols:
+                self._mark(row, col)
+
+    def _on_data_changed(self, inst, attr, value):
+        row = self._rows.get(id(inst))
+        col = self._cols.get(attr)
+        if row is not None and col is not None:
+            self._mark(row, col)
+
+    def _mark(self, row, col):
+        cols = self._dirty.get(row)
+        if cols is None:
+            cols = self._dirty[row] = set()
+        cols.add(col)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _ranges(self):
+        """Dirty cells, as (top, bottom, left, right) ranges. Clears them."""
+        dirty, self._dirty = self._dirty, {}
+        ranges = []
+        for row in sorted(dirty):
+            left, right = min(dirty[row]), max(dirty[row])
+            if ranges and ranges[-1][1] == row - 1 \
+                    and ranges[-1][2:] == (left, right):
+                ranges[-1] = (ranges[-1][0], row, left, right)
+            else:
+                ranges.append((row, row, left, right))
+        return ranges
+
+    def _flush(self):
+        for top, bottom, left, right in self._ranges():
+            self.dataChanged.emit(self.index(top, left),
+                                  self.index(bottom, right))
+
+    def rowCount(self, parent=_NO_PARENT):
+        return 0 if parent.isValid() else len(self.instances)
+
+    def columnCount(self, parent=_NO_PARENT):
+        return 0 if parent.isValid() else len(self.attrs)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in \
+                (Qt.DisplayRole, Qt.EditRole, Qt.UserRole):
+            return None
+        value = getattr(self.instances[index.row()],
+                        self.attrs[index.column()], None)
+        return str(value) if role == Qt.DisplayRole else value
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.editable:
+            flags = editable(flags)
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or not self.editable:
+            return False
+        inst = self.instances[index.row()]
+        try:
+            setattr(inst, self.attrs[index.column()], value)
+        except (TypeError, ValueError):
+            return False
+        if not isinstance(inst, _QtletsBase):
+            self._mark(index.row(), index.column())
+        return True
@@ -0,0 +1,92 @@
+# updates.py
+# widget updates spread over the iterations of the event loop.
+
+import logging
+import time
+
+from PySide2.QtCore import QObject, QTimer
+from PySide2.QtWidgets import QApplication
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class UpdateScheduler(QObject):
+    """
+    Updates the widgets of qtlets in time-bounded slices.
+
+    Qtlets with a new value are marked dirty, and their widgets are updated
+    by a zero-interval timer, i.e. once the events already posted are
+    processed. Each slice runs for at most `budget` ms: the remaining qtlets
+    are carried over to the next slice, and the event loop handles the user
+    input in between. Qtlets with the focused widget come first, then those
+    with visible widgets.
+    """
+    def __init__(self, budget: float=4., *a, **kw):
+        super().__init__(*a, **kw)
+        self.budget = budget
+        self.dirty = {}  # qtlet -> None. dicts keep the insertion order.
+        self.slices = 0  # number of slices run
+        self.carried_over = 0  # qtlets which didn't fit in their slice
+        self.timer = QTimer(parent=self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.drain)
+
+    def __len__(self):
+        return len(self.dirty)
+
+    def __contains__(self, qtlet):
+        return qtlet in self.dirty
+
+    def schedule(self, qtlet):
+        """Update the widgets of `qtlet` in the next slice."""
+        self.dirty[qtlet] = None
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def discard(self, qtlet):
+        """Cancel the update of `qtlet`, if any."""
+        self.dirty.pop(qtlet, None)
+
+    @staticmethod
+    def _priority(qtlet, focus) -> int:
+        widgets = qtlet.widgets
+        if focus is not None and any(w is focus for w in widgets):
+            return 0
+        if any(w.isVisible() for w in widgets):
+            return 1
+        return 2
+
+    def drain(self):
+        """Update the widgets of the dirty qtlets, for at most `budget` ms."""
+        if not self.dirty:
+            return
+        self.slices += 1
+        deadline = time.perf_counter() + self.budget / 1000
+        focus = QApplication.focusWidget()
+        queue = sorted(self.dirty, key=lambda q: self._priority(q, focus))
+        for i, qtl in enumerate(queue):
+            if i > 0 and time.perf_counter() > deadline:
+                self.carried_over += len(queue) - i
+                self.timer.start()
+                return
+            if self.dirty.pop(qtl, _MISSING) is _MISSING:
+                continue  # discarded by a previous update
+            try:
+                qtl._push_last()
+            except Exception:
+                # don't let a single attribute block the others.
+                logger.exception(f"Error while updating {qtl.attr!r}")
+
+
+_default_scheduler = None
+
+
+def default_update_scheduler() -> UpdateScheduler:
+    """Scheduler used by `Qtlet.use_scheduled_updates` by default."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = UpdateScheduler()
+    return _default_scheduler
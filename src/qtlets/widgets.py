@@ -4,6 +4,8 @@ from PySide2.QtCore import Signal
 from PySide2.QtGui import QIntValidator, QDoubleValidator
 from PySide2.QtWidgets import QPushButton, QLabel, QComboBox, QLineEdit
 
+from .models import SequenceModel
+
 logger = logging.getLogger(__name__)
 
 class TypedLineEdit(QLineEdit):
@@ -79,7 +81,108 @@ class StrEdit(TypedLineEdit):
         return self.text()
 
 
-class ValuedComboBox(QComboBox):
+def _disconnect(signal, slot):
+    try:
+        signal.disconnect(slot)
+    except (RuntimeError, TypeError):  # already disconnected, or deleted.
+        pass
+
+
+class _IndexedComboBox(QComboBox):
+    """
+    Combo box finding the row of a value in O(1).
+
+    Keeps an index from value to row. Rows appended to the model are indexed
+    as they come. Other changes mark the index as stale, and it is rebuilt on
+    the next lookup. Unhashable values fall back to a linear search.
+    """
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self._index = None  # value -> first row, None when stale
+        self._watch(self.model())
+
+    def _key(self, row: int):
+        """Value of `row`, as used by `setValue`."""
+        raise NotImplementedError
+
+    def _item_key(self, item):
+        """Value of an item of a `SequenceModel`, as used by `setValue`."""
+        raise NotImplementedError
+
+    def _find(self, value) -> int:
+        """Row of `value` found by a linear search, -1 if not found."""
+        raise NotImplementedError
+
+    def setModel(self, model):
+        self._unwatch(self.model())
+        super().setModel(model)
+        self._watch(model)
+        self._index = None
+
+    def setItems(self, items):
+        """
+        Show the items of a sequence, reading them only when needed.
+
+        No item is created in the combo box: a `SequenceModel` displays the
+        items using `str`. Use an `ObservableList` to add or remove items
+        later.
+        """
+        self.setModel(SequenceModel(items, parent=self))
+        if hasattr(self.view(), "setUniformItemSizes"):
+            self.view().setUniformItemSizes(True)
+
+    def _stale_signals(self, model):
+        return (model.rowsRemoved, model.rowsMoved, model.modelReset,
+                model.layoutChanged, model.dataChanged)
+
+    def _watch(self, model):
+        model.rowsInserted.connect(self._on_rows_inserted)
+        for signal in self._stale_signals(model):
+            signal.connect(self._invalidate_index)
+
+    def _unwatch(self, model):
+        _disconnect(model.rowsInserted, self._on_rows_inserted)
+        for signal in self._stale_signals(model):
+            _disconnect(signal, self._invalidate_index)
+
+    def _invalidate_index(self, *args):
+        self._index = None
+
+    def _on_rows_inserted(self, parent, first, last):
+        index = self._index
+        if index is None:
+            return
+        if last != self.count() - 1:  # not appended: rows after first moved
+            self._index = None
+            return
+        try:
+            for row in range(first, last + 1):
+                index.setdefault(self._key(row), row)
+        except TypeError:
+            self._index = None
+
+    def _build_index(self) -> dict:
+        model = self.model()
+        if isinstance(model, SequenceModel) and self.modelColumn() == 0:
+            keys = (self._item_key(item) for item in model.container)
+        else:
+            keys = (self._key(row) for row in range(self.count()))
+        index = {}
+        for row, key in enumerate(keys):
+            index.setdefault(key, row)
+        return index
+
+    def findValue(self, value) -> int:
+        """Row of `value`, -1 if not found. Same as `findData`/`findText`."""
+        try:
+            if self._index is None:
+                self._index = self._build_index()
+            return self._index.get(value, -1)
+        except TypeError:  # unhashable
+            return self._find(value)
+
+
+class ValuedComboBox(_IndexedComboBox):
     valueEdited = Signal(object)
 
     def __init__(self, *a, **kw):
@@ -89,13 +192,22 @@ class ValuedComboBox(QComboBox):
     def __onIndexChanged(self):
         self.valueEdited.emit(self.currentData())
 
+    def _key(self, row):
+        return self.itemData(row)
+
+    def _item_key(self, item):
+        return item
+
+    def _find(self, value):
+        return self.findData(value)
+
     def setValue(self, obj):
-        i = self.findData(obj)
-        logger.debug(f"obj index: {obj!r} {i}")
+        i = self.findValue(obj)
+        logger.debug("obj index: %r %d", obj, i)
         self.setCurrentIndex(i)
 
 
-class TextComboBox(QComboBox):
+class TextComboBox(_IndexedComboBox):
     valueEdited = Signal(str)
     def __init__(self, *a, **kw):
         super().__init__(*a, **kw)
@@ -104,7 +216,16 @@ class TextComboBox(QComboBox):
     def __onIndexChanged(self):
         self.valueEdited.emit(self.currentText())
 
+    def _key(self, row):
+        return self.itemText(row)
+
+    def _item_key(self, item):
+        return str(item)
+
+    def _find(self, value):
+        return self.findText(value)
+
     def setValue(self, txt):
-        i = self.findText(txt)
-        logger.debug(f"txt index: {txt!r} {i}")
+        i = self.findValue(txt)
+        logger.debug("txt index: %r %d", txt, i)
         self.setCurrentIndex(i)
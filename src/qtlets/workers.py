@@ -0,0 +1,14 @@
+# workers.py
+# thread pool shared by the qtlets doing work off the GUI thread.
+
+from concurrent.futures import ThreadPoolExecutor
+
+_default_executor = None
+
+
+def default_executor() -> ThreadPoolExecutor:
+    """Thread pool used for threaded polling unless specified otherwise."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(thread_name_prefix="qtlets")
+    return _default_executor
@@ -0,0 +1,395 @@
+# benchmarks.py
+# benchmarks of the qtlets hot paths.
+#
+# Run with `python test/benchmarks.py`. Results can be saved as a baseline with
+# `--save baseline.json`, and later compared with `--compare baseline.json`.
+# Runs offscreen unless QT_QPA_PLATFORM is set.
+
+import argparse
+from fnmatch import fnmatch
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide2
+from PySide2.QtWidgets import QApplication, QWidget, QVBoxLayout
+
+import qtlets
+from qtlets.compact import CompactQtlets
+from qtlets.qtlets import HasQtlets, HasQtletDescriptors
+from qtlets.polling import PollScheduler
+from qtlets.tables import InstanceTableModel
+from qtlets.widgets import IntEdit, ValuedComboBox
+
+BENCHMARKS = {}  # name -> setup function
+
+
+def benchmark(name):
+    """
+    Register a benchmark.
+
+    The decorated function does the setup, and returns the function to time.
+    """
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def make_data(mixin=HasQtlets, n_attrs=1):
+    class Data(mixin):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, **kw)
+            self.value = 0
+            self.scratch = 0
+            for i in range(n_attrs):
+                setattr(self, f"a{i}", 0)
+    return Data()
+
+
+class Plain:
+    def __init__(self):
+        self.scratch = 0
+
+
+class Compact(CompactQtlets, HasQtlets):
+    pass
+
+
+@benchmark("setattr/plain")
+def bench_setattr_plain():
+    data = Plain()
+    def run(n):
+        for i in range(n):
+            setattr(data, "scratch", i)
+    return run
+
+
+def _setattr(mixin, attr):
+    data = make_data(mixin)
+    edit = IntEdit(0)
+    data.link_widget(edit, "value")
+    def run(n):
+        for i in range(n):
+            setattr(data, attr, i)
+    run.keep = (data, edit)
+    return run
+
+
+@benchmark("setattr/unlinked")
+def bench_setattr_unlinked():
+    return _setattr(HasQtlets, "scratch")
+
+
+@benchmark("setattr/linked")
+def bench_setattr_linked():
+    return _setattr(HasQtlets, "value")
+
+
+@benchmark("setattr/descriptors/unlinked")
+def bench_setattr_descriptors_unlinked():
+    return _setattr(HasQtletDescriptors, "scratch")
+
+
+@benchmark("setattr/descriptors/linked")
+def bench_setattr_descriptors_linked():
+    return _setattr(HasQtletDescriptors, "value")
+
+
+def _fanout(n_widgets, stats=False, defer_hidden=False):
+    data = make_data()
+    edits = [IntEdit(0) for _ in range(n_widgets)]  # never shown
+    for w in edits:
+        qtl = data.link_widget(w, "value")
+    qtl.enable_stats(stats)
+    qtl.use_defer_hidden(defer_hidden)
+    def run(n):
+        for i in range(n):
+            qtl.sync_widgets(force=True)
+    run.keep = (data, edits)
+    return run
+
+
+for _n in (1, 10, 100):
+    benchmark(f"sync/fanout/{_n}")(lambda n=_n: _fanout(n))
+benchmark("sync/fanout/1/stats")(lambda: _fanout(1, stats=True))
+benchmark("sync/fanout/100/hidden")(lambda: _fanout(100, defer_hidden=True))
+
+
+def _polling(n_qtlets, bulk=False):
+    scheduler = PollScheduler()
+    data = make_data(n_attrs=n_qtlets)
+    if bulk:
+        data._qtlets_read_many = lambda names: \
+            {name: getattr(data, name) for name in names}
+    edits = [IntEdit(0) for _ in range(n_qtlets)]
+    for i, w in enumerate(edits):
+        qtl = data.link_widget(w, f"a{i}").use_polling(20, scheduler)
+    scheduler.pause_all()  # we drive the ticks ourselves
+    bucket = scheduler.bucket(20)
+    def run(n):
+        for i in range(n):
+            bucket.poll()
+    run.keep = (scheduler, data, edits)
+    return run
+
+
+for _n in (10, 100, 1000):
+    benchmark(f"polling/tick/{_n}")(lambda n=_n: _polling(n))
+benchmark("polling/tick/100/bulk")(lambda: _polling(100, bulk=True))
+
+
+def _bindings(mixin, n_instances=50, n_attrs=20):
+    cls = type(make_data(mixin, n_attrs))
+    def run(n):
+        for _ in range(n):
+            instances = [cls() for _ in range(n_instances)]
+            for inst in instances:
+                for i in range(n_attrs):
+                    inst.qtlet(f"a{i}")
+            for inst in instances:
+                inst.unlink_all()
+    return run
+
+
+benchmark("bindings/create/1000")(lambda: _bindings(HasQtlets))
+benchmark("bindings/create/1000/compact")(lambda: _bindings(Compact))
+
+
+@benchmark("link/form/1000")
+def bench_link_form():
+    n_widgets = 1000
+    data = make_data(n_attrs=n_widgets)
+    def run(n):
+        for _ in range(n):
+            form = QWidget()
+            layout = QVBoxLayout(form)
+            for i in range(n_widgets):
+                w = IntEdit(0)
+                layout.addWidget(w)
+                data.link_widget(w, f"a{i}")
+            data.unlink_all()
+    run.keep = data
+    return run
+
+
+@benchmark("roundtrip/edit")
+def bench_roundtrip():
+    data = make_data()
+    edit, other = IntEdit(0), IntEdit(0)
+    data.link_widget(edit, "value")
+    data.link_widget(other, "value")
+    def run(n):
+        for i in range(n):
+            edit.valueEdited.emit(i)
+    run.keep = (data, edit, other)
+    return run
+
+
+def _combo(n_items):
+    combo = ValuedComboBox()
+    for i in range(n_items):
+        combo.addItem(str(i), i)
+    def run(n):
+        for i in range(n):
+            combo.setValue(n_items - 1 - i % 2)
+    run.keep = combo
+    return run
+
+
+benchmark("combo/setValue/10000")(lambda: _combo(10000))
+
+
+def _table(n_rows, n_attrs=5):
+    cls = type(make_data(n_attrs=n_attrs))
+    instances = [cls() for _ in range(n_rows)]
+    attrs = [f"a{i}" for i in range(n_attrs)]
+    def run(n):
+        for _ in range(n):
+            model = InstanceTableModel(instances, attrs)
+            model.teardown()
+    run.keep = instances
+    return run
+
+
+benchmark("table/create/10000")(lambda: _table(10000))
+
+
+@benchmark("table/setattr")
+def bench_table_setattr():
+    data = make_data()
+    model = InstanceTableModel([data], ["value"])
+    def run(n):
+        for i in range(n):
+            data.value = i
+        model._flush()
+    run.keep = (data, model)
+    return run
+
+
+def rss() -> int:
+    """Resident memory of the process, in bytes. Only on Linux, else 0."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def measure_bindings(mixin, n_instances=5000, n_attrs=20):
+    """
+    Time and memory used to create `n_instances * n_attrs` qtlets at once.
+
+    Memory is the increase of the resident memory, as Qt allocations aren't
+    seen by `tracemalloc`.
+    """
+    cls = type(make_data(mixin, n_attrs))
+    instances = [cls() for _ in range(n_instances)]
+    gc.collect()
+    m0 = rss()
+    t0 = time.perf_counter()
+    for inst in instances:
+        for i in range(n_attrs):
+            inst.qtlet(f"a{i}")
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    m1 = rss()
+    for inst in instances:
+        inst.unlink_all()
+    n = n_instances * n_attrs
+    return {"bindings": n, "time": elapsed, "bytes": (m1 - m0) / n}
+
+
+MIXINS = {"HasQtlets": HasQtlets, "compact": Compact}
+
+
+def measure(setup, min_time=0.2, repeat=5):
+    """
+    Time the function returned by `setup`.
+
+    Calibrates the number of calls per run to last at least `min_time`, and
+    returns the best time per call out of `repeat` runs.
+    """
+    run = setup()
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        run(number)
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time or number >= 1e7:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    times = [elapsed]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        run(number)
+        times.append(time.perf_counter() - t0)
+    return {"time": min(times) / number, "number": number, "repeat": repeat}
+
+
+def run_benchmarks(pattern="*", min_time=0.2, repeat=5):
+    """Run the benchmarks matching `pattern`. Returns a results dict."""
+    app = QApplication.instance() or QApplication([])
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if fnmatch(name, pattern):
+            results[name] = measure(setup, min_time=min_time, repeat=repeat)
+            app.processEvents()
+    return {
+        "meta": {
+            "qtlets": qtlets.__version__,
+            "python": platform.python_version(),
+            "pyside2": PySide2.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance: float=0.2):
+    """
+    Compare results to a baseline.
+
+    Returns a list of `(name, baseline time, time, ratio, regressed)`.
+    Benchmarks slower than `1 + tolerance` times the baseline are regressions.
+    """
+    rows = []
+    for name, res in results["results"].items():
+        if name not in baseline["results"]:
+            continue
+        ref = baseline["results"][name]["time"]
+        ratio = res["time"] / ref
+        rows.append((name, ref, res["time"], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def format_time(t):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if t >= scale:
+            return f"{t / scale:.3g} {unit}"
+    return f"{t / 1e-9:.3g} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark qtlets.")
+    parser.add_argument("-k", "--pattern", default="*",
+                        help="Only run benchmarks matching this glob pattern.")
+    parser.add_argument("--save", help="Save the results to this json file.")
+    parser.add_argument("--compare", help="Compare to this json baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown when comparing (default: 0.2).")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum duration of a run, in s.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--memory", action="store_true",
+                        help="Measure the time and memory used by 100k "
+                             "qtlets, with and without CompactQtlets.")
+    parser.add_argument("--memory-of", choices=list(MIXINS),
+                        help=argparse.SUPPRESS)  # used by --memory
+    args = parser.parse_args(argv)
+
+    if args.memory_of:
+        app = QApplication.instance() or QApplication([])
+        print(json.dumps(measure_bindings(MIXINS[args.memory_of])))
+        return 0
+    if args.memory:
+        for name in MIXINS:
+            # in a new process: the memory freed by a run isn't returned to
+            # the system, and would be reused by the next one.
+            out = subprocess.run(
+                [sys.executable, __file__, "--memory-of", name],
+                check=True, capture_output=True, text=True).stdout
+            res = json.loads(out.splitlines()[-1])
+            print(f"{name:12s} {res['bindings']} bindings: "
+                  f"{format_time(res['time']):>10s}, "
+                  f"{res['bytes']:8.0f} bytes per binding")
+        return 0
+
+    results = run_benchmarks(args.pattern, args.min_time, args.repeat)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if not args.compare:
+        for name, res in results["results"].items():
+            print(f"{name:40s} {format_time(res['time']):>10s}")
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.tolerance)
+    for name, ref, t, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:40s} {format_time(ref):>10s} {format_time(t):>10s} "
+              f"{ratio:6.2f}x {flag}")
+    return 1 if any(r[-1] for r in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,35 @@
+import gc
+import os
+import time
+
 import pytest
 
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide2.QtCore import QEventLoop
 from PySide2.QtWidgets import QApplication
 
 @pytest.fixture(scope="session")
 def app():
     app = QApplication([])
-    return app
\ No newline at end of file
+    return app
+
+@pytest.fixture
+def qwait(app):
+    """Process events for `ms` milliseconds, like `QTest.qWait`."""
+    def wait(ms):
+        deadline = time.monotonic() + ms / 1000
+        while time.monotonic() < deadline:
+            app.processEvents(QEventLoop.AllEvents, 5)
+            time.sleep(0.001)
+    return wait
+
+
+@pytest.fixture(autouse=True)
+def collect_garbage():
+    """
+    Destroy the Qt objects left in reference cycles by a test before the next
+    one starts, rather than whenever the garbage collector happens to run.
+    """
+    yield
+    gc.collect()
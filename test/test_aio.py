@@ -0,0 +1,176 @@
+# test the asyncio interface of qtlets
+
+import asyncio
+import threading
+
+import pytest
+from PySide2.QtCore import QEvent
+
+from qtlets.qtlets import HasQtlets
+from qtlets.widgets import IntEdit
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = 0
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+@pytest.fixture
+def linked(app):
+    data = Data()
+    edit = IntEdit(0)
+    qtl = data.link_widget(edit, "value")
+    return data, edit, qtl
+
+
+def test_changed(linked):
+    data, edit, qtl = linked
+    async def main():
+        task = asyncio.create_task(qtl.changed())
+        await asyncio.sleep(0)
+        data.value = 5
+        return await task
+    assert run(main()) == 5
+
+
+def test_changed_by_widget(linked):
+    data, edit, qtl = linked
+    async def main():
+        task = asyncio.create_task(qtl.changed())
+        await asyncio.sleep(0)
+        edit.valueEdited.emit(7)
+        return await task
+    assert run(main()) == 7
+    assert data.value == 7
+
+
+def test_without_widgets(app):
+    data = Data()
+    qtl = data.qtlet("value")
+    assert data.qtlet("value") is qtl
+    async def main():
+        task = asyncio.create_task(qtl.changed())
+        await asyncio.sleep(0)
+        data.value = 3
+        return await task
+    assert run(main()) == 3
+
+
+def test_kept_after_widgets(app):
+    data = Data()
+    qtl = data.qtlet("value")
+    edit = IntEdit(0)
+    data.link_widget(edit, "value")
+    edit.deleteLater()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    assert not qtl.has_widgets
+    assert data.qtlets["value"] is qtl
+    async def main():
+        task = asyncio.create_task(qtl.changed())
+        await asyncio.sleep(0)
+        data.value = 4
+        return await task
+    assert run(main()) == 4
+
+
+def test_removed_when_linked_only(linked):
+    data, edit, qtl = linked
+    data.unlink_widget(edit, "value")
+    assert "value" not in data.qtlets
+
+
+def test_wait_for(linked):
+    data, edit, qtl = linked
+    async def main():
+        task = asyncio.create_task(qtl.wait_for(lambda v: v > 2))
+        for i in range(5):
+            await asyncio.sleep(0)
+            data.value = i
+        return await task
+    assert run(main()) == 3
+
+
+def test_wait_for_current(linked):
+    data, edit, qtl = linked
+    data.value = 10
+    assert run(qtl.wait_for(lambda v: v == 10)) == 10
+
+
+def test_wait_for_timeout(linked):
+    data, edit, qtl = linked
+    with pytest.raises(asyncio.TimeoutError):
+        run(qtl.wait_for(lambda v: v < 0, timeout=0.01))
+
+
+@pytest.mark.parametrize("policy, maxsize, expected, dropped", [
+    ("latest", 2, [4, 5], 3),
+    ("drop", 2, [1, 2], 3),
+    ("latest", 0, [1, 2, 3, 4, 5], 0),
+])
+def test_stream_policy(linked, policy, maxsize, expected, dropped):
+    data, edit, qtl = linked
+    async def main():
+        async with qtl.stream(maxsize=maxsize, policy=policy) as stream:
+            for i in range(1, 6):
+                data.value = i
+            values = [await stream.get() for _ in expected]
+            return values, stream.dropped
+    assert run(main()) == (expected, dropped)
+
+
+def test_stream_iterate(linked):
+    data, edit, qtl = linked
+    async def main():
+        stream = qtl.stream(maxsize=0)
+        data.value = 1
+        data.value = 2
+        stream.close()  # buffered values are still delivered
+        return [v async for v in stream]
+    assert run(main()) == [1, 2]
+
+
+def test_stream_close_disconnects(linked):
+    data, edit, qtl = linked
+    async def main():
+        stream = qtl.stream(maxsize=0)
+        data.value = 1
+        stream.close()
+        data.value = 2
+        return [v async for v in stream]
+    assert run(main()) == [1]
+
+
+def test_bad_policy(linked):
+    data, edit, qtl = linked
+    async def main():
+        qtl.stream(policy="block")
+    with pytest.raises(ValueError):
+        run(main())
+
+
+def test_loop_in_thread(linked, qwait):
+    """The loop runs in a worker thread, the qtlet in the GUI thread."""
+    data, edit, qtl = linked
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        started = threading.Event()
+        async def main():
+            async with qtl.stream(maxsize=0) as stream:
+                started.set()
+                return [await stream.get() for _ in range(3)]
+        future = asyncio.run_coroutine_threadsafe(main(), loop)
+        assert started.wait(5)
+        for i in range(3):
+            edit.valueEdited.emit(10 + i)
+        assert future.result(5) == [10, 11, 12]
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
@@ -0,0 +1,239 @@
+# test numpy array attributes, displayed in tables and images.
+
+import pytest
+
+from PySide2.QtCore import Qt
+from PySide2.QtWidgets import QAbstractItemDelegate, QAbstractItemView, \
+    QDoubleSpinBox, QTableView
+
+from qtlets.qtlets import HasQtlets
+
+NUMPY_IS_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_IS_AVAILABLE = True
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.skipif(not NUMPY_IS_AVAILABLE,
+                                reason="Requires the `numpy` module.")
+
+if NUMPY_IS_AVAILABLE:
+    from qtlets.arrays import ArrayQtlet, ArrayTableModel, ArrayImage, _span
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.table = np.arange(12, dtype=float).reshape(3, 4)
+        self.frame = np.zeros((16, 32), dtype=np.uint8)
+
+
+class Camera(HasQtlets):
+    """Array behind a getter counting the reads, like a device."""
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.reads = 0
+        self._frame = np.zeros(3)
+
+    @property
+    def frame(self):
+        self.reads += 1
+        return self._frame
+
+    @frame.setter
+    def frame(self, value):
+        self._frame = value
+
+
+def test_polled_value_read_once(app):
+    cam = Camera()
+    view = QTableView()
+    qtl = cam.link_widget(view, "frame")
+    cam.reads = 0
+    frame = np.ones(3)
+    qtl.poll(frame)  # as read in bulk, or in a thread
+    assert cam.reads == 0
+    assert qtl.model.array is frame
+
+
+def changed_regions(model):
+    log = []
+    model.dataChanged.connect(lambda tl, br, roles=None: log.append(
+        (tl.row(), br.row(), tl.column(), br.column())))
+    return log
+
+
+@pytest.mark.parametrize("spec, expected", [
+    (None, (0, 10)),
+    (3, (3, 4)),
+    (-1, (9, 10)),
+    (slice(2, 5), (2, 5)),
+    (slice(None, None, -1), (0, 10)),
+    (slice(2, 8, 3), (2, 6)),
+    ([4, 1, 7], (1, 8)),
+    (range(5, 20), (5, 10)),
+    (slice(5, 5), (0, 0)),
+    (12, (0, 0)),
+])
+def test_span(spec, expected):
+    assert _span(spec, 10) == expected
+
+
+def test_type(app):
+    data = Data()
+    view = QTableView()
+    qtl = data.link_widget(view, "table")
+    assert isinstance(qtl, ArrayQtlet)
+    assert view.model() is qtl.model
+
+
+def test_model_reads_array(app):
+    arr = np.arange(6).reshape(2, 3)
+    model = ArrayTableModel(arr)
+    assert (model.rowCount(), model.columnCount()) == (2, 3)
+    index = model.index(1, 2)
+    assert model.data(index) == "5"
+    assert model.data(index, Qt.EditRole) == 5
+    assert type(model.data(index, Qt.EditRole)) is int
+    arr[1, 2] = 42  # no copy
+    assert model.data(index) == "42"
+
+
+def test_model_1d(app):
+    model = ArrayTableModel(np.array([1.5, 2.5]), fmt="{:.2f}")
+    assert (model.rowCount(), model.columnCount()) == (2, 1)
+    assert model.data(model.index(1, 0)) == "2.50"
+
+
+def test_model_edit(app):
+    data = Data()
+    view = QTableView()
+    qtl = data.link_widget(view, "table")
+    log = changed_regions(qtl.model)
+    assert qtl.model.setData(qtl.model.index(2, 1), 7.)
+    assert data.table[2, 1] == 7.
+    assert log == [(2, 2, 1, 1)]
+    assert not qtl.model.setData(qtl.model.index(0, 0), "nope")
+
+
+def is_editable(model, index) -> bool:
+    return bool(int(model.flags(index)) & int(Qt.ItemIsEditable))
+
+
+def test_edit_from_view(app):
+    data = Data()
+    view = QTableView()
+    qtl = data.link_widget(view, "table")
+    view.show()
+    index = qtl.model.index(2, 1)
+    assert is_editable(qtl.model, index)
+    assert view.edit(index, QAbstractItemView.AllEditTriggers, None)
+    editor = view.findChild(QDoubleSpinBox)
+    editor.setValue(7.)
+    view.commitData(editor)
+    view.closeEditor(editor, QAbstractItemDelegate.NoHint)
+    assert data.table[2, 1] == 7.
+    view.close()
+
+
+def test_read_only(app):
+    arr = np.zeros((2, 2))
+    arr.flags.writeable = False
+    model = ArrayTableModel(arr)
+    assert not is_editable(model, model.index(0, 0))
+    assert not model.setData(model.index(0, 0), 1.)
+    assert arr[0, 0] == 0
+
+
+def test_mark_dirty(app):
+    data = Data()
+    view = QTableView()
+    qtl = data.link_widget(view, "table")
+    log = changed_regions(qtl.model)
+    data.table[1:3, 2] = -1
+    qtl.mark_dirty(slice(1, 3), 2)
+    assert log == [(1, 2, 2, 2)]
+    qtl.mark_dirty()
+    assert log[-1] == (0, 2, 0, 3)
+    qtl.mark_dirty(slice(5, 9))  # out of range: nothing to do
+    assert len(log) == 2
+
+
+def test_in_place_is_not_a_change(app):
+    data = Data()
+    view = QTableView()
+    qtl = data.link_widget(view, "table")
+    log = changed_regions(qtl.model)
+    data.table[0, 0] = 10
+    data.table = data.table  # same object
+    assert log == []
+
+
+def test_assign(app):
+    data = Data()
+    view = QTableView()
+    qtl = data.link_widget(view, "table")
+    log = changed_regions(qtl.model)
+    resets = []
+    qtl.model.modelReset.connect(lambda: resets.append(True))
+    data.table = np.ones((3, 4))  # same shape: no reset
+    assert log == [(0, 2, 0, 3)] and resets == []
+    assert qtl.model.data(qtl.model.index(0, 0)) == "1.0"
+    data.table = np.ones((5, 5))
+    assert resets == [True]
+    assert qtl.model.rowCount() == 5
+
+
+def test_image_zero_copy(app):
+    data = Data()
+    image = ArrayImage()
+    data.link_widget(image, "frame")
+    assert image.array is data.frame
+    assert image.image.size().width() == 32
+    assert image.image.size().height() == 16
+    data.frame[3, 5] = 200
+    assert image.image.pixelColor(5, 3).red() == 200
+
+
+def test_image_scaled(app):
+    data = Data()
+    image = ArrayImage()
+    qtl = data.link_widget(image, "table")
+    assert image.image.pixelColor(0, 0).red() == 0
+    assert image.image.pixelColor(3, 2).red() == 255
+    data.table[0, 0] = 11  # levels are kept
+    qtl.mark_dirty(0, 0)
+    assert image.image.pixelColor(0, 0).red() == 255
+    assert image.image.pixelColor(1, 0).red() == round(255 / 11)
+    image.setLevels((0, 22))
+    assert image.image.pixelColor(0, 0).red() == 127
+
+
+def test_image_rgb(app):
+    image = ArrayImage()
+    arr = np.zeros((4, 4, 3), dtype=np.uint8)
+    arr[1, 2] = (10, 20, 30)
+    image.setValue(arr)
+    color = image.image.pixelColor(2, 1)
+    assert (color.red(), color.green(), color.blue()) == (10, 20, 30)
+    with pytest.raises(ValueError):
+        image.setValue(np.zeros((4, 4, 2)))
+
+
+def test_image_follows_table_edits(app):
+    data = Data()
+    view, image = QTableView(), ArrayImage()
+    qtl = data.link_widget(view, "table")
+    data.link_widget(image, "table")
+    qtl.model.setData(qtl.model.index(0, 0), 11.)
+    assert image.image.pixelColor(0, 0).red() == 255
+
+
+def test_image_assign(app):
+    data = Data()
+    image = ArrayImage()
+    data.link_widget(image, "frame")
+    data.frame = np.full((8, 8), 9, dtype=np.uint8)
+    assert image.array is data.frame
+    assert image.image.pixelColor(7, 7).red() == 9
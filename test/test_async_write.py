@@ -0,0 +1,127 @@
+# test writing attributes from a worker thread
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+from qtlets.qtlets import HasQtlets
+from qtlets.widgets import IntEdit
+
+
+class Device(HasQtlets):
+    """Setter blocking until `ready` is set, like a slow instrument."""
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.ready = threading.Event()
+        self.ready.set()
+        self.error = None
+        self.writes = []
+        self.threads = set()
+        self.read_threads = set()
+        self._value = 0
+
+    @property
+    def value(self):
+        if hasattr(self, "read_threads"):
+            self.read_threads.add(threading.current_thread())
+        return self._value
+
+    @value.setter
+    def value(self, v):
+        if hasattr(self, "writes"):  # not during __init__
+            self.threads.add(threading.current_thread())
+            self.writes.append(v)
+            self.ready.wait(5)
+            if self.error is not None:
+                raise self.error
+        self._value = v
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(2)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def linked(app, executor):
+    device = Device()
+    edit = IntEdit(0)
+    qtl = device.link_widget(edit, "value").use_async_writes(executor=executor)
+    errors = []
+    qtl.write_error.connect(errors.append)
+    return device, edit, qtl, errors
+
+
+def test_non_blocking(linked, qwait):
+    device, edit, qtl, errors = linked
+    device.ready.clear()
+    t0 = time.perf_counter()
+    edit.valueEdited.emit(3)
+    assert time.perf_counter() - t0 < 0.05
+    assert device.value == 0
+    device.ready.set()
+    qwait(50)
+    assert device.value == 3
+    assert edit.value() == 3
+    assert threading.main_thread() not in device.threads
+
+
+def test_read_back_in_worker(linked, qwait):
+    device, edit, qtl, errors = linked
+    device.read_threads.clear()
+    edit.valueEdited.emit(3)
+    qwait(50)
+    assert edit.value() == 3
+    assert device.read_threads  # read back after the write
+    assert threading.main_thread() not in device.read_threads
+
+
+def test_coalesced(linked, qwait):
+    device, edit, qtl, errors = linked
+    device.ready.clear()
+    for v in range(1, 6):  # a drag
+        edit.valueEdited.emit(v)
+    device.ready.set()
+    qwait(100)
+    assert device.writes == [1, 5]
+    assert qtl.dropped_writes == 3
+    assert device.value == 5
+    assert edit.value() == 5
+
+
+def test_error_resyncs(linked, qwait):
+    device, edit, qtl, errors = linked
+    device.error = ValueError("out of range")
+    edit.setValue(7)
+    edit.valueEdited.emit(7)
+    qwait(50)
+    assert [str(e) for e in errors] == ["out of range"]
+    assert device.value == 0
+    assert edit.value() == 0  # shows the actual value
+
+
+def test_widgets_held_during_writes(linked, qwait):
+    device, edit, qtl, errors = linked
+    other = IntEdit(0)
+    device.link_widget(other, "value")
+    device.ready.clear()
+    edit.valueEdited.emit(1)
+    edit.valueEdited.emit(2)
+    qwait(20)
+    assert other.value() == 0
+    device.ready.set()
+    qwait(100)
+    assert device.writes == [1, 2]
+    assert other.value() == 2
+
+
+def test_disabled(linked):
+    device, edit, qtl, errors = linked
+    qtl.use_async_writes(False)
+    edit.valueEdited.emit(4)
+    assert device.value == 4
+    assert device.threads == {threading.main_thread()}
@@ -13,7 +13,7 @@ from PySide2.QtWidgets import QWidget, QPushButton, QVBoxLayout, QCheckBox, \
 from PySide2.QtCore import Qt
 from PySide2.QtTest import QTest
 
-from qtlets.qtlets import HasQtlets
+from qtlets.qtlets import HasQtlets, HasQtletDescriptors, HasQtletSources
 from qtlets.widgets import IntEdit, StrEdit
 
 TRAITLETS_IS_AVAILABLE = False
@@ -60,17 +60,22 @@ def dtype_config(data_type):
     return dtypes[data_type]
 
 
-def vanilla(dtype_config):
+@pytest.fixture(params=[HasQtlets, HasQtletDescriptors, HasQtletSources])
+def mixin(request):
+    return request.param
+
+
+def vanilla(dtype_config, mixin):
     v = dtype_config.init_value
-    class Data(HasQtlets):
+    class Data(mixin):
         def __init__(self, *a, value=v, **kw):
             super().__init__(*a, **kw)
             self.value = value
     return Data()
 
 
-def properties(dtype_config):
-    class Data(HasQtlets):
+def properties(dtype_config, mixin):
+    class Data(mixin):
         def __init__(self, *a, value=dtype_config.init_value, **kw):
             super().__init__(*a, **kw)
             self._value = value
@@ -85,19 +90,19 @@ def properties(dtype_config):
     return Data()
 
 
-def traitlets(dtype_config):
-    class Data(HasQtlets, HasTraits):
+def traitlets(dtype_config, mixin):
+    class Data(mixin, HasTraits):
         value = dtype_config.traitlet(default_value=dtype_config.init_value)
     return Data()
 
 
-def attrs(dtype_config):
+def attrs(dtype_config, mixin):
     @attr.s
     class Base:
         value: dtype_config.dtype = attr.ib(default=dtype_config.init_value)
         # def __attrs_post_init__(self):
         #     super().__init__() # tsk tsk tsk...
-    class Data(HasQtlets, Base): pass
+    class Data(mixin, Base): pass
     return Data()
 
 
@@ -113,8 +118,8 @@ def attrs(dtype_config):
         ),
     ]
 )
-def data_instance(request, dtype_config):
-    return request.param(dtype_config)
+def data_instance(request, dtype_config, mixin):
+    return request.param(dtype_config, mixin)
 
 
 @pytest.fixture
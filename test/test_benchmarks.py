@@ -0,0 +1,34 @@
+# smoke test of the benchmarks, see `benchmarks.py`
+
+import json
+
+import pytest
+
+import benchmarks
+
+
+@pytest.mark.usefixtures("app")
+def test_run_all(tmp_path):
+    results = benchmarks.run_benchmarks(min_time=0, repeat=1)
+    assert set(results["results"]) == set(benchmarks.BENCHMARKS)
+    assert all(r["time"] > 0 for r in results["results"].values())
+    path = tmp_path / "baseline.json"
+    assert benchmarks.main(["-k", "setattr/*", "--min-time", "0",
+                            "--repeat", "1", "--save", str(path)]) == 0
+    assert "setattr/plain" in json.loads(path.read_text())["results"]
+
+
+def test_compare():
+    baseline = {"results": {"a": {"time": 1.0}, "b": {"time": 1.0}}}
+    results = {"results": {"a": {"time": 1.1}, "b": {"time": 1.5},
+                           "c": {"time": 1.0}}}
+    rows = benchmarks.compare(results, baseline, tolerance=0.2)
+    assert [(r[0], r[-1]) for r in rows] == [("a", False), ("b", True)]
+
+
+@pytest.mark.usefixtures("app")
+def test_measure_bindings():
+    res = benchmarks.measure_bindings(benchmarks.Compact, n_instances=10,
+                                      n_attrs=2)
+    assert res["bindings"] == 20
+    assert res["time"] > 0
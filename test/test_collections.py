@@ -0,0 +1,368 @@
+# test collection attributes, displayed in item views.
+
+import random
+
+import pytest
+
+from PySide2.QtCore import Qt
+from PySide2.QtWidgets import QAbstractItemDelegate, QAbstractItemView, \
+    QLineEdit, QListView, QTableView, QLabel
+
+from qtlets.containers import ObservableList, ObservableDict, ObservableSet
+from qtlets.models import SequenceModel, MappingModel
+from qtlets.qtlets import HasQtlets, CollectionQtlet
+
+
+class Recorder:
+    def __init__(self, container):
+        self.changes = []
+        container.observe(self)
+
+    def before(self, change):
+        self.changes.append(("before", change))
+
+    def after(self, change):
+        self.changes.append(("after", change))
+
+    @property
+    def ops(self):
+        return [(c.op, c.first, c.last) for phase, c in self.changes
+                if phase == "after"]
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.values = [1, 2, 3]
+        self.mapping = {"a": 1, "b": 2}
+        self.items = {"x", "y"}
+
+
+def model_signals(model):
+    log = []
+    model.rowsInserted.connect(lambda p, a, b: log.append(("insert", a, b)))
+    model.rowsRemoved.connect(lambda p, a, b: log.append(("remove", a, b)))
+    model.rowsMoved.connect(
+        lambda p, a, b, d, r: log.append(("move", a, b, r)))
+    model.dataChanged.connect(
+        lambda tl, br, roles=None: log.append(("set", tl.row(), br.row())))
+    model.modelReset.connect(lambda: log.append(("reset",)))
+    return log
+
+
+def edit_in_view(view, index, text) -> bool:
+    """Edit `index` with the editor of `view`, like a user would."""
+    if not view.edit(index, QAbstractItemView.AllEditTriggers, None):
+        return False
+    editor = view.findChild(QLineEdit)
+    editor.setText(text)
+    view.commitData(editor)
+    view.closeEditor(editor, QAbstractItemDelegate.NoHint)
+    return True
+
+
+def is_editable(model, index) -> bool:
+    return bool(int(model.flags(index)) & int(Qt.ItemIsEditable))
+
+
+class TestObservableList:
+    def test_ops(self):
+        lst = ObservableList([0, 1, 2])
+        rec = Recorder(lst)
+        lst.append(3)
+        lst.extend([4, 5])
+        lst.insert(0, -1)
+        lst.pop()
+        lst.remove(2)
+        lst[0] = 10
+        del lst[0:2]
+        lst.move(0, 2)
+        assert lst == [3, 4, 1]
+        assert rec.ops == [
+            ("insert", 3, 3), ("insert", 4, 5), ("insert", 0, 0),
+            ("remove", 6, 6), ("remove", 3, 3), ("set", 0, 0),
+            ("remove", 0, 1), ("move", 0, 0),
+        ]
+        assert rec.changes[-1][1].dest == 2
+
+    def test_matches_list(self):
+        random.seed(0)
+        ref, lst = [], ObservableList()
+        Recorder(lst)
+        for _ in range(500):
+            op = random.choice(["append", "insert", "pop", "set", "del", "iadd"])
+            if op == "append":
+                n = len(ref)
+                for c in (ref, lst): c.append(n)
+            elif op == "insert":
+                i = random.randint(-5, len(ref) + 5)
+                for c in (ref, lst): c.insert(i, "i")
+            elif op == "pop" and ref:
+                i = random.randrange(len(ref))
+                assert ref.pop(i) == lst.pop(i)
+            elif op == "set" and ref:
+                i = random.randrange(len(ref))
+                for c in (ref, lst): c[i] = "s"
+            elif op == "del" and ref:
+                i = random.randrange(len(ref))
+                for c in (ref, lst): del c[i:i + 2]
+            elif op == "iadd":
+                ref += [1, 2]
+                lst += [1, 2]
+            assert ref == lst
+
+    def test_errors_not_reported(self):
+        lst = ObservableList()
+        rec = Recorder(lst)
+        with pytest.raises(IndexError):
+            lst.pop()
+        with pytest.raises(IndexError):
+            lst[3] = 1
+        assert rec.changes == []
+
+    def test_extended_slice_resets(self):
+        lst = ObservableList(range(6))
+        rec = Recorder(lst)
+        del lst[::2]
+        lst[0:1] = [7, 8]
+        assert lst == [7, 8, 3, 5]
+        assert rec.ops == [("reset", 0, -1), ("reset", 0, -1)]
+
+
+class TestObservableDict:
+    def test_ops(self):
+        d = ObservableDict(a=1, b=2)
+        rec = Recorder(d)
+        d["c"] = 3
+        d["a"] = 10
+        del d["a"]
+        d.update({"b": 20, "d": 4})
+        assert d.pop("c") == 3
+        assert d == {"b": 20, "d": 4}
+        assert [d.key_at(i) for i in range(len(d))] == list(d)
+        assert d.row_of("d") == 1
+        assert rec.ops == [("insert", 2, 2), ("set", 0, 0), ("remove", 0, 0),
+                           ("set", 0, 0), ("insert", 2, 2), ("remove", 1, 1)]
+
+
+class TestObservableSet:
+    def test_ops(self):
+        s = ObservableSet()
+        rec = Recorder(s)
+        s.add(1)
+        s.add(2)
+        s.add(1)
+        s |= {3}
+        s.discard(1)
+        s -= {2}
+        assert s == {3}
+        assert list(s) == [3]
+        assert rec.ops == [("insert", 0, 0), ("insert", 1, 1), ("insert", 2, 2),
+                           ("remove", 0, 0), ("reset", 0, -1)]
+
+
+@pytest.mark.usefixtures("app")
+class TestCollectionQtlet:
+    def test_list_view(self):
+        data = Data()
+        view = QListView()
+        qtl = data.link_widget(view, "values")
+        assert isinstance(qtl, CollectionQtlet)
+        assert isinstance(data.values, ObservableList)
+        model = view.model()
+        assert model is qtl.model
+        assert model.rowCount() == 3
+        log = model_signals(model)
+        data.values.append(4)
+        data.values[0] = 0
+        data.values.move(3, 0)
+        del data.values[1]
+        assert log == [("insert", 3, 3), ("set", 0, 0), ("move", 3, 3, 0),
+                       ("remove", 1, 1)]
+        assert [model.data(model.index(i)) for i in range(model.rowCount())] \
+            == ["4", "2", "3"]
+
+    def test_large_append(self):
+        data = Data()
+        data.values = list(range(100000))
+        view = QListView()
+        qtl = data.link_widget(view, "values")
+        log = model_signals(qtl.model)
+        data.values.append(-1)
+        assert log == [("insert", 100000, 100000)]
+
+    def test_reassign(self):
+        data = Data()
+        view = QListView()
+        qtl = data.link_widget(view, "values")
+        log = model_signals(qtl.model)
+        data.values = [5, 6]
+        assert isinstance(data.values, ObservableList)
+        assert log == [("reset",)]
+        assert qtl.model.rowCount() == 2
+        data.values.append(7)
+        assert qtl.model.rowCount() == 3
+
+    def test_polled_value_read_once(self):
+        class Device(HasQtlets):
+            reads = 0
+
+            @property
+            def values(self):
+                self.reads += 1
+                return self._values
+
+            @values.setter
+            def values(self, value):
+                self._values = value
+
+        dev = Device()
+        dev.values = ObservableList([1])
+        qtl = dev.link_widget(QListView(), "values")
+        dev.reads = 0
+        values = ObservableList([1, 2])
+        qtl.poll(values)
+        assert dev.reads == 0
+        assert qtl.model.container is values
+
+    def test_edit_from_view(self):
+        data = Data()
+        data.values = ["a", "b", "c"]
+        view = QListView()
+        qtl = data.link_widget(view, "values")
+        view.show()
+        assert is_editable(qtl.model, qtl.model.index(1))
+        assert edit_in_view(view, qtl.model.index(1), "e")
+        assert data.values == ["a", "e", "c"]
+        view.close()
+
+    def test_set_not_editable(self):
+        data = Data()
+        view = QListView()
+        qtl = data.link_widget(view, "items")
+        view.show()
+        assert not is_editable(qtl.model, qtl.model.index(0))
+        assert not edit_in_view(view, qtl.model.index(0), "z")
+        view.close()
+
+    def test_dict_table(self):
+        data = Data()
+        view = QTableView()
+        qtl = data.link_widget(view, "mapping")
+        model = qtl.model
+        assert isinstance(model, MappingModel)
+        assert model.rowCount() == 2
+        assert model.columnCount() == 2
+        log = model_signals(model)
+        data.mapping["c"] = 3
+        data.mapping["a"] = 10
+        assert log == [("insert", 2, 2), ("set", 0, 0)]
+        assert model.data(model.index(0, 1), Qt.EditRole) == 10
+        assert model.setData(model.index(1, 1), 5)
+        assert data.mapping["b"] == 5
+        view.show()
+        assert not is_editable(model, model.index(1, 0))
+        assert not edit_in_view(view, model.index(1, 0), "z")
+        assert edit_in_view(view, model.index(1, 1), "text")
+        assert data.mapping["b"] == "text"
+        view.close()
+
+    def test_set(self):
+        data = Data()
+        view = QListView()
+        qtl = data.link_widget(view, "items")
+        model = qtl.model
+        assert isinstance(model, SequenceModel)
+        data.items.add("z")
+        assert model.rowCount() == 3
+        assert model.data(model.index(2), Qt.UserRole) == "z"
+
+    def test_other_widget(self):
+        data = Data()
+        label = QLabel()
+        data.link_widget(label, "values", widget_signal=label.linkActivated,
+                         widget_slot=lambda v: label.setText(str(list(v))))
+        data.values = [9]
+        assert label.text() == "[9]"
+
+    def test_unlink(self):
+        data = Data()
+        view = QListView()
+        data.link_widget(view, "values")
+        data.unlink_widget(view, "values")
+        assert view.model() is None
+        assert "values" not in data.qtlets
+
+    def test_read_only_property(self):
+        class Device(HasQtlets):
+            def __init__(self):
+                super().__init__()
+                self._values = [1, 2]
+
+            @property
+            def values(self):
+                return self._values
+
+        dev = Device()
+        view = QListView()
+        qtl = dev.link_widget(view, "values")
+        assert type(dev.values) is list
+        assert qtl.model.rowCount() == 2
+        assert not is_editable(qtl.model, qtl.model.index(0))
+        dev._values = [1, 2, 3]
+        qtl.sync_widgets()
+        assert qtl.model.rowCount() == 3
+
+    def test_property_copies(self):
+        class Device(HasQtlets):
+            def __init__(self):
+                super().__init__()
+                self._values = [1, 2]
+                self.writes = 0
+
+            @property
+            def values(self):
+                return list(self._values)
+
+            @values.setter
+            def values(self, v):
+                self.writes += 1
+                self._values = list(v)
+
+        dev = Device()
+        qtl = dev.link_widget(QListView(), "values")
+        log = model_signals(qtl.model)
+        changes = []
+        qtl.data_changed.connect(changes.append)
+        for _ in range(10):
+            qtl.sync_widgets()
+        assert dev.writes == 0
+        assert log == []
+        assert changes == [[1, 2]]  # the first sync only
+        assert not is_editable(qtl.model, qtl.model.index(0))
+        dev._values.append(3)
+        qtl.sync_widgets()
+        assert log == [("reset",)]
+        assert qtl.model.rowCount() == 3
+        assert dev.writes == 0
+
+    def test_setter_copies(self):
+        class Copying(HasQtlets):
+            def __init__(self):
+                super().__init__()
+                self._values = []
+
+            @property
+            def values(self):
+                return self._values
+
+            @values.setter
+            def values(self, v):
+                self._values = list(v)
+
+        data = Copying()
+        view = QListView()
+        qtl = data.link_widget(view, "values")
+        assert type(data.values) is list
+        data.values = [1, 2]
+        assert qtl.model.rowCount() == 2
@@ -0,0 +1,131 @@
+# test the value lookup of combo boxes, and their lazy models.
+
+import pytest
+
+from qtlets.containers import ObservableList
+from qtlets.models import SequenceModel
+from qtlets.qtlets import HasQtlets
+from qtlets.widgets import ValuedComboBox, TextComboBox
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.channel = 2
+
+
+def valued(n=5):
+    combo = ValuedComboBox()
+    for i in range(n):
+        combo.addItem(f"ch{i}", i)
+    return combo
+
+
+def text(n=5):
+    combo = TextComboBox()
+    combo.addItems([f"ch{i}" for i in range(n)])
+    return combo
+
+
+@pytest.mark.usefixtures("app")
+class TestIndex:
+    def test_matches_find(self):
+        combo, tcombo = valued(), text()
+        for i in range(5):
+            assert combo.findValue(i) == combo.findData(i) == i
+            assert tcombo.findValue(f"ch{i}") == tcombo.findText(f"ch{i}") == i
+        assert combo.findValue(42) == -1
+        assert tcombo.findValue("nope") == -1
+
+    def test_set_value(self):
+        combo = valued()
+        combo.setValue(3)
+        assert combo.currentIndex() == 3
+        assert combo.currentData() == 3
+        combo.setValue(42)
+        assert combo.currentIndex() == -1
+
+    def test_append_is_incremental(self):
+        combo = valued()
+        combo.findValue(0)  # build the index
+        index = combo._index
+        combo.addItem("ch5", 5)
+        assert combo._index is index
+        assert combo.findValue(5) == 5
+
+    @pytest.mark.parametrize("change", [
+        lambda c: c.insertItem(0, "first", -1),
+        lambda c: c.removeItem(1),
+        lambda c: c.setItemData(2, 20),
+        lambda c: c.clear(),
+    ])
+    def test_follows_changes(self, change):
+        combo = valued()
+        combo.findValue(0)
+        change(combo)
+        for row in range(combo.count()):
+            assert combo.findValue(combo.itemData(row)) == row
+        assert combo.findValue(4) == combo.findData(4)
+
+    def test_duplicates(self):
+        combo = valued()
+        combo.addItem("again", 1)
+        assert combo.findValue(1) == 1
+
+    def test_unhashable(self):
+        combo = ValuedComboBox()
+        combo.addItem("a", [1])
+        combo.addItem("b", [2])
+        assert combo.findValue([2]) == combo.findData([2])
+
+    def test_set_model(self):
+        combo = valued()
+        combo.findValue(0)
+        combo.setItems(["a", "b"])
+        assert combo.findValue("b") == 1
+        assert combo.findValue(1) == -1
+
+
+@pytest.mark.usefixtures("app")
+class TestLazy:
+    def test_items(self):
+        items = range(50000)
+        combo = ValuedComboBox()
+        combo.setItems(items)
+        assert isinstance(combo.model(), SequenceModel)
+        assert combo.count() == 50000
+        assert combo.itemText(123) == "123"
+        assert combo.itemData(123) == 123
+        combo.setValue(40000)
+        assert combo.currentIndex() == 40000
+
+    def test_text(self):
+        combo = TextComboBox()
+        combo.setItems([1.5, 2.5])
+        combo.setValue("2.5")
+        assert combo.currentIndex() == 1
+
+    def test_observable(self):
+        items = ObservableList(["a", "b"])
+        combo = ValuedComboBox()
+        combo.setItems(items)
+        assert combo.findValue("b") == 1
+        items.append("c")
+        assert combo.findValue("c") == 2
+        items.insert(0, "z")
+        assert combo.findValue("c") == 3
+        del items[0:2]
+        assert combo.findValue("b") == 0
+        assert combo.findValue("a") == -1
+
+    def test_linked(self):
+        data = Data()
+        combo = ValuedComboBox()
+        combo.setItems(list(range(10)))
+        data.link_widget(combo, "channel")
+        assert combo.currentIndex() == 2
+        data.channel = 7
+        assert combo.currentIndex() == 7
+        combo.setCurrentIndex(4)
+        combo.activated.emit(4)
+        assert data.channel == 4
@@ -0,0 +1,178 @@
+# test the compact qtlets, without a QObject per attribute
+
+import gc
+import threading
+
+import pytest
+
+from PySide2.QtCore import QEvent
+from PySide2.QtWidgets import QSpinBox
+
+from qtlets import CompactQtlets, HasQtlets, HasQtletDescriptors
+from qtlets.compact import CompactQtlet, dispatcher
+from qtlets.polling import PollScheduler
+from qtlets.qtlets import CollectionQtlet
+from qtlets.widgets import IntEdit
+
+
+class Channel(CompactQtlets, HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = 0
+        self.items = [1, 2]
+
+
+class DescriptorChannel(CompactQtlets, HasQtletDescriptors):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = 0
+
+
+class Edit(IntEdit):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.calls = []
+
+    def setValue(self, v):
+        self.calls.append(v)
+        super().setValue(v)
+
+
+@pytest.fixture(params=[Channel, DescriptorChannel])
+def channel(request, app):
+    return request.param()
+
+
+def test_link(channel):
+    edit = Edit(0)
+    qtl = channel.link_widget(edit, "value")
+    assert isinstance(qtl, CompactQtlet)
+    channel.value = 3
+    assert edit.value() == 3
+    edit.valueEdited.emit(5)
+    assert channel.value == 5
+    assert qtl.widgets == [edit]
+
+
+def test_shared_dispatcher(app):
+    channels = [Channel() for _ in range(3)]
+    edits = [IntEdit(0) for _ in channels]
+    qtlets = [c.link_widget(e, "value") for c, e in zip(channels, edits)]
+    assert all(q.dispatcher is dispatcher(Channel) for q in qtlets)
+    received = []
+    def slot(inst, attr, value):
+        received.append((inst, attr, value))
+    dispatcher(Channel).data_changed.connect(slot)
+    try:
+        channels[1].value = 4
+    finally:  # shared by the later tests
+        dispatcher(Channel).data_changed.disconnect(slot)
+    assert received == [(channels[1], "value", 4)]
+    assert edits[1].value() == 4 and edits[0].value() == 0
+
+
+def test_echo(app):
+    channel = Channel()
+    edit, other = Edit(0), Edit(0)
+    channel.link_widget(edit, "value")
+    channel.link_widget(other, "value")
+    edit.calls.clear()
+    edit.valueEdited.emit(5)
+    assert edit.calls == []
+    assert other.value() == 5
+    spins = [QSpinBox() for _ in range(3)]
+    for s in spins:
+        channel.link_widget(s, "value")
+    spins[0].setValue(7)
+    assert [s.value() for s in spins] == [7] * 3
+    assert edit.value() == 7
+
+
+def test_hold_sync(app):
+    channel = Channel()
+    edit = Edit(0)
+    channel.link_widget(edit, "value")
+    edit.calls.clear()
+    with channel.hold_sync():
+        for v in range(5):
+            channel.value = v
+    assert edit.calls == [4]
+
+
+def test_unlink(app):
+    channel = Channel()
+    edit = Edit(0)
+    channel.link_widget(edit, "value")
+    channel.unlink_widget(edit, "value")
+    assert "value" not in channel.qtlets
+    channel.value = 3
+    edit.valueEdited.emit(5)
+    assert edit.value() == 0
+    assert channel.value == 3
+
+
+def test_destroyed(app):
+    channel = Channel()
+    edit = IntEdit(0)
+    channel.link_widget(edit, "value")
+    edit.deleteLater()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    assert "value" not in channel.qtlets
+
+
+def test_threads(app):
+    channel = Channel()
+    edit = Edit(0)
+    channel.link_widget(edit, "value")
+    edit.calls.clear()
+    def produce():
+        for i in range(100):
+            channel.value = i
+    t = threading.Thread(target=produce)
+    t.start()
+    t.join()
+    assert edit.calls == []
+    app.processEvents()
+    assert edit.calls == [99]
+
+
+def test_polling(app):
+    scheduler = PollScheduler()
+    channel = Channel()
+    edit = IntEdit(0)
+    qtl = channel.link_widget(edit, "value").use_polling(20, scheduler)
+    channel.__dict__["value"] = 6  # not notified
+    scheduler.bucket(20).poll()
+    assert edit.value() == 6
+    qtl.stop_polling()
+    assert scheduler.buckets == {}
+
+
+def test_collected_instance(app, caplog):
+    scheduler = PollScheduler()
+    channel = Channel()
+    qtl = channel.link_widget(IntEdit(0), "value").use_polling(20, scheduler)
+    del channel
+    gc.collect()
+    assert qtl.inst is None
+    assert scheduler.buckets == {}
+    qtl.on_widget_edited(3)
+    assert not qtl.sync_widgets()
+    assert caplog.records == []
+
+
+def test_collections_fall_back(app):
+    channel = Channel()
+    assert isinstance(channel.qtlet("items"), CollectionQtlet)
+
+
+def test_full_qtlet_options(app):
+    channel = Channel()
+    edits = [IntEdit(0) for _ in range(3)]
+    qtl = channel.link_widget(edits[0], "value", max_rate=30)
+    assert not isinstance(qtl, CompactQtlet)
+    assert channel.link_widget(edits[1], "value", defer_hidden=True) is qtl
+    other = Channel()
+    other.link_widget(edits[2], "value")
+    with pytest.raises(TypeError, match="max_rate"):
+        other.link_widget(IntEdit(0), "value", max_rate=30)
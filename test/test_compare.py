@@ -0,0 +1,120 @@
+# test change detection: widgets are only updated when the value changes.
+
+import pytest
+
+from qtlets.qtlets import HasQtlets, equal, identical, isclose, array_equal
+from qtlets.widgets import IntEdit, FloatEdit
+
+NUMPY_IS_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_IS_AVAILABLE = True
+except ImportError:
+    pass
+
+
+@pytest.fixture
+def data_instance():
+    class Data(HasQtlets):
+        def __init__(self, *a, value=0, **kw):
+            super().__init__(*a, **kw)
+            self._value = value
+
+        @property
+        def value(self):
+            return self._value
+
+        @value.setter
+        def value(self, v):
+            self._value = v
+    return Data()
+
+
+@pytest.fixture
+def emissions(data_instance):
+    edit = IntEdit(0)
+    qtl = data_instance.link_widget(edit, "value")
+    received = []
+    qtl.data_changed.connect(received.append)
+    return qtl, edit, received
+
+
+@pytest.mark.usefixtures("app")
+class TestChangeDetection:
+    def test_unchanged_not_emitted(self, data_instance, emissions):
+        qtl, edit, received = emissions
+        data_instance.value = 0
+        qtl.sync_widgets()
+        assert received == []
+
+    def test_changed_emitted(self, data_instance, emissions):
+        qtl, edit, received = emissions
+        data_instance.value = 3
+        data_instance.value = 3
+        assert received == [3]
+        assert edit.value() == 3
+
+    def test_force(self, data_instance, emissions):
+        qtl, edit, received = emissions
+        qtl.sync_widgets(force=True)
+        assert received == [0]
+
+    def test_polling_unchanged(self, data_instance, emissions):
+        qtl, edit, received = emissions
+        qtl.use_polling()
+        for _ in range(5):
+            qtl.timer.timeout.emit()
+        data_instance._value = 5
+        qtl.timer.timeout.emit()
+        qtl.timer.timeout.emit()
+        assert received == [5]
+
+    def test_widget_still_in_sync(self, data_instance, emissions):
+        qtl, edit, received = emissions
+        edit.setValue(7)  # widget is out of sync, but the cache isn't.
+        data_instance.value = 0
+        assert edit.value() == 7
+        qtl.sync_widgets(force=True)
+        assert edit.value() == 0
+
+    def test_link_compare(self, data_instance):
+        edit = FloatEdit(0.)
+        qtl = data_instance.link_widget(edit, "value", compare=isclose(abs_tol=0.1))
+        received = []
+        qtl.data_changed.connect(received.append)
+        data_instance.value = 0.05
+        data_instance.value = 1.
+        assert received == [1.]
+
+
+def test_equal():
+    assert equal(1, 1)
+    assert not equal(1, 2)
+    assert not equal([1], [2])
+
+    class Bad:
+        def __eq__(self, other):
+            raise ValueError("ambiguous")
+    assert not equal(Bad(), Bad())
+
+
+def test_identical():
+    a = [1]
+    assert identical(a, a)
+    assert not identical(a, [1])
+
+
+def test_isclose():
+    cmp = isclose(rel_tol=1e-3)
+    assert cmp(1., 1.0001)
+    assert not cmp(1., 1.1)
+    assert cmp("a", "a")
+
+
+@pytest.mark.skipif(not NUMPY_IS_AVAILABLE, reason="Requires the `numpy` module.")
+def test_array_equal():
+    a = np.arange(5)
+    assert array_equal(a, a.copy())
+    assert not array_equal(a, a + 1)
+    assert not array_equal(a, np.arange(4))
+    assert not equal(a, a.copy())  # fails safely
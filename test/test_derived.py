@@ -0,0 +1,174 @@
+# test derived attributes, memoized and updated when their inputs are set.
+
+import pytest
+
+from PySide2.QtWidgets import QLabel
+
+from qtlets import HasQtlets, HasQtletDescriptors, derived
+from qtlets.derived import dependents
+from qtlets.widgets import FloatEdit
+
+
+def make_source(mixin):
+    class Source(mixin):
+        def __init__(self, *a, **kw):
+            self.calls = []
+            super().__init__(*a, **kw)
+            self.voltage = 2.
+            self.current = 3.
+            self.angle = 1.
+
+        @derived("voltage", "current")
+        def power(self):
+            """Electrical power."""
+            self.calls.append("power")
+            return self.voltage * self.current
+
+        @derived("power")
+        def milliwatts(self):
+            self.calls.append("milliwatts")
+            return self.power * 1000
+
+        @derived("milliwatts", "voltage")
+        def summary(self):
+            self.calls.append("summary")
+            return f"{self.milliwatts:.0f} mW at {self.voltage} V"
+    return Source
+
+
+@pytest.fixture(params=[HasQtlets, HasQtletDescriptors])
+def source(request, app):
+    return make_source(request.param)()
+
+
+class Label(QLabel):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.values = []
+
+    def setText(self, text):
+        self.values.append(text)
+        super().setText(text)
+
+
+def test_memoized(source):
+    assert source.power == 6.
+    assert source.power == 6.
+    assert source.calls == ["power"]
+    source.voltage = 4.
+    assert source.calls == ["power"]  # computed when read
+    assert source.milliwatts == 12000.
+    assert source.calls == ["power", "milliwatts", "power"]
+    source.angle = 2.  # not an input
+    assert source.milliwatts == 12000.
+    assert len(source.calls) == 3
+
+
+def test_read_only(source):
+    with pytest.raises(AttributeError):
+        source.power = 3.
+    assert type(source).power.__doc__ == "Electrical power."
+
+
+def test_linked(source):
+    label, summary = Label(), Label()
+    source.link_widget(label, "power")
+    source.link_widget(summary, "summary")
+    assert label.text() == "6.0"
+    assert summary.text() == "6000 mW at 2.0 V"
+    source.calls.clear()
+    source.current = 4.
+    assert label.text() == "8.0"
+    assert summary.text() == "8000 mW at 2.0 V"
+    assert sorted(source.calls) == ["milliwatts", "power", "summary"]
+    source.calls.clear()
+    source.angle = 3.
+    assert source.calls == []
+
+
+def test_edit_input(source):
+    edit = FloatEdit(0.)
+    label = Label()
+    source.link_widget(edit, "voltage")
+    source.link_widget(label, "summary")
+    edit.valueEdited.emit(1.)
+    assert source.voltage == 1.
+    assert label.text() == "3000 mW at 1.0 V"
+
+
+def test_batch(source):
+    label = Label()
+    source.link_widget(label, "summary")
+    source.calls.clear()
+    label.values.clear()
+    with source.hold_sync():
+        source.voltage = 1.
+        source.current = 1.
+        source.voltage = 5.
+    assert source.calls == ["summary", "milliwatts", "power"]  # read lazily
+    assert label.values == ["5000 mW at 5.0 V"]
+
+
+def test_topological_order(source):
+    order = []
+    for name in ["summary", "milliwatts", "power"]:
+        qtl = source.qtlet(name)
+        qtl.data_changed.connect(lambda v, name=name: order.append(name))
+    with source.hold_sync():
+        source.current = 2.
+        source.voltage = 3.
+    assert order == ["power", "milliwatts", "summary"]
+    order.clear()
+    source.current = 1.
+    assert order == ["power", "milliwatts", "summary"]
+
+
+def test_invalidate(source):
+    label = Label()
+    source.link_widget(label, "power")
+    source.__dict__["voltage"] = 10.  # not notified
+    assert source.power == 6.
+    source.invalidate_derived("power")
+    assert label.text() == "30.0"
+    source.__dict__["current"] = 1.
+    source.invalidate_derived()
+    assert source.milliwatts == 10000.
+
+
+def test_dependents():
+    Source = make_source(HasQtlets)
+    deps = dependents(Source)
+    assert deps["voltage"] == ("power", "milliwatts", "summary")
+    assert deps["current"] == ("power", "milliwatts", "summary")
+    assert deps["milliwatts"] == ("summary",)
+    assert deps["summary"] == ()
+    assert "angle" not in deps
+    assert Source._qtlets_dependents == deps
+
+
+def test_circular(app):
+    with pytest.raises(TypeError):
+        class Loop(HasQtlets):
+            @derived("b")
+            def a(self):
+                return self.b
+
+            @derived("a")
+            def b(self):
+                return self.a
+
+
+def test_subclass(app):
+    class Sub(make_source(HasQtletDescriptors)):
+        @derived("power", "angle")
+        def per_angle(self):
+            return self.power / self.angle
+
+    inst = Sub()
+    label = Label()
+    inst.link_widget(label, "per_angle")
+    assert label.text() == "6.0"
+    inst.angle = 2.
+    assert label.text() == "3.0"
+    inst.voltage = 4.
+    assert label.text() == "6.0"
@@ -0,0 +1,100 @@
+# test binding attributes with descriptors, using HasQtletDescriptors
+
+import pytest
+
+from qtlets.qtlets import HasQtletDescriptors
+from qtlets.widgets import IntEdit
+
+TRAITLETS_IS_AVAILABLE = False
+try:
+    from traitlets import Integer, HasTraits, TraitError
+    TRAITLETS_IS_AVAILABLE = True
+except ImportError:
+    pass
+
+
+class Data(HasQtletDescriptors):
+    default = 5
+
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = 0
+        self.scratch = 0
+
+
+@pytest.mark.usefixtures("app")
+class TestDescriptors:
+    def test_no_overhead(self):
+        data = Data()
+        edit = IntEdit(0)
+        data.link_widget(edit, "value")
+        assert type(data).__setattr__ is object.__setattr__
+        calls = []
+        data._sync_qtlet = calls.append
+        data.scratch = 1
+        assert calls == []
+        data.value = 1
+        assert calls == ["value"]
+
+    def test_class_cached(self):
+        a, b = Data(), Data()
+        assert type(a) is Data
+        edits = [IntEdit(0) for _ in range(3)]
+        a.link_widget(edits[0], "value")
+        b.link_widget(edits[1], "value")
+        assert type(a) is type(b)
+        assert type(a) is not Data
+        assert isinstance(a, Data)
+        assert type(a).__name__ == "Data"
+        c = Data()
+        c.link_widget(edits[2], "scratch")
+        assert type(c) is not type(a)
+        assert type(Data()) is Data
+
+    def test_multiple_attributes(self):
+        data = Data()
+        edits = [IntEdit(0), IntEdit(0)]
+        data.link_widget(edits[0], "value")
+        data.link_widget(edits[1], "scratch")
+        data.value = 3
+        data.scratch = 4
+        assert [e.value() for e in edits] == [3, 4]
+
+    def test_class_default(self):
+        data = Data()
+        edit = IntEdit(0)
+        data.link_widget(edit, "default")
+        assert edit.value() == 5
+        data.default = 6
+        assert edit.value() == 6
+        assert Data.default == 5
+        del data.default
+        assert data.default == 5
+
+    def test_slots(self):
+        class Slotted:
+            __slots__ = ("value", "__dict__")
+        class SlottedData(HasQtletDescriptors, Slotted):
+            pass
+        data = SlottedData()
+        data.value = 1
+        edit = IntEdit(0)
+        data.link_widget(edit, "value")
+        data.value = 2
+        assert edit.value() == 2
+
+    @pytest.mark.skipif(not TRAITLETS_IS_AVAILABLE, reason="Requires the `traitlets` module.")
+    def test_traitlets(self):
+        class Traits(HasQtletDescriptors, HasTraits):
+            value = Integer(0)
+        data = Traits()
+        changes = []
+        data.observe(changes.append, names="value")
+        edit = IntEdit(0)
+        data.link_widget(edit, "value")
+        data.value = 2
+        assert edit.value() == 2
+        assert len(changes) == 1
+        with pytest.raises(TraitError):
+            data.value = "not an int"
+        assert "value" in data.trait_names()
@@ -0,0 +1,92 @@
+# test that edits aren't echoed back to the widgets, nor to the setter
+
+import pytest
+
+from PySide2.QtWidgets import QSpinBox
+
+from qtlets.qtlets import HasQtlets
+from qtlets.widgets import IntEdit
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.sets = []
+        self._value = 0
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, v):
+        self.sets.append(v)
+        self._value = min(v, 10)  # normalizes the value
+
+
+class Edit(IntEdit):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.calls = []
+
+    def setValue(self, v):
+        self.calls.append(v)
+        super().setValue(v)
+
+
+@pytest.fixture
+def data(app):
+    return Data()
+
+
+def test_origin_skipped(data):
+    edit, other = Edit(0), Edit(0)
+    data.link_widget(edit, "value")
+    data.link_widget(other, "value")
+    edit.calls.clear()
+    other.calls.clear()
+    edit.valueEdited.emit(5)
+    assert data.sets[-1:] == [5]
+    assert edit.calls == []
+    assert other.calls == [5]
+    data.value = 6  # not an edit: all widgets are updated
+    assert edit.calls == [6]
+
+
+def test_normalized(data):
+    edit, other = Edit(0), Edit(0)
+    data.link_widget(edit, "value")
+    data.link_widget(other, "value")
+    edit.calls.clear()
+    edit.valueEdited.emit(20)
+    assert edit.calls == [10]
+    assert other.value() == 10
+
+
+def test_spin_boxes(data):
+    """Spin boxes emit `valueChanged` when they are updated."""
+    spins = [QSpinBox() for _ in range(4)]
+    for s in spins:
+        data.link_widget(s, "value")
+    data.sets.clear()
+    spins[0].setValue(3)
+    assert data.sets == [3]
+    assert [s.value() for s in spins] == [3] * 4
+
+
+def test_reentrant(data):
+    """Syncs requested during a push are done once it is finished."""
+    edit = Edit(0)
+    qtl = data.link_widget(edit, "value")
+    depth, received = [0], []
+    def listener(v):
+        depth[0] += 1
+        received.append((depth[0], v))
+        if v == 1:
+            data.value = 2
+            data.value = 3
+        depth[0] -= 1
+    qtl.data_changed.connect(listener)
+    data.value = 1
+    assert received == [(1, 1), (1, 3)]
+    assert edit.value() == 3
@@ -0,0 +1,119 @@
+# test deferring the updates of hidden widgets
+
+import pytest
+
+from PySide2.QtWidgets import QTabWidget, QSpinBox
+
+from qtlets.qtlets import HasQtlets, set_default_defer_hidden
+from qtlets.widgets import IntEdit
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.sets = 0
+        self._value = 0
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, v):
+        self.sets += 1
+        self._value = v
+
+
+class Edit(IntEdit):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.calls = []
+
+    def setValue(self, v):
+        self.calls.append(v)
+        super().setValue(v)
+
+
+@pytest.fixture
+def tabs(app):
+    """Shown tab widget with a widget on each tab. Only the first is visible."""
+    tabs = QTabWidget()
+    visible, hidden = Edit(0), Edit(0)
+    tabs.addTab(visible, "visible")
+    tabs.addTab(hidden, "hidden")
+    tabs.show()
+    yield tabs, visible, hidden
+    tabs.close()
+
+
+def test_deferred(tabs):
+    tabs, visible, hidden = tabs
+    data = Data()
+    data.link_widget(visible, "value", defer_hidden=True)
+    data.link_widget(hidden, "value")
+    assert hidden.calls == []
+    visible.calls.clear()
+    for v in range(1, 4):
+        data.value = v
+    assert visible.calls == [1, 2, 3]
+    assert hidden.calls == []
+    tabs.setCurrentIndex(1)
+    assert hidden.calls == [3]  # only the latest value
+    data.value = 4
+    assert hidden.calls == [3, 4]
+    tabs.setCurrentIndex(0)
+    tabs.setCurrentIndex(1)
+    assert hidden.calls == [3, 4]  # not stale
+
+
+def test_no_echo(tabs):
+    tabs, visible, hidden = tabs
+    spin = QSpinBox()
+    tabs.addTab(spin, "spin")
+    data = Data()
+    data.link_widget(spin, "value", defer_hidden=True)
+    data.value = 5
+    assert spin.value() == 0
+    data.sets = 0
+    tabs.setCurrentIndex(2)
+    assert spin.value() == 5
+    assert data.sets == 0
+
+
+def test_disable_flushes(tabs):
+    tabs, visible, hidden = tabs
+    data = Data()
+    qtl = data.link_widget(hidden, "value", defer_hidden=True)
+    data.value = 2
+    assert hidden.value() == 0
+    qtl.use_defer_hidden(False)
+    assert hidden.value() == 2
+    data.value = 3
+    assert hidden.value() == 3
+
+
+def test_unlink(tabs):
+    tabs, visible, hidden = tabs
+    data = Data()
+    data.link_widget(visible, "value")
+    data.link_widget(hidden, "value", defer_hidden=True)
+    data.value = 2
+    data.unlink_widget(hidden, "value")
+    tabs.setCurrentIndex(1)
+    assert hidden.value() == 0
+
+
+def test_default(tabs):
+    tabs, visible, hidden = tabs
+    set_default_defer_hidden(True)
+    try:
+        data = Data()
+        data.link_widget(hidden, "value")
+    finally:
+        set_default_defer_hidden(False)
+    data.value = 2
+    assert hidden.value() == 0
+    other = Edit(0)
+    data.link_widget(other, "value", defer_hidden=False)
+    data.value = 3
+    assert other.value() == 3  # never shown, but updated
@@ -0,0 +1,83 @@
+# test deferring widget updates with `hold_sync`
+
+import pytest
+
+from qtlets.qtlets import HasQtlets, batched
+from qtlets.widgets import IntEdit
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.a = 0
+        self.b = 0
+
+    @batched
+    def update(self, a, b, fail=False):
+        self.a = a
+        self.a = a
+        self.b = b
+        if fail:
+            raise RuntimeError("failed!")
+
+
+@pytest.fixture
+def linked():
+    data = Data()
+    edits = {k: IntEdit(0) for k in "ab"}
+    received = []
+    for k, w in edits.items():
+        qtl = data.link_widget(w, k)
+        qtl.data_changed.connect(lambda v, k=k: received.append((k, v)))
+    return data, edits, received
+
+
+@pytest.mark.usefixtures("app")
+class TestHoldSync:
+    def test_deferred(self, linked):
+        data, edits, received = linked
+        with data.hold_sync():
+            for i in range(5):
+                data.a = i
+            data.b = 10
+            assert received == []
+            assert edits["a"].value() == 0
+        assert received == [("a", 4), ("b", 10)]
+        assert edits["a"].value() == 4
+        assert edits["b"].value() == 10
+
+    def test_nested(self, linked):
+        data, edits, received = linked
+        with data.hold_sync():
+            data.a = 1
+            with data.hold_sync():
+                data.b = 2
+            assert received == []
+            data.a = 3
+        assert received == [("a", 3), ("b", 2)]
+
+    def test_exception(self, linked):
+        data, edits, received = linked
+        with pytest.raises(RuntimeError):
+            with data.hold_sync():
+                data.a = 1
+                raise RuntimeError("failed!")
+        assert received == [("a", 1)]
+        data.b = 2  # not held anymore
+        assert received == [("a", 1), ("b", 2)]
+
+    def test_decorator(self, linked):
+        data, edits, received = linked
+        data.update(5, 6)
+        assert received == [("a", 5), ("b", 6)]
+        with pytest.raises(RuntimeError):
+            data.update(7, 8, fail=True)
+        assert received[2:] == [("a", 7), ("b", 8)]
+        assert edits["b"].value() == 8
+
+    def test_unchanged_in_block(self, linked):
+        data, edits, received = linked
+        with data.hold_sync():
+            data.a = 1
+            data.a = 0
+        assert received == []
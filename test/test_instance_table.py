@@ -0,0 +1,258 @@
+# test the table model showing many instances, a row per instance.
+
+import pytest
+
+from PySide2.QtCore import Qt
+from PySide2.QtWidgets import QAbstractItemDelegate, QAbstractItemView, \
+    QLineEdit, QTableView
+
+from qtlets import CompactQtlets, HasQtlets, HasQtletDescriptors
+from qtlets.compact import CompactQtlet
+from qtlets.qtlets import IntQtlet
+from qtlets.tables import InstanceTableModel
+from qtlets.widgets import IntEdit
+
+
+class Channel(HasQtlets):
+    def __init__(self, value=0, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = value
+        self.name = f"ch{value}"
+
+
+class DescriptorChannel(HasQtletDescriptors):
+    def __init__(self, value=0, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = value
+        self.name = f"ch{value}"
+
+
+class CompactChannel(CompactQtlets, HasQtlets):
+    def __init__(self, value=0, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = value
+        self.name = f"ch{value}"
+
+
+class Plain(object):
+    def __init__(self, value=0):
+        self.value = value
+        self.name = f"ch{value}"
+
+
+@pytest.fixture(params=[Channel, DescriptorChannel, CompactChannel])
+def cls(request, app):
+    return request.param
+
+
+def changes(model):
+    """List of the (top, left, bottom, right) ranges of `dataChanged`."""
+    emitted = []
+    model.dataChanged.connect(lambda tl, br, *a: emitted.append(
+        (tl.row(), tl.column(), br.row(), br.column())))
+    return emitted
+
+
+def test_data(cls):
+    channels = [cls(i) for i in range(3)]
+    model = InstanceTableModel(channels, ["value", "name"])
+    assert model.rowCount() == 3
+    assert model.columnCount() == 2
+    index = model.index(2, 0)
+    assert model.data(index) == "2"
+    assert model.data(index, Qt.EditRole) == 2
+    assert model.data(model.index(1, 1)) == "ch1"
+    assert model.headerData(1, Qt.Horizontal) == "name"
+    model = InstanceTableModel(channels, ["value"], headers=["Value"])
+    assert model.headerData(0, Qt.Horizontal) == "Value"
+
+
+def test_edit(cls, qwait):
+    channels = [cls(i) for i in range(3)]
+    model = InstanceTableModel(channels, ["value", "name"])
+    emitted = changes(model)
+    assert model.setData(model.index(1, 0), 7)
+    assert channels[1].value == 7
+    qwait(5)
+    assert emitted == [(1, 0, 1, 0)]
+    model.editable = False
+    assert not model.setData(model.index(1, 0), 8)
+    assert channels[1].value == 7
+
+
+def test_cell_changed(cls, qwait):
+    channels = [cls(i) for i in range(5)]
+    model = InstanceTableModel(channels, ["value", "name"])
+    emitted = changes(model)
+    channels[3].name = "probe"
+    assert emitted == []  # on the next iteration of the event loop
+    qwait(5)
+    assert emitted == [(3, 1, 3, 1)]
+    assert model.data(model.index(3, 1)) == "probe"
+    channels[3].name = "probe"
+    qwait(5)
+    assert len(emitted) == 1  # unchanged
+
+
+def test_coalesce(cls, qwait):
+    channels = [cls(i) for i in range(10)]
+    model = InstanceTableModel(channels, ["value", "name"])
+    emitted = changes(model)
+    for ch in channels[2:6]:
+        ch.value += 10
+        ch.value += 10
+    channels[8].value = -1
+    channels[8].name = "last"
+    qwait(5)
+    assert emitted == [(2, 0, 5, 0), (8, 0, 8, 1)]
+
+
+def test_lazy(cls, qwait):
+    reads = []
+
+    class Counted(cls):
+        @property
+        def name(self):
+            reads.append(self.value)
+            return str(self.value)
+
+        @name.setter
+        def name(self, value):
+            pass
+
+    channels = [Counted(i) for i in range(10000)]
+    model = InstanceTableModel(channels, ["value", "name"])
+    view = QTableView()
+    view.resize(200, 200)
+    view.setModel(model)
+    view.show()
+    qwait(20)
+    assert 0 < len(set(reads)) < 100
+    view.close()
+
+
+def test_existing_qtlet(app, qwait):
+    channels = [Channel(i) for i in range(3)]
+    edit = IntEdit(0)
+    qtl = channels[1].link_widget(edit, "value")
+    model = InstanceTableModel(channels, ["value"])
+    assert channels[1].qtlets["value"] is qtl
+    assert channels[0].qtlets == {}  # watched privately
+    assert isinstance(channels[0]._qtlets_watchers["value"], CompactQtlet)
+    emitted = changes(model)
+    edit.valueEdited.emit(5)
+    qwait(5)
+    assert model.data(model.index(1, 0)) == "5"
+    assert emitted == [(1, 0, 1, 0)]
+    model.teardown()
+    assert channels[1].qtlets == {"value": qtl}
+    assert isinstance(qtl, IntQtlet)
+
+
+def test_teardown(cls, qwait):
+    channels = [cls(i) for i in range(3)]
+    model = InstanceTableModel(channels, ["value"])
+    other = InstanceTableModel(channels[:1], ["value"])
+    assert all("value" in ch._qtlets_watchers for ch in channels)
+    assert not any(ch.qtlets for ch in channels)
+    model.teardown()
+    assert model.rowCount() == 0
+    assert [bool(ch._qtlets_watchers) for ch in channels] \
+        == [True, False, False]
+    other.set_instances([])
+    assert not channels[0]._qtlets_watchers
+    channels[0].value = 3  # not watched anymore
+    qwait(5)
+
+
+def test_plain(app, qwait):
+    items = [Plain(i) for i in range(4)]
+    model = InstanceTableModel(items, ["value", "name"])
+    emitted = changes(model)
+    assert model.setData(model.index(0, 0), 3)
+    assert items[0].value == 3
+    items[2].name = "probe"
+    model.mark_dirty(items[2], "name")
+    qwait(5)
+    assert emitted == [(0, 0, 0, 0), (2, 1, 2, 1)]
+    model.mark_dirty()
+    qwait(5)
+    assert emitted[-1] == (0, 0, 3, 1)
+    with pytest.raises(ValueError):
+        model.mark_dirty(Plain())
+
+
+def test_set_instances(cls, qwait):
+    first = [cls(i) for i in range(3)]
+    second = [cls(i) for i in range(2)]
+    model = InstanceTableModel(first, ["value"])
+    model.set_instances(second)
+    assert model.rowCount() == 2
+    assert not first[0]._qtlets_watchers
+    emitted = changes(model)
+    first[0].value = 5
+    second[1].value = 5
+    qwait(5)
+    assert emitted == [(1, 0, 1, 0)]
+
+
+def is_editable(model, index) -> bool:
+    return bool(int(model.flags(index)) & int(Qt.ItemIsEditable))
+
+
+def test_link_watched(cls, qwait):
+    channels = [cls(i) for i in range(2)]
+    model = InstanceTableModel(channels, ["value"])
+    emitted = changes(model)
+    edit = IntEdit(0)
+    channels[0].link_widget(edit, "value")
+    channels[0].value = 4
+    qwait(5)
+    assert edit.value() == 4
+    assert emitted == [(0, 0, 0, 0)]
+    channels[0].unlink_widget(edit, "value")
+    channels[0].value = 5  # still watched by the model
+    qwait(5)
+    assert emitted == [(0, 0, 0, 0)] * 2
+
+
+def test_link_options(app):
+    channel = Channel()
+    model = InstanceTableModel([channel], ["value"])
+    edit = IntEdit(0)
+    qtl = channel.link_widget(edit, "value", max_rate=30)
+    assert isinstance(qtl, IntQtlet)
+    qtl.use_polling(20, threaded=True)
+    qtl.stop_polling()
+    assert model.rowCount() == 1
+
+
+def test_edit_from_view(cls):
+    channels = [cls(i) for i in range(2)]
+    model = InstanceTableModel(channels, ["name"])
+    index = model.index(1, 0)
+    assert is_editable(model, index)
+    view = QTableView()
+    view.setModel(model)
+    assert view.edit(index, QAbstractItemView.AllEditTriggers, None)
+    editor = view.findChild(QLineEdit)
+    editor.setText("probe")
+    view.commitData(editor)
+    view.closeEditor(editor, QAbstractItemDelegate.NoHint)
+    assert channels[1].name == "probe"
+    model.editable = False
+    assert not is_editable(model, index)
+
+
+def test_unlink_linked_before(cls, qwait):
+    channels = [cls(i) for i in range(2)]
+    edit = IntEdit(0)
+    channels[0].link_widget(edit, "value")
+    model = InstanceTableModel(channels, ["value"])
+    emitted = changes(model)
+    channels[0].unlink_widget(edit, "value")
+    assert "value" not in channels[0].qtlets
+    channels[0].value = 5  # still watched by the model
+    qwait(5)
+    assert emitted == [(0, 0, 0, 0)]
+    assert model.data(model.index(0, 0)) == "5"
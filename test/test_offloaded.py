@@ -0,0 +1,133 @@
+# test derived attributes computed in thread or process pools.
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import threading
+
+import pytest
+
+from PySide2.QtWidgets import QLabel
+
+from qtlets import HasQtlets, HasQtletDescriptors, derived, offloaded
+
+
+def total(values):
+    return sum(values)
+
+
+class Gate(object):
+    """Function blocking until released, recording the arguments it got."""
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = []
+        self.threads = set()
+
+    def __call__(self, values):
+        self.started.append(list(values))
+        self.threads.add(threading.current_thread())
+        self.release.wait(5)
+        return sum(values)
+
+
+def make_trace(mixin, func, executor=None):
+    class Trace(mixin):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, **kw)
+            self.values = [1, 2]
+
+        total = offloaded(func, "values", executor=executor, initial=-1)
+
+        @derived("total")
+        def label(self):
+            return f"total: {self.total}"
+    return Trace
+
+
+@pytest.fixture(params=[HasQtlets, HasQtletDescriptors])
+def mixin(request, app):
+    return request.param
+
+
+def wait_until(qwait, predicate, timeout=2000):
+    for _ in range(timeout // 5):
+        if predicate():
+            return True
+        qwait(5)
+    return predicate()
+
+
+def test_offloaded(mixin, qwait):
+    gate = Gate()
+    trace = make_trace(mixin, gate)()
+    label = QLabel()
+    trace.link_widget(label, "label")
+    assert label.text() == "total: -1"  # computing
+    assert type(trace).total.pending(trace)
+    assert threading.current_thread() not in gate.threads
+    gate.release.set()
+    assert wait_until(qwait, lambda: label.text() == "total: 3")
+    assert trace.total == 3
+    assert not type(trace).total.pending(trace)
+    assert gate.started == [[1, 2]]
+
+
+def test_stale(mixin, qwait):
+    gate = Gate()
+    trace = make_trace(mixin, gate)()
+    delivered = []
+    trace.qtlet("total").data_changed.connect(delivered.append)
+    trace.link_widget(QLabel(), "label")
+    assert wait_until(qwait, lambda: len(gate.started) == 1)  # running
+    trace.values = [5]
+    trace.values = [7, 8]
+    gate.release.set()
+    assert wait_until(qwait, lambda: trace.label == "total: 15")
+    qwait(20)
+    assert delivered == [-1, 15]  # the stale results were discarded
+    assert gate.started[0] == [1, 2] and gate.started[-1] == [7, 8]
+
+
+def test_cancel(mixin, qwait):
+    gate = Gate()
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.submit(gate.release.wait, 5)  # keep the worker busy
+    trace = make_trace(mixin, gate, executor)()
+    trace.link_widget(QLabel(), "total")
+    trace.values = [5]
+    trace.values = [6]
+    gate.release.set()
+    assert wait_until(qwait, lambda: trace.total == 6)
+    assert gate.started == [[6]]  # the stale jobs never ran
+    executor.shutdown()
+
+
+def test_lazy(mixin, qwait):
+    gate = Gate()
+    gate.release.set()
+    trace = make_trace(mixin, gate)()
+    trace.values = [4]
+    qwait(20)
+    assert gate.started == []  # not linked, not read
+    assert trace.total == -1
+    assert wait_until(qwait, lambda: trace.total == 4)
+    assert gate.started == [[4]]
+
+
+def test_error(mixin, qwait, caplog):
+    def fail(values):
+        raise ValueError("no")
+    trace = make_trace(mixin, fail)()
+    label = QLabel()
+    trace.link_widget(label, "total")
+    assert wait_until(qwait, lambda: "no" in caplog.text)
+    assert trace.total == -1
+    assert not type(trace).total.pending(trace)
+
+
+def test_process_pool(app, qwait):
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        trace = make_trace(HasQtlets, total, executor)()
+        label = QLabel()
+        trace.link_widget(label, "label")
+        assert wait_until(qwait, lambda: label.text() == "total: 3", 10000)
+        trace.values = [10, 20]
+        assert wait_until(qwait, lambda: label.text() == "total: 30", 10000)
@@ -1,6 +1,9 @@
 # test our use of polling
 
+from concurrent.futures import ThreadPoolExecutor
+import gc
 import sys
+import threading
 import time
 
 import pytest
@@ -11,11 +14,11 @@ from PySide2.QtCore import Qt
 from PySide2.QtTest import QTest
 
 from qtlets.qtlets import HasQtlets
+from qtlets.polling import Backoff, PollScheduler
 from qtlets.widgets import IntEdit, StrEdit
 
 
-@pytest.fixture
-def data_instance():
+def make_data():
     class Data(HasQtlets):
         def __init__(self, *a, value=0, **kw):
             super().__init__(*a, **kw)
@@ -30,6 +33,30 @@ def data_instance():
             self._value = v
     return Data()
 
+
+@pytest.fixture
+def data_instance():
+    return make_data()
+
+
+@pytest.fixture
+def keep():
+    """Keeps data and widgets alive during a test."""
+    return []
+
+
+def link(keep):
+    data, edit = make_data(), IntEdit(0)
+    keep += [data, edit]
+    return data.link_widget(edit, "value")
+
+
+@pytest.fixture
+def scheduler():
+    s = PollScheduler()
+    yield s
+    s.stop()
+
 @pytest.fixture
 def form():
     class Form(QWidget):
@@ -52,3 +79,359 @@ class TestPolling:
         assert form.edit.value() == init_value
         data_instance.qtlets["value"].timer.timeout.emit() # good!
         assert form.edit.value() == test_value
+
+    def test_shared_timer(self, scheduler):
+        data = [make_data() for _ in range(10)]
+        edits = [IntEdit(0) for _ in data]
+        qtlets = [d.link_widget(e, "value").use_polling(20, scheduler)
+                  for d, e in zip(data, edits)]
+        assert len(scheduler.buckets) == 1
+        timer = qtlets[0].timer
+        assert all(q.timer is timer for q in qtlets)
+        assert timer.isActive()
+        for i, d in enumerate(data):
+            d._value = i + 1
+        timer.timeout.emit()
+        for i, e in enumerate(edits):
+            assert e.value() == i + 1
+
+    def test_intervals(self, scheduler, keep):
+        q1 = link(keep).use_polling(20, scheduler)
+        q2 = link(keep).use_polling(50, scheduler)
+        assert set(scheduler.buckets) == {20, 50}
+        assert q1.timer is not q2.timer
+        q2.use_polling(20)
+        assert set(scheduler.buckets) == {20}
+        assert scheduler.interval(q2) == 20
+
+    def test_pause_resume(self, scheduler, keep):
+        d = make_data()
+        edit = IntEdit(0)
+        qtl = d.link_widget(edit, "value").use_polling(20, scheduler)
+        other = link(keep).use_polling(20, scheduler)
+        qtl.pause_polling()
+        assert not qtl.polling
+        assert other.polling
+        d._value = 3
+        qtl.timer.timeout.emit()
+        assert edit.value() == 0
+        other.pause_polling()
+        assert not qtl.timer.isActive()
+        qtl.resume_polling()
+        assert qtl.timer.isActive()
+        qtl.timer.timeout.emit()
+        assert edit.value() == 3
+
+    def test_pause_all(self, scheduler, keep):
+        qtl = link(keep).use_polling(20, scheduler)
+        scheduler.pause_all(20)
+        assert not qtl.polling
+        assert not qtl.timer.isActive()
+        scheduler.resume_all()
+        assert qtl.polling
+        assert qtl.timer.isActive()
+
+    def test_stop(self, scheduler, keep):
+        qtl = link(keep).use_polling(20, scheduler)
+        timer = qtl.timer
+        qtl.stop_polling()
+        assert qtl.timer is None
+        assert not timer.isActive()
+        assert scheduler.buckets == {}
+
+    def test_error_does_not_stop_bucket(self, scheduler):
+        bad = make_data()
+        bad_qtl = bad.link_widget(keep_edit := IntEdit(0), "value").use_polling(20, scheduler)
+        good = make_data()
+        edit = IntEdit(0)
+        good.link_widget(edit, "value").use_polling(20, scheduler)
+        del bad._value  # the getter now raises
+        good._value = 4
+        bad_qtl.timer.timeout.emit()
+        assert edit.value() == 4
+
+    def test_collected_instance(self, scheduler, qwait, caplog):
+        data, edit = make_data(), IntEdit(0)
+        qtl = data.link_widget(edit, "value").use_polling(10, scheduler)
+        del data
+        gc.collect()
+        assert qtl.inst is None
+        assert scheduler.buckets == {}  # torn down
+        assert not qtl.has_widgets
+        qwait(30)
+        qtl.on_widget_edited(3)
+        assert not qtl.sync_widgets()
+        assert caplog.records == []
+
+
+@pytest.mark.usefixtures("app")
+class TestAdaptive:
+    def test_backoff(self, scheduler, keep):
+        qtl = link(keep).use_polling(10, scheduler, max_interval=50)
+        assert qtl.poll_interval == 10
+        intervals = []
+        for _ in range(4):
+            qtl.poll()
+            intervals.append(qtl.poll_interval)
+        assert intervals == [20, 40, 50, 50]
+        assert qtl.poll_rate == pytest.approx(20)
+        assert set(scheduler.buckets) == {50}
+
+    def test_small_factor(self):
+        backoff = Backoff(5, 8, 1.1)
+        intervals = []
+        while backoff.grow():
+            intervals.append(backoff.interval)
+        assert intervals == [6, 7, 8]
+        backoff = Backoff(100, 1000, 1.25)
+        assert backoff.grow()
+        assert backoff.interval == 125
+
+    def test_change_resets(self, scheduler, keep):
+        qtl = link(keep).use_polling(10, scheduler, max_interval=80)
+        qtl.poll()
+        qtl.poll()
+        qtl.inst._value = 3  # only seen by polling
+        qtl.poll()
+        assert qtl.poll_interval == 10
+        assert qtl.widgets[0].value() == 3
+
+    def test_set_resets(self, scheduler, keep):
+        qtl = link(keep).use_polling(10, scheduler, max_interval=80)
+        qtl.poll()
+        qtl.inst.value = 3
+        assert qtl.poll_interval == 10
+
+    def test_edit_resets(self, scheduler, keep):
+        qtl = link(keep).use_polling(10, scheduler, max_interval=80)
+        qtl.poll()
+        qtl.poll()
+        qtl.widgets[0].valueEdited.emit(0)  # same value: interaction only
+        assert qtl.poll_interval == 10
+
+    def test_paused_stays_paused(self, scheduler, keep):
+        qtl = link(keep).use_polling(10, scheduler, max_interval=80)
+        qtl.poll()
+        qtl.pause_polling()
+        qtl.inst.value = 3
+        assert qtl.poll_interval == 10
+        assert not qtl.polling
+        assert qtl.poll_rate == 0
+        qtl.resume_polling()
+        assert qtl.polling
+
+    def test_fixed(self, scheduler, keep):
+        qtl = link(keep).use_polling(10, scheduler)
+        qtl.poll()
+        assert qtl.poll_interval == 10
+        qtl.use_polling(10, max_interval=80)
+        qtl.poll()
+        assert qtl.poll_interval == 20
+        qtl.use_polling(10)
+        assert qtl.backoff is None
+        assert qtl.poll_interval == 10
+
+    @pytest.mark.parametrize("args", [(10, 5), (0, 10), (10, 20, 1)])
+    def test_invalid(self, scheduler, keep, args):
+        qtl = link(keep)
+        with pytest.raises(ValueError):
+            qtl.use_polling(args[0], scheduler, *args[1:])
+
+    def test_load(self, scheduler, keep, qwait):
+        """A stable value is polled much less often than with a fixed rate."""
+        fixed = link(keep).use_polling(5, scheduler)
+        adaptive = link(keep).use_polling(5, scheduler, max_interval=200)
+        for qtl in (fixed, adaptive):
+            qtl.enable_stats()
+        qwait(400)
+        assert adaptive.stats.polls * 4 < fixed.stats.polls
+
+
+class Device(HasQtlets):
+    """Reads all its attributes in a single call."""
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.a, self.b, self.c = 0, 0, 0
+        self.reads = []
+
+    def _qtlets_read_many(self, names):
+        self.reads.append(list(names))
+        return {name: getattr(self, name) for name in names if name != "c"}
+
+
+@pytest.mark.usefixtures("app")
+class TestBulkRead:
+    @pytest.fixture
+    def device(self, scheduler, keep):
+        device = Device()
+        edits = {name: IntEdit(0) for name in "abc"}
+        for name, edit in edits.items():
+            device.link_widget(edit, name).use_polling(20, scheduler)
+        keep += [device, edits]
+        return device, edits
+
+    def test_single_call(self, device, keep):
+        device, edits = device
+        other = link(keep).use_polling(20, device.qtlets["a"].scheduler)
+        device.__dict__.update(a=1, b=2, c=3)  # not notified
+        other.inst._value = 4
+        device.qtlets["a"].timer.timeout.emit()
+        assert device.reads == [["a", "b", "c"]]
+        assert [edits[n].value() for n in "abc"] == [1, 2, 3]
+        assert other.widgets[0].value() == 4
+
+    def test_value_read_once(self, device):
+        device, edits = device
+        device.__dict__["a"] = 1
+        device.qtlets["a"].timer.timeout.emit()
+        assert edits["a"].value() == 1
+        # the bulk value isn't reused by later reads.
+        device.__dict__["a"] = 2
+        assert device.qtlets["a"].value == 2
+
+    def test_error(self, device, caplog):
+        device, edits = device
+        def fail(names):
+            raise IOError("disconnected")
+        device._qtlets_read_many = fail
+        device.__dict__["a"] = 1
+        device.qtlets["a"].timer.timeout.emit()
+        assert edits["a"].value() == 0
+        assert "disconnected" in caplog.text
+
+
+class Instrument(HasQtlets):
+    """Getter blocking until `ready` is set, like a slow device."""
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.ready = threading.Event()
+        self.ready.set()
+        self.error = None
+        self.threads = set()
+        self.reads = 0
+        self._value = 0
+
+    @property
+    def value(self):
+        self.threads.add(threading.current_thread())
+        self.reads += 1
+        self.ready.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self._value
+
+    @value.setter
+    def value(self, v):
+        self._value = v
+
+
+@pytest.mark.usefixtures("app")
+class TestThreaded:
+    @pytest.fixture
+    def executor(self):
+        executor = ThreadPoolExecutor(4)
+        yield executor
+        executor.shutdown()
+
+    @pytest.fixture
+    def polled(self, scheduler, executor, keep):
+        """Slow instrument, polled in threads. Ticks are driven by the test."""
+        def polled(**kw):
+            inst, edit = Instrument(), IntEdit(0)
+            keep.extend([inst, edit])
+            qtl = inst.link_widget(edit, "value").use_polling(
+                10000, scheduler, executor=executor, **kw)
+            inst.reads = 0
+            inst.threads.clear()
+            errors = []
+            qtl.poll_error.connect(errors.append)
+            keep.append(errors)
+            return inst, edit, qtl, errors
+        return polled
+
+    def test_off_gui_thread(self, polled, qwait):
+        inst, edit, qtl, errors = polled()
+        inst.ready.clear()
+        inst._value = 5
+        t0 = time.perf_counter()
+        qtl.poll()
+        assert time.perf_counter() - t0 < 0.05  # doesn't block
+        inst.ready.set()
+        qwait(50)
+        assert edit.value() == 5
+        assert threading.main_thread() not in inst.threads
+        assert errors == []
+
+    def test_skip_in_flight(self, polled, qwait):
+        inst, edit, qtl, errors = polled()
+        inst.ready.clear()
+        for _ in range(3):
+            qtl.poll()
+        assert qtl.skipped == 2
+        inst.ready.set()
+        qwait(50)
+        assert inst.reads == 1
+        qtl.poll()
+        qwait(50)
+        assert inst.reads == 2
+
+    def test_overlap(self, polled, qwait):
+        inst, edit, qtl, errors = polled(overlap=True)
+        inst.ready.clear()
+        for _ in range(3):
+            qtl.poll()
+        inst.ready.set()
+        qwait(50)
+        assert inst.reads == 3
+        assert qtl.skipped == 0
+
+    def test_timeout(self, polled, qwait):
+        inst, edit, qtl, errors = polled(timeout=10)
+        inst.ready.clear()
+        inst._value = 5
+        qtl.poll()
+        qwait(30)
+        qtl.poll()  # still in flight: skipped, and times out
+        assert len(errors) == 1
+        assert isinstance(errors[0], TimeoutError)
+        inst.ready.set()
+        qwait(50)
+        assert edit.value() == 0  # stale value discarded
+        qtl.poll()
+        qwait(50)
+        assert edit.value() == 5
+
+    def test_error(self, polled, qwait):
+        inst, edit, qtl, errors = polled()
+        inst.error = IOError("disconnected")
+        qtl.poll()
+        qwait(50)
+        assert [str(e) for e in errors] == ["disconnected"]
+        inst.error = None
+        inst._value = 3
+        qtl.poll()
+        qwait(50)
+        assert edit.value() == 3
+
+    def test_stop_discards(self, polled, qwait):
+        inst, edit, qtl, errors = polled()
+        inst.ready.clear()
+        inst._value = 5
+        qtl.poll()
+        qtl.stop_polling()
+        inst.ready.set()
+        qwait(50)
+        assert edit.value() == 0
+
+    def test_rate_limited(self, polled, qwait):
+        inst, edit, qtl, errors = polled()
+        qtl.use_rate_limit(5)
+        for value in [1, 2, 3]:
+            inst._value = value
+            qtl.poll()
+            qwait(20)
+        assert edit.value() == 0  # delayed: linked just before
+        qwait(250)
+        assert edit.value() == 3  # the value read in the worker
+        assert inst.reads == 3
+        assert threading.main_thread() not in inst.threads
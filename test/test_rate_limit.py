@@ -0,0 +1,82 @@
+# test limiting the rate of widget updates
+
+import pytest
+
+from qtlets import qtlets
+from qtlets.qtlets import HasQtlets
+from qtlets.widgets import IntEdit
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, value=0, **kw):
+        super().__init__(*a, **kw)
+        self.value = value
+
+
+@pytest.fixture
+def edit():
+    return IntEdit(0)
+
+
+def record(qtl):
+    received = []
+    qtl.data_changed.connect(received.append)
+    return received
+
+
+@pytest.mark.usefixtures("app")
+class TestRateLimit:
+    def test_trailing_edge(self, edit, qwait):
+        data = Data()
+        qtl = data.link_widget(edit, "value", max_rate=10)
+        received = record(qtl)
+        for i in range(1, 6):
+            data.value = i
+        assert received == []
+        assert qtl.dropped == 4
+        qwait(200)
+        assert received == [5]
+        assert edit.value() == 5
+
+    def test_leading_edge(self, edit, qwait):
+        data = Data()
+        qtl = data.link_widget(edit, "value", max_rate=10)
+        received = record(qtl)
+        qwait(120)
+        data.value = 1  # the window has expired: immediate
+        assert received == [1]
+        data.value = 2
+        assert received == [1]
+
+    def test_force(self, edit, qwait):
+        data = Data()
+        qtl = data.link_widget(edit, "value", max_rate=10)
+        received = record(qtl)
+        data.value = 1
+        qtl.sync_widgets(force=True)
+        assert received == [1]
+        qwait(200)
+        assert received == [1]
+
+    def test_remove_limit(self, edit, qwait):
+        data = Data()
+        qtl = data.link_widget(edit, "value", max_rate=10)
+        received = record(qtl)
+        data.value = 1
+        qtl.use_rate_limit(0)
+        assert received == [1]
+        data.value = 2
+        assert received == [1, 2]
+
+    def test_global(self, edit, monkeypatch, qwait):
+        monkeypatch.setattr(qtlets, "_default_max_rate", None)
+        qtlets.set_default_max_rate(10)
+        data = Data()
+        qtl = data.link_widget(edit, "value")
+        received = record(qtl)
+        data.value = 1
+        data.value = 2
+        assert received == []
+        assert qtl.dropped == 1
+        qwait(200)
+        assert received == [2]
@@ -0,0 +1,148 @@
+# test the change notifications of traitlets, attrs and dataclasses.
+
+from dataclasses import asdict, dataclass
+
+import pytest
+
+from qtlets import HasQtletSources, derived
+from qtlets.sources import Source, find_source, notify, register_source, \
+    _sources
+from qtlets.widgets import IntEdit
+
+traitlets = pytest.importorskip("traitlets")
+attr = pytest.importorskip("attr")
+
+
+class Traits(HasQtletSources, traitlets.HasTraits):
+    value = traitlets.Integer(0)
+    other = traitlets.Integer(0)
+
+    @derived("value", "other")
+    def total(self):
+        return self.value + self.other
+
+
+@attr.s
+class _AttrsBase(object):
+    value = attr.ib(default=0, on_setattr=notify)
+    checked = attr.ib(default=0, validator=attr.validators.instance_of(int),
+                      on_setattr=[attr.setters.validate, notify])
+    plain = attr.ib(default=0)
+
+
+class Attrs(HasQtletSources, _AttrsBase):
+    pass
+
+
+@dataclass
+class _DataBase:
+    value: int = 0
+
+
+class Data(HasQtletSources, _DataBase):
+    pass
+
+
+class Edit(IntEdit):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.calls = []
+
+    def setValue(self, v):
+        self.calls.append(v)
+        super().setValue(v)
+
+
+def test_find_source(app):
+    assert find_source(Traits, "value") is not None
+    assert find_source(Traits, "total") is None
+    assert find_source(Attrs, "value") is not None
+    assert find_source(Attrs, "checked") is not None
+    assert find_source(Attrs, "plain") is None  # notifying descriptor
+    assert find_source(Data, "value") is None
+
+
+def test_traitlets(app):
+    data = Traits()
+    edit = Edit(0)
+    data.link_widget(edit, "value")
+    assert type(data) is Traits  # no class switch
+    data.value = 3
+    assert edit.value() == 3
+    data.set_trait("value", 4)
+    assert edit.value() == 4
+    edit.valueEdited.emit(5)
+    assert data.value == 5
+    edit.calls.clear()
+    with data.hold_trait_notifications():
+        data.value = 6
+        data.value = 7
+    assert edit.calls == [7]
+    data.unlink_widget(edit, "value")
+    data.value = 8
+    assert edit.value() == 7
+
+
+def test_traitlets_derived(app):
+    data = Traits()
+    edit = Edit(0)
+    data.link_widget(edit, "total")
+    data.value = 2
+    data.set_trait("other", 3)
+    assert edit.value() == 5
+    assert "other" in Traits.class_trait_names()  # not replaced
+
+
+@pytest.mark.parametrize("name", ["value", "checked", "plain"])
+def test_attrs(app, name):
+    data = Attrs()
+    edit = Edit(0)
+    data.link_widget(edit, name)
+    setattr(data, name, 3)
+    assert edit.value() == 3
+    edit.valueEdited.emit(4)
+    assert getattr(data, name) == 4
+
+
+def test_attrs_validate(app):
+    data = Attrs()
+    edit = Edit(0)
+    data.link_widget(edit, "checked")
+    with pytest.raises(TypeError):
+        data.checked = "bad"
+    assert edit.value() == 0
+    assert data.checked == 0
+
+
+def test_dataclass(app):
+    data = Data()
+    edit = Edit(0)
+    data.link_widget(edit, "value")
+    data.value = 3
+    assert edit.value() == 3
+    assert asdict(data) == {"value": 3}
+
+
+def test_register(app):
+    class Value(object):
+        def __init__(self):
+            self.observers = []
+
+    class Observed(HasQtletSources):
+        value = Value()
+
+    class ValueSource(Source):
+        def handles(self, cls, name):
+            return isinstance(getattr(cls, name, None), Value)
+
+        def bind(self, inst, name):
+            type(inst).value.observers.append(inst)
+
+    source = register_source(ValueSource())
+    try:
+        data = Observed()
+        edit = Edit(0)
+        data.link_widget(edit, "value")
+        assert Observed.value.observers == [data]
+    finally:
+        _sources.remove(source)
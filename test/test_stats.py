@@ -0,0 +1,90 @@
+# test the optional instrumentation of qtlets
+
+import pytest
+
+from qtlets import stats
+from qtlets.qtlets import HasQtlets
+from qtlets.polling import PollScheduler
+from qtlets.stats import QtletStats, format_stats
+from qtlets.widgets import IntEdit
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = 0
+        self.other = 0
+
+
+@pytest.fixture
+def linked():
+    data = Data()
+    edits = [IntEdit(0), IntEdit(0)]
+    data.link_widget(edits[0], "value")
+    data.link_widget(edits[1], "other")
+    return data, edits
+
+
+@pytest.mark.usefixtures("app")
+class TestStats:
+    def test_disabled_by_default(self, linked):
+        data, edits = linked
+        assert data.qtlets["value"].stats is None
+        assert data.qtlet_stats() == {}
+
+    def test_counters(self, linked):
+        data, edits = linked
+        data.enable_qtlet_stats()
+        data.value = 1
+        data.value = 1
+        data.qtlets["value"].sync_widgets()
+        edits[0].valueEdited.emit(2)
+        table = data.qtlet_stats()
+        assert set(table) == {"value", "other"}
+        row = table["value"]
+        assert row["syncs"] == 4
+        assert row["suppressed"] == 2
+        assert row["edits"] == 1
+        assert row["polls"] == 0
+        assert row["get_time"] > 0
+        assert row["set_time"] > 0
+        assert row["slot_time"] > 0
+        assert table["other"]["syncs"] == 0
+
+    def test_polls(self, linked):
+        data, edits = linked
+        scheduler = PollScheduler()
+        qtl = data.qtlets["value"].enable_stats().use_polling(20, scheduler)
+        for _ in range(3):
+            qtl.timer.timeout.emit()
+        assert qtl.stats.polls == 3
+        assert qtl.stats.suppressed == 3
+        scheduler.stop()
+
+    def test_reset_and_disable(self, linked):
+        data, edits = linked
+        data.enable_qtlet_stats()
+        data.value = 3
+        data.reset_qtlet_stats()
+        assert data.qtlet_stats()["value"]["syncs"] == 0
+        data.enable_qtlet_stats(False)
+        assert data.qtlet_stats() == {}
+
+    def test_global(self, monkeypatch):
+        monkeypatch.setattr(stats, "_enabled", False)
+        stats.enable_stats()
+        data = Data()
+        edit = IntEdit(0)
+        qtl = data.link_widget(edit, "value")
+        assert isinstance(qtl.stats, QtletStats)
+        assert qtl.stats.syncs == 1
+
+    def test_format(self, linked):
+        data, edits = linked
+        data.enable_qtlet_stats()
+        data.value = 3
+        text = format_stats(data.qtlet_stats())
+        lines = text.splitlines()
+        assert len(lines) == 3
+        assert lines[0].split()[:3] == ["attr", "syncs", "suppressed"]
+        assert lines[1].split()[:2] == ["value", "1"]
@@ -0,0 +1,84 @@
+# test setting attributes from worker threads
+
+import threading
+
+import pytest
+
+from PySide2.QtCore import QThread
+
+from qtlets.qtlets import HasQtlets
+from qtlets.widgets import IntEdit
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = 0
+        self.other = 0
+
+
+class Edit(IntEdit):
+    """Records the thread calling `setValue`."""
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.threads = set()
+        self.calls = 0
+
+    def setValue(self, v):
+        self.threads.add(QThread.currentThread())
+        self.calls += 1
+        super().setValue(v)
+
+
+def hammer(data, attrs=("value",), n_threads=4, n_writes=2000):
+    def produce(k):
+        for i in range(n_writes):
+            for a in attrs:
+                setattr(data, a, k * n_writes + i)
+    threads = [threading.Thread(target=produce, args=(k,))
+               for k in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+@pytest.mark.usefixtures("app")
+class TestThreads:
+    def test_marshaled(self, app):
+        data = Data()
+        edit = Edit(0)
+        qtl = data.link_widget(edit, "value")
+        edit.calls = 0
+        hammer(data)
+        assert edit.calls == 0  # nothing happens before the events are processed
+        app.processEvents()
+        assert edit.calls == 1  # a single update, with the latest value
+        assert edit.value() == data.value
+        assert edit.threads == {app.thread()}
+        assert qtl.dropped > 0
+
+    def test_concurrent_processing(self, app):
+        data = Data()
+        edits = {a: Edit(0) for a in ("value", "other")}
+        for a, w in edits.items():
+            data.link_widget(w, a)
+        worker = threading.Thread(
+            target=lambda: hammer(data, attrs=("value", "other"), n_writes=5000)
+        )
+        worker.start()
+        while worker.is_alive():
+            app.processEvents()
+        worker.join()
+        app.processEvents()
+        for a, w in edits.items():
+            assert w.value() == getattr(data, a)
+            assert w.threads == {app.thread()}
+            assert w.calls < 5000 * 4
+
+    def test_gui_thread_direct(self, app):
+        data = Data()
+        edit = Edit(0)
+        data.link_widget(edit, "value")
+        data.value = 3
+        assert edit.value() == 3  # no event processing needed
@@ -0,0 +1,153 @@
+# test unlinking widgets, and cleaning up after destroyed widgets.
+
+import gc
+
+import pytest
+
+from PySide2.QtCore import SIGNAL, Qt, QEvent
+from PySide2.QtTest import QTest
+from PySide2.QtWidgets import QWidget, QSpinBox
+
+from qtlets.qtlets import HasQtlets, HasQtletDescriptors
+from qtlets.polling import PollScheduler
+from qtlets.widgets import IntEdit
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = 0
+
+
+class DescriptorData(HasQtletDescriptors):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.value = 0
+
+
+def n_receivers(qtl):
+    return qtl.receivers(SIGNAL("data_changed(int)"))
+
+
+def edit_value(w, v):
+    w.clear()
+    QTest.keyClicks(w, str(v))
+    QTest.keyClick(w, Qt.Key_Enter)
+
+
+@pytest.fixture
+def scheduler():
+    s = PollScheduler()
+    yield s
+    s.stop()
+
+
+@pytest.mark.usefixtures("app")
+class TestUnlink:
+    def test_unlink_widget(self):
+        data = Data()
+        edit, other = IntEdit(0), IntEdit(0)
+        qtl = data.link_widget(edit, "value")
+        data.link_widget(other, "value")
+        assert n_receivers(qtl) == 2
+        data.unlink_widget(edit, "value")
+        assert n_receivers(qtl) == 1
+        assert qtl.widgets == [other]
+        data.value = 3
+        assert edit.value() == 0
+        assert other.value() == 3
+        edit_value(edit, 5)
+        assert data.value == 3
+        assert data.qtlets["value"] is qtl
+
+    def test_remove_when_empty(self, scheduler):
+        data = Data()
+        edit = IntEdit(0)
+        qtl = data.link_widget(edit, "value").use_polling(20, scheduler)
+        timer = qtl.timer
+        data.unlink_widget(edit, "value")
+        assert "value" not in data.qtlets
+        assert not qtl.polling
+        assert not timer.isActive()
+        assert n_receivers(qtl) == 0
+
+    def test_not_linked(self):
+        data = Data()
+        edit = IntEdit(0)
+        qtl = data.link_widget(edit, "value")
+        with pytest.raises(ValueError):
+            qtl.unlink_widget(IntEdit(0))
+
+    def test_unlink_all(self, scheduler):
+        data = Data()
+        data.other = 1
+        edits = [IntEdit(0), IntEdit(0)]
+        q1 = data.link_widget(edits[0], "value").use_polling(20, scheduler)
+        q2 = data.link_widget(edits[1], "other")
+        data.unlink_all()
+        assert data.qtlets == {}
+        assert scheduler.buckets == {}
+        assert n_receivers(q1) == n_receivers(q2) == 0
+
+    def test_destroyed(self, app):
+        data = Data()
+        form = QWidget()
+        edit, other = IntEdit(0, parent=form), IntEdit(0)
+        qtl = data.link_widget(edit, "value")
+        data.link_widget(other, "value")
+        del edit
+        form.deleteLater()
+        del form
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+        assert qtl.widgets == [other]
+        assert n_receivers(qtl) == 1
+        data.value = 2
+        assert other.value() == 2
+        del other
+        gc.collect()
+        assert "value" not in data.qtlets
+        assert n_receivers(qtl) == 0
+
+    def test_instance_not_kept_alive(self):
+        data = Data()
+        edit = IntEdit(0)
+        qtl = data.link_widget(edit, "value")
+        del data
+        gc.collect()
+        assert qtl.inst is None
+
+    def test_descriptors_unbound(self):
+        data = DescriptorData()
+        edit = IntEdit(0)
+        data.link_widget(edit, "value")
+        assert type(data) is not DescriptorData
+        data.unlink_widget(edit, "value")
+        assert type(data) is DescriptorData
+        data.value = 4
+        assert data.value == 4
+
+    @pytest.mark.parametrize("destroy", [False, True], ids=["unlink", "destroy"])
+    def test_soak(self, destroy):
+        # PySide2 itself leaks a few bytes on each connect/disconnect, so we
+        # count the objects tracked by the gc rather than the raw memory.
+        data = Data()
+        keep = QSpinBox()
+        qtl = data.link_widget(keep, "value")
+
+        def cycle(n):
+            for i in range(n):
+                spin = QSpinBox()
+                data.link_widget(spin, "value")
+                data.value = i
+                if not destroy:
+                    data.unlink_widget(spin, "value")
+                del spin
+            gc.collect()
+            return len(gc.get_objects())
+
+        before = cycle(500)  # warm up
+        after = cycle(10000)
+        assert after - before < 100
+        assert n_receivers(qtl) == 1
+        assert len(qtl.links) == 1
+        assert data.qtlets["value"] is qtl
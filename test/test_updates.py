@@ -0,0 +1,148 @@
+# test updating widgets in time-bounded slices
+
+import time
+
+import pytest
+
+from PySide2.QtWidgets import QWidget, QVBoxLayout
+
+from qtlets.qtlets import HasQtlets
+from qtlets.updates import UpdateScheduler
+from qtlets.widgets import IntEdit
+
+
+class Data(HasQtlets):
+    def __init__(self, *a, n=1, **kw):
+        super().__init__(*a, **kw)
+        for i in range(n):
+            setattr(self, f"a{i}", 0)
+
+
+class Edit(IntEdit):
+    def __init__(self, *a, delay=0., **kw):
+        super().__init__(*a, **kw)
+        self.calls = []
+        self.delay = delay
+
+    def setValue(self, v):
+        time.sleep(self.delay)
+        self.calls.append(v)
+        super().setValue(v)
+
+
+@pytest.fixture
+def scheduler(app):
+    s = UpdateScheduler()
+    yield s
+    s.timer.stop()
+
+
+def test_deferred_and_coalesced(app, scheduler):
+    data = Data()
+    edit = Edit(0)
+    data.link_widget(edit, "a0").use_scheduled_updates(scheduler=scheduler)
+    edit.calls.clear()
+    for v in range(1, 101):
+        data.a0 = v
+    assert edit.calls == []
+    assert len(scheduler) == 1
+    app.processEvents()
+    assert edit.calls == [100]
+
+
+def test_budget(app, scheduler, qwait):
+    n = 20
+    data = Data(n=n)
+    edits = [Edit(0, delay=0.002) for _ in range(n)]
+    for i, e in enumerate(edits):
+        data.link_widget(e, f"a{i}")
+    data.use_scheduled_updates(scheduler=scheduler)
+    scheduler.budget = 4
+    for i in range(n):
+        setattr(data, f"a{i}", 1)
+    scheduler.drain()
+    updated = sum(e.value() == 1 for e in edits)
+    assert 0 < updated < n
+    assert scheduler.carried_over == n - updated
+    qwait(200)
+    assert all(e.value() == 1 for e in edits)
+    assert len(scheduler) == 0
+
+
+def test_visible_first(app, scheduler):
+    data = Data(n=3)
+    hidden = [Edit(0), Edit(0)]
+    form = QWidget()
+    visible = Edit(0, parent=form)
+    form.show()
+    data.link_widget(hidden[0], "a0")
+    data.link_widget(visible, "a1")
+    data.link_widget(hidden[1], "a2")
+    data.use_scheduled_updates(scheduler=scheduler)
+    scheduler.budget = 0  # a single qtlet per slice
+    for i in range(3):
+        setattr(data, f"a{i}", 1)
+    scheduler.drain()
+    assert visible.value() == 1
+    assert hidden[0].value() == hidden[1].value() == 0
+    form.close()
+
+
+def test_focused_first(app, scheduler):
+    data = Data(n=3)
+    form = QWidget()
+    layout = QVBoxLayout(form)
+    edits = [Edit(0) for _ in range(3)]
+    for i, e in enumerate(edits):
+        layout.addWidget(e)
+        data.link_widget(e, f"a{i}")
+    data.use_scheduled_updates(scheduler=scheduler)
+    form.show()
+    form.activateWindow()
+    app.processEvents()
+    edits[2].setFocus()
+    app.processEvents()
+    if app.focusWidget() is not edits[2]:
+        pytest.skip("focus not supported by the platform")
+    scheduler.budget = 0
+    for i in range(3):
+        setattr(data, f"a{i}", 1)
+    scheduler.drain()
+    assert [e.value() for e in edits] == [0, 0, 1]
+    form.close()
+
+
+def test_edit_immediate(app, scheduler):
+    data = Data()
+    edit, other = Edit(0), Edit(0)
+    data.link_widget(edit, "a0")
+    qtl = data.link_widget(other, "a0").use_scheduled_updates(
+        scheduler=scheduler)
+    edit.valueEdited.emit(3)
+    assert other.value() == 3
+    qtl.sync_widgets(force=True)  # forced: immediate
+    assert len(scheduler) == 0
+
+
+def test_disable_pushes_pending(app, scheduler):
+    data = Data()
+    edit = Edit(0)
+    qtl = data.link_widget(edit, "a0").use_scheduled_updates(
+        scheduler=scheduler)
+    data.a0 = 2
+    assert edit.value() == 0
+    qtl.use_scheduled_updates(False)
+    assert edit.value() == 2
+    assert len(scheduler) == 0
+    data.a0 = 3
+    assert edit.value() == 3
+
+
+def test_unlink_cancels(app, scheduler):
+    data = Data()
+    edit = Edit(0)
+    qtl = data.link_widget(edit, "a0").use_scheduled_updates(
+        scheduler=scheduler)
+    data.a0 = 2
+    data.unlink_all()
+    assert qtl not in scheduler